@@ -0,0 +1,170 @@
+# lib/analytics.py
+#
+# Revenue and order analytics computed with NumPy. The matching orders are
+# loaded once, in a single query read straight off the cursor, into one
+# array with a column per field. Every figure after that is a vectorized
+# operation over those columns rather than a Python loop over ORM objects.
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from models import Order, Service
+from models.order import ORDER_STATUSES
+
+# One row per order, as produced by Order.stream_for_analytics
+ORDER_DTYPE = np.dtype([
+    ('day', 'i4'),
+    ('service_id', 'i4'),
+    ('customer_id', 'i4'),
+    ('weight', 'f8'),
+    ('total_price', 'f8'),
+    ('status', 'i1')
+])
+
+EPOCH = date(1970, 1, 1)
+
+WEIGHT_PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+WEIGHT_BINS = 10
+
+SPEND_GROUPS = 10
+
+# The views the menu and the `report analytics` command can show
+VIEWS = ('summary', 'daily', 'weekly', 'service', 'weight', 'weight-bins', 'deciles')
+
+def load_orders(session, **filters):
+    # Takes the same filters as Order.query_with_details
+    return np.fromiter(Order.stream_for_analytics(session, **filters), dtype=ORDER_DTYPE)
+
+def group_totals(keys, orders):
+    # (keys, order counts, weight, revenue) for every key that occurs, in key
+    # order. Keys are small integers, so grouping is a bincount.
+    offset = int(keys.min())
+    index = keys - offset
+    counts = np.bincount(index)
+    present = np.flatnonzero(counts)
+    weight = np.bincount(index, weights=orders['weight'])[present]
+    revenue = np.bincount(index, weights=orders['total_price'])[present]
+    return present + offset, counts[present], weight, revenue
+
+def period_rows(keys, orders, period_start):
+    if not len(orders):
+        return []
+    periods, counts, weight, revenue = group_totals(keys, orders)
+    return [
+        {
+            'period': period_start(period),
+            'order_count': count,
+            'total_weight': period_weight,
+            'total_revenue': period_revenue
+        }
+        for period, count, period_weight, period_revenue
+        in zip(periods.tolist(), counts.tolist(), weight.tolist(), revenue.tolist())
+    ]
+
+def summary(orders):
+    revenue = float(orders['total_price'].sum())
+    statuses = orders['status']
+    status_counts = np.bincount(statuses[statuses >= 0], minlength=len(ORDER_STATUSES))
+    return {
+        'order_count': len(orders),
+        'customer_count': int(np.count_nonzero(np.bincount(orders['customer_id']))),
+        'total_weight': float(orders['weight'].sum()),
+        'total_revenue': revenue,
+        'average_order_value': revenue / len(orders) if len(orders) else 0,
+        'first_day': EPOCH + timedelta(days=int(orders['day'].min())) if len(orders) else None,
+        'last_day': EPOCH + timedelta(days=int(orders['day'].max())) if len(orders) else None,
+        **dict(zip(ORDER_STATUSES, status_counts.tolist()))
+    }
+
+def revenue_by_day(orders):
+    return period_rows(orders['day'], orders, lambda day: EPOCH + timedelta(days=day))
+
+def revenue_by_week(orders):
+    # Weeks start on Monday; 1970-01-01 was a Thursday
+    return period_rows((orders['day'] + 3) // 7, orders, lambda week: EPOCH + timedelta(days=week * 7 - 3))
+
+def revenue_by_service(orders, catalog):
+    if not len(orders):
+        return []
+    service_ids, counts, weight, revenue = group_totals(orders['service_id'], orders)
+    total_revenue = float(revenue.sum()) or 1
+    rows = []
+    for service_id, count, service_weight, service_revenue in zip(service_ids.tolist(), counts.tolist(), weight.tolist(), revenue.tolist()):
+        service = catalog.get(service_id)
+        rows.append({
+            'service_id': service_id,
+            'service_name': service.name if service else None,
+            'order_count': count,
+            'total_weight': service_weight,
+            'total_revenue': service_revenue,
+            'revenue_share': service_revenue / total_revenue
+        })
+    return sorted(rows, key=lambda row: row['total_revenue'], reverse=True)
+
+def weight_distribution(orders):
+    weights = orders['weight']
+    if not len(weights):
+        return {'order_count': 0}
+    percentiles = np.percentile(weights, WEIGHT_PERCENTILES)
+    return {
+        'order_count': len(weights),
+        'mean': float(weights.mean()),
+        'std': float(weights.std()),
+        'min': float(weights.min()),
+        **{f'p{p}': value for p, value in zip(WEIGHT_PERCENTILES, percentiles.tolist())},
+        'max': float(weights.max())
+    }
+
+def weight_histogram(orders, bins=WEIGHT_BINS):
+    if not len(orders):
+        return []
+    counts, edges = np.histogram(orders['weight'], bins=bins)
+    edges = edges.tolist()
+    return [
+        {'low': edges[i], 'high': edges[i + 1], 'order_count': count, 'share': count / len(orders)}
+        for i, count in enumerate(counts.tolist())
+    ]
+
+def spend_deciles(orders, groups=SPEND_GROUPS):
+    # Customers ranked by total spend and split into equal groups, lowest
+    # spenders first, with each group's share of revenue
+    if not len(orders):
+        return []
+    customer_ids = orders['customer_id']
+    spend = np.bincount(customer_ids, weights=orders['total_price'])
+    ordered = np.sort(spend[np.bincount(customer_ids) > 0])
+    total_spend = float(ordered.sum()) or 1
+
+    rows = []
+    for group, spends in enumerate(np.array_split(ordered, groups), start=1):
+        if not len(spends):
+            continue
+        rows.append({
+            'decile': group,
+            'customer_count': len(spends),
+            'min_spend': float(spends[0]),
+            'max_spend': float(spends[-1]),
+            'average_spend': float(spends.mean()),
+            'total_spend': float(spends.sum()),
+            'revenue_share': float(spends.sum() / total_spend)
+        })
+    return rows
+
+def view(session, name, orders):
+    # One view as a list of records
+    if name == 'summary':
+        return [summary(orders)]
+    if name == 'daily':
+        return revenue_by_day(orders)
+    if name == 'weekly':
+        return revenue_by_week(orders)
+    if name == 'service':
+        return revenue_by_service(orders, Service.get_catalog(session))
+    if name == 'weight':
+        return [weight_distribution(orders)]
+    if name == 'weight-bins':
+        return weight_histogram(orders)
+    if name == 'deciles':
+        return spend_deciles(orders)
+    raise ValueError(f"View must be one of: {', '.join(VIEWS)}")
@@ -0,0 +1,379 @@
+# lib/bench/benchmark.py
+#
+# Benchmarks every helper and model finder against generated databases of
+# several sizes. For each operation it records wall time, the number of SQL
+# statements run and peak Python memory, writes the results to a JSON file
+# and optionally compares them with a stored baseline.
+#
+#     cd lib && python -m bench.benchmark --sizes 10k 100k --output results.json
+#     cd lib && python -m bench.benchmark --sizes 10k --baseline baseline.json
+#
+# Databases are generated once (with a fixed seed) into --db-dir and reused
+# until the schema changes. Each run works on a copy, so write benchmarks
+# don't drift the data.
+
+import argparse
+import builtins
+import gc
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+
+from sqlalchemy import event, func
+
+import analytics
+import dispatch
+import lifecycle
+from models import Base, Session, session_registry, Customer, Service, Order, Location, OrderStatusHistory, DailyOrderSummary, PickupSlot, make_engine, SCHEMA_VERSION
+from models.pickup_slot import PICKUP_TIMES
+import helpers
+from db.generate import DEFAULT_END_DATE
+
+SIZES = {'10k': 10000, '100k': 100000, '1m': 1000000}
+ORDERS_PER_CUSTOMER = 5
+SEED = 42
+END_DATE = DEFAULT_END_DATE.isoformat()
+
+# Operations that load a whole table into memory are only run up to this
+# many orders
+UNBOUNDED_LIMIT = 100000
+
+class NullWriter:
+    # Swallows helper output without buffering it
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self.increment)
+
+    def increment(self, *args):
+        self.count += 1
+
+# ====== Databases ======
+
+def schema_tag():
+    # Changes whenever a table, column or index is added, or the schema
+    # version is bumped for objects outside the metadata (e.g. triggers), so
+    # stale databases aren't reused
+    schema = [
+        (table.name, [column.name for column in table.columns], sorted(index.name for index in table.indexes))
+        for table in Base.metadata.sorted_tables
+    ]
+    return hashlib.sha1(repr((SCHEMA_VERSION, schema)).encode()).hexdigest()[:8]
+
+def build_database(label, db_dir):
+    path = os.path.join(db_dir, f"orders_{label}_{schema_tag()}.db")
+    if not os.path.exists(path):
+        print(f"Generating {label} orders database at {path} ...")
+        subprocess.run(
+            [
+                sys.executable, '-m', 'db.generate',
+                '--customers', str(SIZES[label] // ORDERS_PER_CUSTOMER),
+                '--orders-per-customer', str(ORDERS_PER_CUSTOMER),
+                '--end-date', END_DATE,
+                '--seed', str(SEED)
+            ],
+            env={**os.environ, 'LAUNDRY_DB_PATH': path},
+            check=True
+        )
+    return path
+
+def sample_context(session):
+    # Real ids and values from the middle of the data to look up
+    order_count = session.query(func.count(Order.id)).scalar()
+    order = session.query(Order).filter(Order.id >= order_count // 2).first()
+    customer = Customer.find_by_id(session, order.customer_id)
+    pickup_date = date.today() + timedelta(days=1)
+
+    # The create cases book into tomorrow's slots on every run, so give them
+    # room for however many runs there are
+    for pickup_time in PICKUP_TIMES:
+        PickupSlot.set_capacity(session, pickup_date, pickup_time, None, 1000000)
+
+    return {
+        'orders': order_count,
+        'order_id': order.id,
+        'customer_id': customer.id,
+        'customer_phone': customer.phone,
+        'customer_name': customer.name,
+        'status': order.status,
+        'service_id': order.service_id,
+        'location_id': order.location_id or Location.get_page(session, page_size=1)[0].id,
+        'report_date': END_DATE,
+        'pickup_date': pickup_date.isoformat()
+    }
+
+def analytics_orders(session, ctx):
+    # Loaded on first use and kept, so the timed runs of the analytics case
+    # measure the computation alone
+    if 'analytics_orders' not in ctx:
+        ctx['analytics_orders'] = analytics.load_orders(session)
+    return ctx['analytics_orders']
+
+# ====== Cases ======
+
+def helper_case(function, inputs):
+    # Run an interactive helper with scripted answers to its prompts
+    def run(session, ctx):
+        answers = iter(inputs(ctx))
+
+        def scripted_input(prompt=''):
+            # Running out of answers means the helper asked something
+            # unexpected; fail rather than loop on a re-prompt
+            try:
+                return next(answers)
+            except StopIteration:
+                raise RuntimeError(f"No scripted answer for prompt: {prompt.strip()}")
+
+        original_input = builtins.input
+        builtins.input = scripted_input
+        try:
+            with redirect_stdout(NullWriter()):
+                function()
+        finally:
+            builtins.input = original_input
+    return run
+
+def model_case(call):
+    def run(session, ctx):
+        result = call(session, ctx)
+        # Drain generators so streaming calls are measured in full
+        if hasattr(result, '__next__'):
+            for _ in result:
+                pass
+    return run
+
+HELPER_CASES = [
+    ('view_all_customers', helper_case(helpers.view_all_customers, lambda ctx: [''])),
+    ('find_customer_by_id', helper_case(helpers.find_customer_by_id, lambda ctx: [str(ctx['customer_id'])])),
+    ('find_customer_by_phone', helper_case(helpers.find_customer_by_phone, lambda ctx: [ctx['customer_phone']])),
+    ('search_customers', helper_case(helpers.search_customers, lambda ctx: [ctx['customer_name']])),
+    ('view_customer_orders', helper_case(helpers.view_customer_orders, lambda ctx: [str(ctx['customer_id'])])),
+    ('view_all_services', helper_case(helpers.view_all_services, lambda ctx: [])),
+    ('view_all_orders', helper_case(helpers.view_all_orders, lambda ctx: ['n', 'n', 'p', ''])),
+    ('find_order_by_id', helper_case(helpers.find_order_by_id, lambda ctx: [str(ctx['order_id'])])),
+    ('view_order_history', helper_case(helpers.view_order_history, lambda ctx: [str(ctx['order_id'])])),
+    ('view_all_locations', helper_case(helpers.view_all_locations, lambda ctx: [''])),
+    ('generate_daily_orders_report', helper_case(helpers.generate_daily_orders_report, lambda ctx: [ctx['report_date'], '', 'n'])),
+    ('generate_daily_orders_report+details', helper_case(helpers.generate_daily_orders_report, lambda ctx: [ctx['report_date'], '', 'y'])),
+    ('generate_daily_orders_report(branch)', helper_case(helpers.generate_daily_orders_report, lambda ctx: [ctx['report_date'], str(ctx['location_id']), 'n'])),
+    ('generate_all_branches_report', helper_case(helpers.generate_all_branches_report, lambda ctx: [ctx['report_date']])),
+    ('generate_weekly_revenue_report', helper_case(helpers.generate_weekly_revenue_report, lambda ctx: ['52'])),
+    ('generate_monthly_revenue_report', helper_case(helpers.generate_monthly_revenue_report, lambda ctx: ['24'])),
+    ('generate_customer_report', helper_case(helpers.generate_customer_report, lambda ctx: [str(ctx['customer_id']), ''])),
+    ('add_order', helper_case(helpers.add_order, lambda ctx: [
+        ctx['customer_phone'], str(ctx['service_id']), '3', str(ctx['location_id']), '1', ''
+    ])),
+    ('advance_orders', helper_case(helpers.advance_orders, lambda ctx: [ctx['report_date'], '', '3', '', 'y'])),
+    ('print_dispatch_list', helper_case(helpers.print_dispatch_list, lambda ctx: [ctx['report_date'], '1', '', ''])),
+    ('update_order_status', helper_case(helpers.update_order_status, lambda ctx: [
+        str(ctx['order_id']), '5' if ctx['status'] != 'completed' else '4'
+    ])),
+]
+
+MODEL_CASES = [
+    ('Customer.find_by_id', model_case(lambda session, ctx: Customer.find_by_id(session, ctx['customer_id']))),
+    ('Customer.find_by_phone', model_case(lambda session, ctx: Customer.find_by_phone(session, ctx['customer_phone']))),
+    ('Customer.search(name)', model_case(lambda session, ctx: Customer.search(session, ctx['customer_name']))),
+    ('Customer.search(prefix)', model_case(lambda session, ctx: Customer.search(session, ctx['customer_name'][:3]))),
+    ('Customer.get_page', model_case(lambda session, ctx: Customer.get_page(session, after_id=ctx['customer_id']))),
+    ('Customer.get_all', model_case(lambda session, ctx: Customer.get_all(session)), UNBOUNDED_LIMIT),
+    ('Service.find_by_id', model_case(lambda session, ctx: Service.find_by_id(session, ctx['service_id']))),
+    ('Service.get_cached', model_case(lambda session, ctx: Service.get_cached(session, ctx['service_id']))),
+    ('Service.get_all', model_case(lambda session, ctx: Service.get_all(session))),
+    ('Location.get_page', model_case(lambda session, ctx: Location.get_page(session))),
+    ('Order.find_by_id', model_case(lambda session, ctx: Order.find_by_id(session, ctx['order_id']))),
+    ('Order.find_by_customer', model_case(lambda session, ctx: Order.find_by_customer(session, ctx['customer_id']))),
+    ('Order.find_by_status', model_case(lambda session, ctx: Order.find_by_status(session, 'placed')), UNBOUNDED_LIMIT),
+    ('Order.get_all', model_case(lambda session, ctx: Order.get_all(session)), UNBOUNDED_LIMIT),
+    ('Order.get_page_with_details', model_case(lambda session, ctx: Order.get_page_with_details(session, after_id=ctx['order_id']))),
+    ('Order.stream_with_details(customer)', model_case(lambda session, ctx: Order.stream_with_details(session, customer_id=ctx['customer_id']))),
+    ('Order.stream_with_details(all)', model_case(lambda session, ctx: Order.stream_with_details(session))),
+    ('Order.summarize(all)', model_case(lambda session, ctx: Order.summarize(session, by=('status', 'service')))),
+    ('DailyOrderSummary.report(day)', model_case(lambda session, ctx: DailyOrderSummary.report(
+        session, date.fromisoformat(ctx['report_date']), date.fromisoformat(ctx['report_date']) + timedelta(days=1)
+    ))),
+    ('DailyOrderSummary.report(month)', model_case(lambda session, ctx: DailyOrderSummary.report(
+        session, date.fromisoformat(ctx['report_date']) - timedelta(days=365), date.fromisoformat(ctx['report_date']), period='month', by=()
+    ))),
+    ('analytics.load_orders', model_case(lambda session, ctx: analytics.load_orders(session))),
+    ('analytics(all views)', model_case(lambda session, ctx: [
+        analytics.view(session, name, analytics_orders(session, ctx)) for name in analytics.VIEWS
+    ])),
+    ('lifecycle.stage_latency', model_case(lambda session, ctx: lifecycle.stage_latency(session, by_service=True))),
+    ('lifecycle.stuck_orders', model_case(lambda session, ctx: lifecycle.stuck_orders(session))),
+    ('OrderStatusHistory.get_all_by_order', model_case(lambda session, ctx: OrderStatusHistory.get_all_by_order(session, ctx['order_id']))),
+    ('PickupSlot.availability', model_case(lambda session, ctx: PickupSlot.availability(session, ctx['pickup_date'], 'morning', ctx['location_id']))),
+    ('PickupSlot.next_free', model_case(lambda session, ctx: PickupSlot.next_free(session, ctx['location_id']))),
+    ('Order.create', model_case(lambda session, ctx: Order.create(
+        session, ctx['customer_id'], ctx['service_id'], 2, ctx['pickup_date'], 'morning'
+    ))),
+    ('Order.update(status)', model_case(lambda session, ctx: Order.update(
+        session, ctx['order_id'], status='processing' if ctx['status'] != 'processing' else 'delivery'
+    ))),
+    ('Order.find_ids_for_pickup', model_case(lambda session, ctx: Order.find_ids_for_pickup(session, ctx['report_date'], 'morning'))),
+    ('dispatch.dispatch_batches', model_case(lambda session, ctx: dispatch.dispatch_batches(session, ctx['report_date'], 'morning'))),
+    ('dispatch.dispatch_batches(drivers)', model_case(lambda session, ctx: dispatch.dispatch_batches(session, ctx['report_date'], 'morning', drivers=3))),
+    ('Order.bulk_update_status(day)', model_case(lambda session, ctx: Order.bulk_update_status(
+        session, Order.find_ids_for_pickup(session, ctx['report_date']), 'completed'
+    ))),
+    ('Order.bulk_create(100)', model_case(lambda session, ctx: Order.bulk_create(session, [
+        {'customer_id': ctx['customer_id'], 'service_id': ctx['service_id'], 'weight': 2,
+         'pickup_date': ctx['pickup_date'], 'pickup_time': 'evening'}
+    ] * 100))),
+]
+
+def cases():
+    for name, run, *limit in HELPER_CASES:
+        yield f"helpers.{name}", run, (limit or [None])[0]
+    for name, run, *limit in MODEL_CASES:
+        yield name, run, (limit or [None])[0]
+
+# ====== Runner ======
+
+def measure(run, session, ctx, counter, repeat):
+    # The first run warms caches and records queries and peak memory; the
+    # timed runs follow without tracemalloc, which slows allocation down
+    counter.count = 0
+    tracemalloc.start()
+    run(session, ctx)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    queries = counter.count
+    session.expunge_all()
+
+    # Like timeit, keep the garbage collector out of the timings
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            run(session, ctx)
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+        session.expunge_all()
+
+    return {
+        'wall_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'queries': queries,
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+def run_size(label, db_dir, repeat, only):
+    source = build_database(label, db_dir)
+    path = os.path.join(db_dir, f"work_{label}.db")
+    shutil.copyfile(source, path)
+
+    engine = make_engine(path=path)
+    counter = QueryCounter(engine)
+    Session.configure(bind=engine)
+    Service.invalidate_cache()
+
+    session = Session()
+    ctx = sample_context(session)
+    results = {}
+
+    try:
+        for name, run, limit in cases():
+            if only and not any(part in name for part in only):
+                continue
+            if limit and ctx['orders'] > limit:
+                continue
+
+            result = measure(run, session, ctx, counter, repeat)
+            results[name] = result
+            print(f"  {name:<45} {result['wall_ms']:>10.2f} ms {result['queries']:>6} queries {result['peak_kb']:>10.0f} KB")
+    finally:
+        session.close()
+        # Helpers borrow the registry's session, which is bound to this engine
+        session_registry.remove()
+        engine.dispose()
+        os.remove(path)
+
+    return results
+
+def compare(results, baseline, threshold, min_delta_ms):
+    # Print the change against the baseline and return the regressions.
+    # The fastest run is compared, as it is the least affected by noise,
+    # and differences smaller than min_delta_ms are ignored.
+    regressions = []
+    print(f"\nCompared with baseline (regression threshold {threshold:.0%}, {min_delta_ms} ms):")
+
+    for size, cases_run in results.items():
+        for name, result in cases_run.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if not before:
+                continue
+
+            delta = result['min_ms'] - before['min_ms']
+            change = delta / before['min_ms'] if before['min_ms'] else 0
+            flags = []
+            if change > threshold and delta > min_delta_ms:
+                flags.append('SLOWER')
+            if result['queries'] > before['queries']:
+                flags.append(f"QUERIES {before['queries']}->{result['queries']}")
+            if flags:
+                regressions.append((size, name, flags))
+
+            print(f"  {size:<5} {name:<45} {before['min_ms']:>10.2f} -> {result['min_ms']:>10.2f} ms ({change:+.0%}) {' '.join(flags)}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark helpers and model finders.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['10k', '100k'])
+    parser.add_argument('--db-dir', default='bench_data', help="Where generated databases are kept")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per operation; the median is reported")
+    parser.add_argument('--only', nargs='+', help="Only run operations whose name contains one of these")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="Results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Slowdown that counts as a regression")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    results = {}
+    for label in args.sizes:
+        print(f"\n{label} orders")
+        results[label] = run_size(label, args.db_dir, args.repeat, args.only)
+
+    report = {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
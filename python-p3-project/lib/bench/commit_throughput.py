@@ -0,0 +1,52 @@
+# lib/bench/commit_throughput.py
+#
+# Measures single-row commit throughput (the pattern every CLI action uses)
+# under different journal/synchronous settings.
+#
+#     cd lib && python -m bench.commit_throughput --commits 2000
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Customer, make_engine
+
+CONFIGURATIONS = [
+    ("rollback journal, synchronous=FULL", {'journal_mode': 'DELETE', 'synchronous': 'FULL'}),
+    ("WAL, synchronous=FULL", {'journal_mode': 'WAL', 'synchronous': 'FULL'}),
+    ("WAL, synchronous=NORMAL", {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}),
+]
+
+def measure(commits, **settings):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(path=os.path.join(directory, 'bench.db'), **settings)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        started = time.perf_counter()
+        for i in range(commits):
+            Customer.create(session, f"Customer {i}", f"07{i:08d}")
+        elapsed = time.perf_counter() - started
+
+        session.close()
+        engine.dispose()
+
+    return commits / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare commit throughput across SQLite settings.")
+    parser.add_argument('--commits', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.commits} single-row commits per configuration\n")
+    baseline = None
+    for label, settings in CONFIGURATIONS:
+        rate = measure(args.commits, **settings)
+        baseline = baseline or rate
+        print(f"{label:<38} {rate:>10,.0f} commits/sec  ({rate / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main()
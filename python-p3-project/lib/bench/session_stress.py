@@ -0,0 +1,104 @@
+# lib/bench/session_stress.py
+#
+# Runs thousands of menu actions back to back, the way a long CLI session
+# would, and checks that sharing one session across them leaks nothing: no
+# new database connections, no connection left checked out after an
+# action, and no steady growth in Python memory or the identity map.
+#
+#     cd lib && python -m bench.session_stress --actions 10000
+#
+# Exits with status 1 if any check fails.
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tracemalloc
+
+from sqlalchemy import event
+
+from models import Session, session_registry, Service, make_engine
+from bench.benchmark import HELPER_CASES, build_database, sample_context
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that shared CLI sessions don't leak over many actions.")
+    parser.add_argument('--actions', type=int, default=10000)
+    parser.add_argument('--size', choices=['10k', '100k'], default='10k', help="Generated database to run against")
+    parser.add_argument('--db-dir', default='bench_data')
+    parser.add_argument('--sample-every', type=int, default=1000, help="Actions between memory samples")
+    parser.add_argument('--max-growth-kb', type=float, default=512, help="Allowed memory growth after warm-up")
+    args = parser.parse_args()
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    path = os.path.join(args.db_dir, f"stress_{args.size}.db")
+    shutil.copyfile(build_database(args.size, args.db_dir), path)
+
+    engine = make_engine(path=path)
+    connections = []
+    event.listen(engine, 'connect', lambda dbapi_connection, record: connections.append(record))
+    Session.configure(bind=engine)
+    Service.invalidate_cache()
+
+    ctx_session = Session()
+    ctx = sample_context(ctx_session)
+    ctx_session.close()
+
+    # One full pass over the helpers warms caches before the baseline sample
+    for name, run, *limit in HELPER_CASES:
+        run(None, ctx)
+    shared = session_registry()
+    opened_after_warmup = len(connections)
+
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    samples = []
+    failures = []
+
+    try:
+        for i in range(1, args.actions + 1):
+            name, run, *limit = HELPER_CASES[i % len(HELPER_CASES)]
+            run(None, ctx)
+
+            if engine.pool.checkedout():
+                failures.append(f"action {i} ({name}) left a connection checked out")
+                break
+            if session_registry() is not shared:
+                failures.append(f"action {i} ({name}) got a different session")
+                break
+
+            if i % args.sample_every == 0 or i == args.actions:
+                gc.collect()
+                current = tracemalloc.get_traced_memory()[0]
+                samples.append((i, current - baseline, len(shared.identity_map)))
+                print(f"{i:>7} actions  memory {(current - baseline) / 1024:+9.1f} KB  identity map {len(shared.identity_map):>5}  connections {len(connections)}")
+    finally:
+        tracemalloc.stop()
+        session_registry.remove()
+        engine.dispose()
+        os.remove(path)
+
+    if len(connections) > opened_after_warmup:
+        failures.append(f"{len(connections) - opened_after_warmup} connection(s) opened after warm-up")
+
+    # Compare the last sample with the first, so one-off allocations during
+    # the first samples (statement caches filling up) don't count as growth
+    if len(samples) > 1:
+        growth_kb = (samples[-1][1] - samples[0][1]) / 1024
+        if growth_kb > args.max_growth_kb:
+            failures.append(f"memory grew {growth_kb:.1f} KB between action {samples[0][0]} and {samples[-1][0]}")
+        if samples[-1][2] > samples[0][2]:
+            failures.append(f"identity map grew from {samples[0][2]} to {samples[-1][2]} objects")
+
+    if failures:
+        print("\nFAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print(f"\nOK: {args.actions} actions on one session, {len(connections)} connection(s) opened in total.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# lib/bench/slot_contention.py
+#
+# Several clerks booking the same few pickup slots at once, each in its own
+# process with its own connection, the way separate CLI sessions would. More
+# orders are attempted than the slots can take. Checks that no slot ends up
+# over capacity, that every slot's counter matches the orders booked into it,
+# and that every attempt either booked or was told the slot was full.
+#
+#     cd lib && python -m bench.slot_contention --clerks 8 --attempts 50 --capacity 40
+#
+# Exits with status 1 if any check fails.
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Customer, Service, Order, Location, PickupSlot, make_engine
+from models.pickup_slot import PICKUP_TIMES
+
+def setup(path, clerks, capacity):
+    # A fresh database with one branch, one service and a customer per clerk,
+    # and tomorrow's slots at the branch limited to capacity
+    engine = make_engine(path=path)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    location = Location.create(session, "Contention Branch", "1 Test Street", "0700000000")
+    service = Service.create(session, "Wash & Fold", 100, 'kg')
+    customer_ids = [Customer.create(session, f"Clerk {i} Customer", f"07{i:08d}").id for i in range(clerks)]
+    pickup_date = date.today() + timedelta(days=1)
+    for pickup_time in PICKUP_TIMES:
+        PickupSlot.set_capacity(session, pickup_date, pickup_time, location.id, capacity)
+
+    ids = (location.id, service.id, customer_ids, pickup_date)
+    session.close()
+    engine.dispose()
+    return ids
+
+def clerk(path, clerk_number, attempts, location_id, service_id, customer_id, pickup_date, start):
+    # Book orders into random windows as fast as possible; returns (booked,
+    # {window: times turned away as full}, errors)
+    engine = make_engine(path=path)
+    session = sessionmaker(bind=engine)()
+    rng = random.Random(clerk_number)
+    booked = 0
+    full = dict.fromkeys(PICKUP_TIMES, 0)
+    errors = []
+
+    start.wait()
+    for _ in range(attempts):
+        pickup_time = rng.choice(PICKUP_TIMES)
+        try:
+            Order.create(session, customer_id, service_id, 2, pickup_date, pickup_time, location_id=location_id)
+            booked += 1
+        except ValueError:
+            full[pickup_time] += 1
+        except Exception as e:
+            session.rollback()
+            errors.append(str(e).splitlines()[0])
+
+    session.close()
+    engine.dispose()
+    return booked, full, errors
+
+def check(path, location_id, pickup_date, capacity, full):
+    # Compare each slot's counter with its capacity and its actual orders,
+    # and make sure nobody was turned away from a slot with room left
+    engine = make_engine(path=path)
+    session = sessionmaker(bind=engine)()
+    failures = []
+
+    for pickup_time in PICKUP_TIMES:
+        slot = PickupSlot.availability(session, pickup_date, pickup_time, location_id)
+        orders = session.query(func.count(Order.id)).filter(
+            Order.location_id == location_id, Order._pickup_date == pickup_date, Order.pickup_time == pickup_time
+        ).scalar()
+        print(f"  {pickup_time:<10} booked {slot.booked:>4} / {slot.capacity:<4} orders {orders:>4}  turned away {full[pickup_time]:>4}")
+
+        if orders > capacity:
+            failures.append(f"{pickup_time} slot overbooked: {orders} orders for {capacity} places")
+        if slot.booked != orders:
+            failures.append(f"{pickup_time} slot counter says {slot.booked}, but it has {orders} orders")
+        if full[pickup_time] and orders < capacity:
+            failures.append(f"{pickup_time} slot turned {full[pickup_time]} orders away with {capacity - orders} places left")
+
+    session.close()
+    engine.dispose()
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that concurrent bookings never overbook a pickup slot.")
+    parser.add_argument('--clerks', type=int, default=8, help="Processes booking at once")
+    parser.add_argument('--attempts', type=int, default=50, help="Orders each clerk tries to book")
+    parser.add_argument('--capacity', type=int, default=40, help="Places in each of the day's slots")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'slots.db')
+        location_id, service_id, customer_ids, pickup_date = setup(path, args.clerks, args.capacity)
+
+        # Spawned rather than forked, so no clerk inherits a connection
+        context = multiprocessing.get_context('spawn')
+        start = context.Manager().Barrier(args.clerks)
+        with context.Pool(args.clerks) as pool:
+            started = time.perf_counter()
+            results = pool.starmap(clerk, [
+                (path, i, args.attempts, location_id, service_id, customer_ids[i], pickup_date, start)
+                for i in range(args.clerks)
+            ])
+            elapsed = time.perf_counter() - started
+
+        booked = sum(result[0] for result in results)
+        full = {pickup_time: sum(result[1][pickup_time] for result in results) for pickup_time in PICKUP_TIMES}
+        errors = [error for result in results for error in result[2]]
+        print(f"{args.clerks} clerks, {args.clerks * args.attempts} attempts in {elapsed:.2f}s: {booked} booked, {sum(full.values())} turned away as full, {len(errors)} errors")
+
+        failures += check(path, location_id, pickup_date, args.capacity, full)
+        failures += [f"clerk error: {error}" for error in sorted(set(errors))]
+
+    if failures:
+        print("\nFAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print("\nOK: no slot overbooked, every counter matches its orders.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
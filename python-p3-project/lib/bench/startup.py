@@ -0,0 +1,106 @@
+# lib/bench/startup.py
+#
+# Measures how long the CLI takes to start: wall time of fresh launches, and
+# the module import time reported by `python -X importtime`, for the menu and
+# for command mode. --against runs the same launches on another git revision
+# of lib/ for comparison.
+#
+#     cd lib && python -m bench.startup --runs 20 --against HEAD~1
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+LIB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, cli arguments, menu input)
+SCENARIOS = [
+    ("menu, exit", [], "0\n"),
+    ("menu, open reports", [], "5\n0\n0\n"),
+    ("command: services list", ['services', 'list'], ""),
+]
+
+def launch(lib_dir, db_path, args, stdin, importtime=False):
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['cli.py'] + args
+    started = time.perf_counter()
+    result = subprocess.run(
+        command, cwd=lib_dir, input=stdin, text=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env={**os.environ, 'LAUNDRY_DB_PATH': db_path}
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"cli.py {' '.join(args)} failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+def parse_importtime(output):
+    # Lines look like "import time:   self |  cumulative | <indent>module";
+    # the top-level imports (indented by one space) add up to the total
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        imports.append((name.strip(), int(cumulative_us)))
+    return imports
+
+def measure(lib_dir, runs):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'startup.db')
+        # The first launch creates the database; only later ones are timed
+        launch(lib_dir, db_path, [], "0\n")
+
+        for label, args, stdin in SCENARIOS:
+            times = [launch(lib_dir, db_path, args, stdin)[0] for _ in range(runs)]
+            imports = parse_importtime(launch(lib_dir, db_path, args, stdin, importtime=True)[1])
+            results[label] = {
+                'wall_ms': statistics.median(times),
+                'import_ms': sum(us for name, us in imports) / 1000,
+                'slowest_imports': sorted(imports, key=lambda item: item[1], reverse=True)[:5]
+            }
+    return results
+
+def checkout(revision, directory):
+    # Extract lib/ as of a git revision
+    archive = subprocess.run(['git', 'archive', revision, '.'], cwd=LIB_DIR, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', directory], input=archive.stdout, check=True)
+    return directory
+
+def print_results(title, results):
+    print(f"\n===== {title} =====")
+    for label, result in results.items():
+        print(f"{label:<26} wall {result['wall_ms']:7.1f} ms   imports {result['import_ms']:7.1f} ms")
+        for name, us in result['slowest_imports']:
+            print(f"    {name:<36} {us / 1000:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup time.")
+    parser.add_argument('--runs', type=int, default=10, help="Timed launches per scenario (median is reported)")
+    parser.add_argument('--against', metavar='REVISION', help="Also measure lib/ at this git revision")
+    args = parser.parse_args()
+
+    current = measure(LIB_DIR, args.runs)
+    print_results("Working tree", current)
+
+    if args.against:
+        with tempfile.TemporaryDirectory() as directory:
+            previous = measure(checkout(args.against, directory), args.runs)
+        print_results(args.against, previous)
+
+        print("\n===== Change =====")
+        for label, result in current.items():
+            before = previous[label]
+            print(
+                f"{label:<26} wall {result['wall_ms'] - before['wall_ms']:+7.1f} ms"
+                f"   imports {result['import_ms'] - before['import_ms']:+7.1f} ms"
+            )
+
+if __name__ == "__main__":
+    main()
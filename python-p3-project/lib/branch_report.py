@@ -0,0 +1,101 @@
+# lib/branch_report.py
+#
+# End-of-day report across all branches. Each branch's section is computed
+# in its own worker process over a read-only connection, and the sections
+# are merged here, so the report takes about as long as the busiest branch
+# rather than the sum of all of them.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from models import Session, Order, Location, DailyOrderSummary, make_engine
+from models.daily_order_summary import NO_LOCATION
+from models.order import ORDER_STATUSES
+
+# Customers listed per branch
+TOP_CUSTOMERS = 5
+
+# Each worker's session factory, set up once per process by init_worker
+worker_sessions = None
+
+def branch_section(session, location_id, report_date):
+    # One branch's figures for a day, as plain data that can be sent back
+    # from a worker process
+    day_start = datetime.combine(report_date, datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+
+    summary = DailyOrderSummary.report(session, report_date, report_date + timedelta(days=1), location_id=location_id)
+    customers = Order.summarize(session, by=('customer',), location_id=location_id, created_from=day_start, created_before=day_end)
+
+    by_status = {}
+    by_service = {}
+    for row in summary:
+        by_status[row.status] = by_status.get(row.status, 0) + row.order_count
+        count, revenue = by_service.get(row.service_name, (0, 0))
+        by_service[row.service_name] = (count + row.order_count, revenue + row.total_revenue)
+
+    top_customers = sorted(customers, key=lambda row: row.total_revenue, reverse=True)[:TOP_CUSTOMERS]
+
+    return {
+        'location_id': location_id,
+        'order_count': sum(row.order_count for row in summary),
+        'total_weight': sum(row.total_weight for row in summary),
+        'total_revenue': sum(row.total_revenue for row in summary),
+        'by_status': by_status,
+        'by_service': by_service,
+        'top_customers': [(row.customer_name, row.order_count, row.total_revenue) for row in top_customers]
+    }
+
+def init_worker(path):
+    global worker_sessions
+    worker_sessions = sessionmaker(bind=make_engine(read_only=True, path=path, pool_size=1))
+
+def run_worker_section(location_id, report_date):
+    session = worker_sessions()
+    try:
+        return branch_section(session, location_id, report_date)
+    finally:
+        session.close()
+
+def all_branches_report(report_date, workers=None):
+    # Returns (sections, totals). Sections are in branch name order, with
+    # orders that have no branch last. workers=1 computes everything in this
+    # process.
+    session = Session()
+    try:
+        branches = [(location.id, location.name) for location in sorted(Location.get_all(session), key=lambda location: location.name)]
+        unassigned = DailyOrderSummary.report(
+            session, report_date, report_date + timedelta(days=1), by=(), location_id=NO_LOCATION
+        )
+        if unassigned and unassigned[0].order_count:
+            branches.append((NO_LOCATION, "No branch"))
+        path = session.get_bind().url.database
+    finally:
+        session.close()
+
+    workers = workers or min(len(branches), os.cpu_count() or 1)
+
+    # An in-memory database can't be opened by another process
+    if workers <= 1 or not path or path == ':memory:':
+        session = Session()
+        try:
+            sections = [branch_section(session, location_id, report_date) for location_id, name in branches]
+        finally:
+            session.close()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(path,)) as pool:
+            sections = list(pool.map(run_worker_section, [location_id for location_id, name in branches], [report_date] * len(branches)))
+
+    totals = {'order_count': 0, 'total_weight': 0, 'total_revenue': 0, 'by_status': {status: 0 for status in ORDER_STATUSES}}
+    for (location_id, name), section in zip(branches, sections):
+        section['location_name'] = name
+        totals['order_count'] += section['order_count']
+        totals['total_weight'] += section['total_weight']
+        totals['total_revenue'] += section['total_revenue']
+        for status, count in section['by_status'].items():
+            totals['by_status'][status] = totals['by_status'].get(status, 0) + count
+
+    return sections, totals
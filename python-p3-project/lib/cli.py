@@ -1,66 +1,63 @@
 # lib/cli.py
 
-from helpers import (
-    exit_program,
-    # Customer helpers
-    view_all_customers,
-    find_customer_by_id,
-    find_customer_by_phone,
-    add_customer,
-    update_customer,
-    delete_customer,
-    view_customer_orders,
-    # Service helpers
-    view_all_services,
-    find_service_by_id,
-    add_service,
-    update_service,
-    delete_service,
-    # Order helpers
-    view_all_orders,
-    find_order_by_id,
-    add_order,
-    update_order_status,
-    delete_order,
-    view_order_history,
-    # Location helpers
-    view_all_locations,
-    find_location_by_id,
-    add_location,
-    update_location,
-    delete_location,
-    # Report helpers
-    generate_daily_orders_report,
-    generate_customer_report
-)
-
-from models import Base, engine, create_tables
+# Helper modules are imported by the menu that uses them, and the command
+# mode never loads them, so startup only pays for what gets used
+from models import create_tables, profiler, session_registry, OUTDATED_SCHEMA_MESSAGE
+from helpers.common import exit_program
+import sys
 
 def main():
-    # Create database tables if they don't exist
-    create_tables()
+    # --profile reports the queries behind every action
+    if '--profile' in sys.argv:
+        sys.argv.remove('--profile')
+        profiler.enable()
+    
+    # Create database tables if the schema isn't current
+    if not create_tables():
+        print(OUTDATED_SCHEMA_MESSAGE, file=sys.stderr)
+    
+    # Any arguments select the non-interactive command mode
+    if len(sys.argv) > 1:
+        from commands import run_command_line
+        sys.exit(run_command_line(sys.argv[1:]))
     
     print("\n========== LaundryConnect Management System ==========\n")
     print("Welcome to LaundryConnect CLI!")
     
-    while True:
-        main_menu()
-        choice = input("\nEnter your choice: ")
-        
-        if choice == "0":
-            exit_program()
-        elif choice == "1":
-            customer_menu()
-        elif choice == "2":
-            order_menu()
-        elif choice == "3":
-            service_menu()
-        elif choice == "4":
-            location_menu()
-        elif choice == "5":
-            report_menu()
-        else:
-            print("\nInvalid choice. Please try again.")
+    # Menu actions share one session for the whole run; release it however
+    # the run ends
+    try:
+        while True:
+            main_menu()
+            choice = input("\nEnter your choice: ")
+            
+            if choice == "0":
+                exit_program()
+            elif choice == "1":
+                customer_menu()
+            elif choice == "2":
+                order_menu()
+            elif choice == "3":
+                service_menu()
+            elif choice == "4":
+                location_menu()
+            elif choice == "5":
+                report_menu()
+            else:
+                print("\nInvalid choice. Please try again.")
+    finally:
+        session_registry.remove()
+
+def run_action(action):
+    # Run a menu action, followed by its query summary when profiling
+    if not profiler.enabled:
+        return action()
+    
+    profiler.start_action(action.__name__)
+    try:
+        action()
+    finally:
+        print(f"\n{profiler.format_summary(profiler.finish_action())}")
 
 def main_menu():
     print("\n===== Main Menu =====")
@@ -72,6 +69,18 @@ def main_menu():
     print("0. Exit")
 
 def customer_menu():
+    from helpers.customers import (
+        view_all_customers,
+        find_customer_by_id,
+        find_customer_by_phone,
+        add_customer,
+        update_customer,
+        delete_customer,
+        view_customer_orders,
+        import_customers_from_file,
+        search_customers
+    )
+    
     while True:
         print("\n===== Customer Management =====")
         print("1. View All Customers")
@@ -81,6 +90,8 @@ def customer_menu():
         print("5. Update Customer")
         print("6. Delete Customer")
         print("7. View Customer Orders")
+        print("8. Import Customers from File")
+        print("9. Search Customers")
         print("0. Back to Main Menu")
         
         choice = input("\nEnter your choice: ")
@@ -88,23 +99,40 @@ def customer_menu():
         if choice == "0":
             return
         elif choice == "1":
-            view_all_customers()
+            run_action(view_all_customers)
         elif choice == "2":
-            find_customer_by_id()
+            run_action(find_customer_by_id)
         elif choice == "3":
-            find_customer_by_phone()
+            run_action(find_customer_by_phone)
         elif choice == "4":
-            add_customer()
+            run_action(add_customer)
         elif choice == "5":
-            update_customer()
+            run_action(update_customer)
         elif choice == "6":
-            delete_customer()
+            run_action(delete_customer)
         elif choice == "7":
-            view_customer_orders()
+            run_action(view_customer_orders)
+        elif choice == "8":
+            run_action(import_customers_from_file)
+        elif choice == "9":
+            run_action(search_customers)
         else:
             print("\nInvalid choice. Please try again.")
 
 def order_menu():
+    from helpers.orders import (
+        view_all_orders,
+        find_order_by_id,
+        add_order,
+        update_order_status,
+        advance_orders,
+        delete_order,
+        view_order_history,
+        export_orders_to_file,
+        reschedule_order,
+        print_dispatch_list
+    )
+    
     while True:
         print("\n===== Order Management =====")
         print("1. View All Orders")
@@ -113,6 +141,10 @@ def order_menu():
         print("4. Update Order Status")
         print("5. Delete Order")
         print("6. View Order Status History")
+        print("7. Advance Orders in Bulk")
+        print("8. Export Orders to File")
+        print("9. Reschedule Pickup")
+        print("10. Dispatch List")
         print("0. Back to Main Menu")
         
         choice = input("\nEnter your choice: ")
@@ -120,21 +152,37 @@ def order_menu():
         if choice == "0":
             return
         elif choice == "1":
-            view_all_orders()
+            run_action(view_all_orders)
         elif choice == "2":
-            find_order_by_id()
+            run_action(find_order_by_id)
         elif choice == "3":
-            add_order()
+            run_action(add_order)
         elif choice == "4":
-            update_order_status()
+            run_action(update_order_status)
         elif choice == "5":
-            delete_order()
+            run_action(delete_order)
         elif choice == "6":
-            view_order_history()
+            run_action(view_order_history)
+        elif choice == "7":
+            run_action(advance_orders)
+        elif choice == "8":
+            run_action(export_orders_to_file)
+        elif choice == "9":
+            run_action(reschedule_order)
+        elif choice == "10":
+            run_action(print_dispatch_list)
         else:
             print("\nInvalid choice. Please try again.")
 
 def service_menu():
+    from helpers.services import (
+        view_all_services,
+        find_service_by_id,
+        add_service,
+        update_service,
+        delete_service
+    )
+    
     while True:
         print("\n===== Service Management =====")
         print("1. View All Services")
@@ -149,19 +197,27 @@ def service_menu():
         if choice == "0":
             return
         elif choice == "1":
-            view_all_services()
+            run_action(view_all_services)
         elif choice == "2":
-            find_service_by_id()
+            run_action(find_service_by_id)
         elif choice == "3":
-            add_service()
+            run_action(add_service)
         elif choice == "4":
-            update_service()
+            run_action(update_service)
         elif choice == "5":
-            delete_service()
+            run_action(delete_service)
         else:
             print("\nInvalid choice. Please try again.")
 
 def location_menu():
+    from helpers.locations import (
+        view_all_locations,
+        find_location_by_id,
+        add_location,
+        update_location,
+        delete_location
+    )
+    
     while True:
         print("\n===== Location Management =====")
         print("1. View All Locations")
@@ -176,23 +232,39 @@ def location_menu():
         if choice == "0":
             return
         elif choice == "1":
-            view_all_locations()
+            run_action(view_all_locations)
         elif choice == "2":
-            find_location_by_id()
+            run_action(find_location_by_id)
         elif choice == "3":
-            add_location()
+            run_action(add_location)
         elif choice == "4":
-            update_location()
+            run_action(update_location)
         elif choice == "5":
-            delete_location()
+            run_action(delete_location)
         else:
             print("\nInvalid choice. Please try again.")
 
 def report_menu():
+    from helpers.reports import (
+        generate_daily_orders_report,
+        generate_all_branches_report,
+        generate_weekly_revenue_report,
+        generate_monthly_revenue_report,
+        generate_customer_report,
+        generate_lifecycle_report,
+        rebuild_report_summary
+    )
+    
     while True:
         print("\n===== Reports =====")
         print("1. Daily Orders Report")
         print("2. Customer Report")
+        print("3. Weekly Revenue Report")
+        print("4. Monthly Revenue Report")
+        print("5. Rebuild Report Summary")
+        print("6. All Branches Report")
+        print("7. Analytics")
+        print("8. Order Lifecycle Report")
         print("0. Back to Main Menu")
         
         choice = input("\nEnter your choice: ")
@@ -200,9 +272,56 @@ def report_menu():
         if choice == "0":
             return
         elif choice == "1":
-            generate_daily_orders_report()
+            run_action(generate_daily_orders_report)
         elif choice == "2":
-            generate_customer_report()
+            run_action(generate_customer_report)
+        elif choice == "3":
+            run_action(generate_weekly_revenue_report)
+        elif choice == "4":
+            run_action(generate_monthly_revenue_report)
+        elif choice == "5":
+            run_action(rebuild_report_summary)
+        elif choice == "6":
+            run_action(generate_all_branches_report)
+        elif choice == "7":
+            analytics_menu()
+        elif choice == "8":
+            run_action(generate_lifecycle_report)
+        else:
+            print("\nInvalid choice. Please try again.")
+
+def analytics_menu():
+    from helpers.analytics import (
+        show_revenue_summary,
+        show_revenue_by_day,
+        show_revenue_by_week,
+        show_weight_distribution,
+        show_spend_deciles
+    )
+    
+    while True:
+        print("\n===== Analytics =====")
+        print("1. Revenue Summary")
+        print("2. Revenue by Day")
+        print("3. Revenue by Week")
+        print("4. Weight Distribution")
+        print("5. Customer Spend Deciles")
+        print("0. Back to Reports")
+        
+        choice = input("\nEnter your choice: ")
+        
+        if choice == "0":
+            return
+        elif choice == "1":
+            run_action(show_revenue_summary)
+        elif choice == "2":
+            run_action(show_revenue_by_day)
+        elif choice == "3":
+            run_action(show_revenue_by_week)
+        elif choice == "4":
+            run_action(show_weight_distribution)
+        elif choice == "5":
+            run_action(show_spend_deciles)
         else:
             print("\nInvalid choice. Please try again.")
 
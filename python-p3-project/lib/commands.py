@@ -0,0 +1,706 @@
+# lib/commands.py
+#
+# Non-interactive command interface for the CLI. Every command takes its
+# arguments on the command line instead of prompting, and produces records
+# (dicts) that are written as JSON Lines or CSV. A file of commands can be
+# run in one process and one database session:
+#
+#     python lib/cli.py orders create --customer 12 --service 1 --weight 3 \
+#         --pickup-date 2026-10-20 --pickup-time morning
+#     python lib/cli.py --format csv report daily --date 2026-10-18
+#     python lib/cli.py batch nightly.txt
+
+import argparse
+import csv
+import json
+import shlex
+import sys
+from datetime import datetime, date, timedelta
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import Session, Customer, Service, Order, Location, OrderStatusHistory, DailyOrderSummary, PickupSlot, profiler
+from models.customer import SEARCH_LIMIT
+from models.order import ORDER_STATUSES, PICKUP_TIMES
+from models.pickup_slot import NEXT_FREE_SLOTS
+from db.options import add_export_arguments, add_archive_arguments
+
+# Views of `report analytics`, as in analytics.VIEWS (not imported from
+# there, so building the parser doesn't load NumPy)
+ANALYTICS_VIEWS = ('summary', 'daily', 'weekly', 'service', 'weight', 'weight-bins', 'deciles')
+
+# The export, archive, lifecycle and dispatch modules are likewise imported
+# by the commands that run them. The --help defaults of `report stuck` and
+# `orders dispatch` are lifecycle.STUCK_AFTER_HOURS and
+# dispatch.DISPATCH_BATCH_SIZE.
+
+class CommandError(ValueError):
+    pass
+
+class CommandParser(argparse.ArgumentParser):
+    # Raise instead of exiting so one bad line in a batch file doesn't end
+    # the whole run
+    def error(self, message):
+        raise CommandError(message)
+
+# ====== Records ======
+
+def customer_record(customer):
+    return {
+        'id': customer.id,
+        'name': customer.name,
+        'phone': customer.phone,
+        'email': customer.email,
+        'address': customer.address,
+        'created_at': customer.created_at
+    }
+
+def service_record(service):
+    return {
+        'id': service.id,
+        'name': service.name,
+        'description': service.description,
+        'price_per_unit': service.price_per_unit,
+        'unit': service.unit
+    }
+
+def location_record(location):
+    return {
+        'id': location.id,
+        'name': location.name,
+        'address': location.address,
+        'phone': location.phone,
+        'email': location.email,
+        'slot_capacity': location.slot_capacity
+    }
+
+def slot_record(slot):
+    return {
+        'pickup_date': slot.pickup_date,
+        'pickup_time': slot.pickup_time,
+        'location_id': slot.location_id,
+        'booked': slot.booked,
+        'capacity': slot.capacity,
+        'free': max(slot.capacity - slot.booked, 0)
+    }
+
+def order_record(order):
+    return {
+        'id': order.id,
+        'customer_id': order.customer_id,
+        'service_id': order.service_id,
+        'location_id': order.location_id,
+        'weight': order.weight,
+        'total_price': order.total_price,
+        'status': order.status,
+        'pickup_date': order.pickup_date,
+        'pickup_time': order.pickup_time,
+        'special_instructions': order.special_instructions,
+        'created_at': order.created_at
+    }
+
+def order_details_record(row):
+    return {
+        'id': row.id,
+        'customer_id': row.customer_id,
+        'customer_name': row.customer_name,
+        'service_id': row.service_id,
+        'service_name': row.service_name,
+        'location_id': row.location_id,
+        'weight': row.weight,
+        'total_price': row.total_price,
+        'status': row.status,
+        'pickup_date': row.pickup_date,
+        'pickup_time': row.pickup_time,
+        'created_at': row.created_at
+    }
+
+def iterate_pages(model, session, **filters):
+    # Walk a whole table one keyset page at a time
+    page = model.get_page(session, page_size=500, **filters)
+    while page:
+        yield from page
+        page = model.get_page(session, after_id=page[-1].id, page_size=500, **filters)
+
+def require(found, message):
+    if not found:
+        raise CommandError(message)
+    return found
+
+def changes(args, fields):
+    # Only the options that were given on the command line
+    return {field: getattr(args, field) for field in fields if getattr(args, field) is not None}
+
+def day_range(value):
+    report_date = datetime.strptime(value, '%Y-%m-%d').date() if value else date.today()
+    day_start = datetime.combine(report_date, datetime.min.time())
+    return day_start, day_start + timedelta(days=1)
+
+def date_range(start, end):
+    # (created_from, created_before) for optional first and last days
+    created_from = datetime.strptime(start, '%Y-%m-%d') if start else None
+    created_before = datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1) if end else None
+    return created_from, created_before
+
+# ====== Customer commands ======
+
+def customers_list(session, args):
+    return (customer_record(customer) for customer in iterate_pages(Customer, session))
+
+def customers_get(session, args):
+    customer = require(Customer.find_by_id(session, args.id), f"No customer found with ID {args.id}")
+    return [customer_record(customer)]
+
+def customers_find(session, args):
+    customer = require(Customer.find_by_phone(session, args.phone), f"No customer found with phone number {args.phone}")
+    return [customer_record(customer)]
+
+def customers_search(session, args):
+    return [customer_record(customer) for customer in Customer.search(session, ' '.join(args.text), args.limit)]
+
+def customers_create(session, args):
+    return [customer_record(Customer.create(session, args.name, args.phone, args.email, args.address))]
+
+def customers_update(session, args):
+    customer = Customer.update(session, args.id, **changes(args, ['name', 'phone', 'email', 'address']))
+    return [customer_record(require(customer, f"No customer found with ID {args.id}"))]
+
+def customers_delete(session, args):
+    require(Customer.delete(session, args.id), f"No customer found with ID {args.id}")
+    return [{'id': args.id, 'deleted': True}]
+
+def customers_orders(session, args):
+    require(Customer.find_by_id(session, args.id), f"No customer found with ID {args.id}")
+    return (order_details_record(row) for row in Order.stream_with_details(session, customer_id=args.id))
+
+# ====== Service commands ======
+
+def services_list(session, args):
+    return [service_record(service) for service in Service.get_catalog(session).values()]
+
+def services_get(session, args):
+    service = require(Service.get_cached(session, args.id), f"No service found with ID {args.id}")
+    return [service_record(service)]
+
+def services_create(session, args):
+    return [service_record(Service.create(session, args.name, args.price, args.unit, args.description))]
+
+def services_update(session, args):
+    fields = changes(args, ['name', 'description', 'unit'])
+    if args.price is not None:
+        fields['price_per_unit'] = args.price
+    service = Service.update(session, args.id, **fields)
+    return [service_record(require(service, f"No service found with ID {args.id}"))]
+
+def services_delete(session, args):
+    require(Service.delete(session, args.id), f"No service found with ID {args.id}")
+    return [{'id': args.id, 'deleted': True}]
+
+# ====== Order commands ======
+
+def orders_list(session, args):
+    filters = {'customer_id': args.customer, 'status': args.status, 'location_id': args.location}
+    if args.date:
+        filters['created_from'], filters['created_before'] = day_range(args.date)
+    return (order_details_record(row) for row in Order.stream_with_details(session, **filters))
+
+def orders_get(session, args):
+    order = require(Order.find_by_id(session, args.id), f"No order found with ID {args.id}")
+    return [order_record(order)]
+
+def orders_create(session, args):
+    require(Customer.find_by_id(session, args.customer), f"No customer found with ID {args.customer}")
+    if args.location is not None:
+        require(Location.find_by_id(session, args.location), f"No location found with ID {args.location}")
+    order = Order.create(
+        session,
+        args.customer,
+        args.service,
+        args.weight,
+        args.pickup_date,
+        args.pickup_time,
+        args.instructions,
+        args.location
+    )
+    return [order_record(order)]
+
+def orders_status(session, args):
+    order = require(Order.find_by_id(session, args.id), f"No order found with ID {args.id}")
+    if order.status != args.status:
+        Order.update(session, args.id, status=args.status)
+    return [order_record(order)]
+
+def orders_reschedule(session, args):
+    # Books the new pickup slot and gives up the old one, or fails if the new
+    # one is full
+    require(Order.find_by_id(session, args.id), f"No order found with ID {args.id}")
+    return [order_record(Order.update(session, args.id, **changes(args, ['pickup_date', 'pickup_time'])))]
+
+def orders_advance(session, args):
+    # e.g. advance all of today's morning pickups from 'placed' to 'pickup'
+    pickup_date = args.pickup_date or date.today().isoformat()
+    order_ids = Order.find_ids_for_pickup(session, pickup_date, args.pickup_time, status=args.from_status)
+    to_status = args.to_status or ORDER_STATUSES[min(ORDER_STATUSES.index(args.from_status) + 1, len(ORDER_STATUSES) - 1)]
+    updated_ids = Order.bulk_update_status(session, order_ids, to_status)
+    return [{'pickup_date': pickup_date, 'pickup_time': args.pickup_time, 'status': to_status, 'matched': len(order_ids), 'updated': len(updated_ids)}]
+
+def orders_dispatch(session, args):
+    # One record per stop, with the driver batch it belongs to
+    from dispatch import dispatch_list, DISPATCH_BATCH_SIZE
+    pickup_date = args.pickup_date or date.today().isoformat()
+    return dispatch_list(
+        session,
+        pickup_date,
+        args.pickup_time,
+        location_id=args.location,
+        drivers=args.drivers,
+        batch_size=args.batch_size if args.batch_size is not None else DISPATCH_BATCH_SIZE
+    )
+
+def orders_bulk_status(session, args):
+    updated_ids = Order.bulk_update_status(session, args.ids, args.status)
+    return [{'status': args.status, 'matched': len(args.ids), 'updated': len(updated_ids)}]
+
+def orders_delete(session, args):
+    require(Order.delete(session, args.id), f"No order found with ID {args.id}")
+    return [{'id': args.id, 'deleted': True}]
+
+def orders_history(session, args):
+    require(Order.find_by_id(session, args.id), f"No order found with ID {args.id}")
+    return [
+        {'order_id': entry.order_id, 'status': entry.status, 'timestamp': entry.timestamp}
+        for entry in OrderStatusHistory.get_all_by_order(session, args.id)
+    ]
+
+def orders_export(session, args):
+    # Writes the file itself; the record summarises what was written
+    from db.export_orders import export_from_args
+    return [export_from_args(args, verbose=False)]
+
+def orders_archive(session, args):
+    # Moves the orders in its own session; end ours so VACUUM isn't blocked
+    from db.archive_orders import archive_orders
+    session.commit()
+    return [archive_orders(args.older_than, args.chunk_size, args.vacuum, verbose=False)]
+
+# ====== Location commands ======
+
+def locations_list(session, args):
+    return (location_record(location) for location in iterate_pages(Location, session))
+
+def locations_get(session, args):
+    location = require(Location.find_by_id(session, args.id), f"No location found with ID {args.id}")
+    return [location_record(location)]
+
+def locations_create(session, args):
+    return [location_record(Location.create(session, args.name, args.address, args.phone, args.email, args.slot_capacity))]
+
+def locations_update(session, args):
+    location = Location.update(session, args.id, **changes(args, ['name', 'address', 'phone', 'email', 'slot_capacity']))
+    return [location_record(require(location, f"No location found with ID {args.id}"))]
+
+def locations_delete(session, args):
+    require(Location.delete(session, args.id), f"No location found with ID {args.id}")
+    return [{'id': args.id, 'deleted': True}]
+
+# ====== Pickup slot commands ======
+
+def slots_next(session, args):
+    start = datetime.strptime(args.start, '%Y-%m-%d').date() if args.start else None
+    return [slot_record(slot) for slot in PickupSlot.next_free(session, args.location, start, args.count)]
+
+def slots_get(session, args):
+    return [slot_record(PickupSlot.availability(session, args.pickup_date, args.pickup_time, args.location))]
+
+def slots_set(session, args):
+    return [slot_record(PickupSlot.set_capacity(session, args.pickup_date, args.pickup_time, args.location, args.capacity))]
+
+def slots_rebuild(session, args):
+    return [{'slot_rows': PickupSlot.rebuild(session)}]
+
+# ====== Report commands ======
+
+def report_daily(session, args):
+    created_from, created_before = day_range(args.date)
+
+    if args.details:
+        rows = Order.stream_with_details(session, created_from=created_from, created_before=created_before, location_id=args.location)
+        return (order_details_record(row) for row in rows)
+
+    summary = DailyOrderSummary.report(session, created_from.date(), created_before.date(), location_id=args.location)
+    return [
+        {
+            'date': row.period,
+            'location_id': args.location,
+            'status': row.status,
+            'service_id': row.service_id,
+            'service_name': row.service_name,
+            'order_count': row.order_count,
+            'total_weight': row.total_weight,
+            'total_revenue': row.total_revenue
+        }
+        for row in summary
+    ]
+
+def report_revenue(session, args):
+    # Orders and revenue per week or month, read from the daily summary
+    start = datetime.strptime(args.start, '%Y-%m-%d').date()
+    end = datetime.strptime(args.end, '%Y-%m-%d').date() if args.end else date.today()
+    by = ('status',) if args.by_status else ()
+
+    return [
+        {
+            'period': row.period,
+            **({'status': row.status} if args.by_status else {}),
+            'order_count': row.order_count,
+            'total_weight': row.total_weight,
+            'total_revenue': row.total_revenue
+        }
+        for row in DailyOrderSummary.report(session, start, end + timedelta(days=1), period=args.period, by=by)
+    ]
+
+def report_branches(session, args):
+    # One row per branch; each branch is computed in its own process.
+    # Imported here so other commands don't load the process pool machinery.
+    from branch_report import all_branches_report
+
+    report_date = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else date.today()
+    sections, totals = all_branches_report(report_date, workers=args.workers)
+    return [
+        {
+            'date': report_date,
+            'location_id': section['location_id'],
+            'location_name': section['location_name'],
+            'order_count': section['order_count'],
+            'total_weight': section['total_weight'],
+            'total_revenue': section['total_revenue'],
+            **{status: section['by_status'].get(status, 0) for status in ORDER_STATUSES}
+        }
+        for section in sections
+    ]
+
+def report_analytics(session, args):
+    # Computed with NumPy from one load of the matching orders. Imported here
+    # so other commands don't pay for loading NumPy.
+    from analytics import load_orders, view
+
+    created_from, created_before = date_range(args.start, args.end)
+    orders = load_orders(session, status=args.status, created_from=created_from, created_before=created_before, location_id=args.location, include_archived=args.include_archived)
+    return view(session, args.view, orders)
+
+def report_lifecycle(session, args):
+    from lifecycle import stage_latency
+    created_from, created_before = date_range(args.start, args.end)
+    return stage_latency(session, by_service=args.by_service, created_from=created_from, created_before=created_before, location_id=args.location, include_archived=args.include_archived)
+
+def report_stuck(session, args):
+    from lifecycle import stuck_orders, STUCK_AFTER_HOURS
+    created_from, created_before = date_range(args.start, args.end)
+    hours = args.hours if args.hours is not None else STUCK_AFTER_HOURS
+    return stuck_orders(session, hours, created_from=created_from, created_before=created_before, location_id=args.location)
+
+def report_rebuild_summary(session, args):
+    return [{'summary_rows': DailyOrderSummary.rebuild(session)}]
+
+def report_customer(session, args):
+    customer = require(Customer.find_by_id(session, args.id), f"No customer found with ID {args.id}")
+    totals = Order.summarize(session, by=(), customer_id=args.id, location_id=args.location, include_archived=args.include_archived)[0]
+    return [{
+        'customer_id': customer.id,
+        'location_id': args.location,
+        'name': customer.name,
+        'phone': customer.phone,
+        'order_count': totals.order_count,
+        'total_spent': totals.total_revenue
+    }]
+
+# ====== Parser ======
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("must be a positive number")
+    return number
+
+def add_command(subparsers, name, func, help):
+    parser = subparsers.add_parser(name, help=help)
+    parser.set_defaults(func=func)
+    return parser
+
+def build_parser():
+    parser = CommandParser(prog='cli.py', description="LaundryConnect batch commands. Run without arguments for the interactive menus.")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help="Output format (JSON Lines or CSV)")
+    resources = parser.add_subparsers(dest='resource', required=True, parser_class=CommandParser)
+
+    # Customers
+    customers = resources.add_parser('customers', help="Manage customers").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    add_command(customers, 'list', customers_list, "List all customers")
+    add_command(customers, 'get', customers_get, "Show a customer").add_argument('id', type=int)
+    add_command(customers, 'find', customers_find, "Find a customer by phone number").add_argument('phone')
+    command = add_command(customers, 'search', customers_search, "Search customers by name, email or address")
+    command.add_argument('text', nargs='+')
+    command.add_argument('--limit', type=int, default=SEARCH_LIMIT)
+    command = add_command(customers, 'create', customers_create, "Add a customer")
+    command.add_argument('--name', required=True)
+    command.add_argument('--phone', required=True)
+    command.add_argument('--email')
+    command.add_argument('--address')
+    command = add_command(customers, 'update', customers_update, "Update a customer")
+    command.add_argument('id', type=int)
+    command.add_argument('--name')
+    command.add_argument('--phone')
+    command.add_argument('--email')
+    command.add_argument('--address')
+    add_command(customers, 'delete', customers_delete, "Delete a customer").add_argument('id', type=int)
+    add_command(customers, 'orders', customers_orders, "List a customer's orders").add_argument('id', type=int)
+
+    # Services
+    services = resources.add_parser('services', help="Manage services").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    add_command(services, 'list', services_list, "List all services")
+    add_command(services, 'get', services_get, "Show a service").add_argument('id', type=int)
+    command = add_command(services, 'create', services_create, "Add a service")
+    command.add_argument('--name', required=True)
+    command.add_argument('--price', type=positive_float, required=True)
+    command.add_argument('--unit', choices=['kg', 'item'], required=True)
+    command.add_argument('--description')
+    command = add_command(services, 'update', services_update, "Update a service")
+    command.add_argument('id', type=int)
+    command.add_argument('--name')
+    command.add_argument('--price', type=positive_float)
+    command.add_argument('--unit', choices=['kg', 'item'])
+    command.add_argument('--description')
+    add_command(services, 'delete', services_delete, "Delete a service").add_argument('id', type=int)
+
+    # Orders
+    orders = resources.add_parser('orders', help="Manage orders").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    command = add_command(orders, 'list', orders_list, "List orders")
+    command.add_argument('--customer', type=int)
+    command.add_argument('--status', choices=ORDER_STATUSES)
+    command.add_argument('--date', help="Only orders created on this date (YYYY-MM-DD)")
+    command.add_argument('--location', type=int, help="Only orders for this branch (0 for orders without one)")
+    add_command(orders, 'get', orders_get, "Show an order").add_argument('id', type=int)
+    command = add_command(orders, 'create', orders_create, "Create an order")
+    command.add_argument('--customer', type=int, required=True)
+    command.add_argument('--service', type=int, required=True)
+    command.add_argument('--weight', type=positive_float, required=True)
+    command.add_argument('--pickup-date', required=True, help="YYYY-MM-DD")
+    command.add_argument('--pickup-time', choices=PICKUP_TIMES, required=True)
+    command.add_argument('--instructions')
+    command.add_argument('--location', type=int, help="Branch handling the order")
+    command = add_command(orders, 'status', orders_status, "Change an order's status")
+    command.add_argument('id', type=int)
+    command.add_argument('status', choices=ORDER_STATUSES)
+    command = add_command(orders, 'bulk-status', orders_bulk_status, "Change the status of many orders at once")
+    command.add_argument('status', choices=ORDER_STATUSES)
+    command.add_argument('ids', type=int, nargs='+')
+    command = add_command(orders, 'advance', orders_advance, "Move a day's pickups from one status to another")
+    command.add_argument('--pickup-date', help="YYYY-MM-DD, defaults to today")
+    command.add_argument('--pickup-time', choices=PICKUP_TIMES)
+    command.add_argument('--from', dest='from_status', choices=ORDER_STATUSES, required=True)
+    command.add_argument('--to', dest='to_status', choices=ORDER_STATUSES, help="Defaults to the next status")
+    command = add_command(orders, 'reschedule', orders_reschedule, "Move an order to another pickup slot")
+    command.add_argument('id', type=int)
+    command.add_argument('--pickup-date', help="YYYY-MM-DD")
+    command.add_argument('--pickup-time', choices=PICKUP_TIMES)
+    command = add_command(orders, 'dispatch', orders_dispatch, "Driver batches for a pickup window, grouped by area")
+    command.add_argument('--pickup-date', help="YYYY-MM-DD, defaults to today")
+    command.add_argument('--pickup-time', choices=PICKUP_TIMES, required=True)
+    command.add_argument('--location', type=int, help="Only this branch (0 for orders without one)")
+    command.add_argument('--drivers', type=int, help="Drivers per branch; one batch each")
+    command.add_argument('--batch-size', type=int, help="Stops per batch when --drivers isn't given (default 15)")
+    add_command(orders, 'delete', orders_delete, "Delete an order").add_argument('id', type=int)
+    add_command(orders, 'history', orders_history, "Show an order's status history").add_argument('id', type=int)
+    add_export_arguments(add_command(orders, 'export', orders_export, "Export orders to a CSV or JSONL file"))
+    add_archive_arguments(add_command(orders, 'archive', orders_archive, "Move old completed orders into the archive tables"))
+
+    # Locations
+    locations = resources.add_parser('locations', help="Manage locations").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    add_command(locations, 'list', locations_list, "List all locations")
+    add_command(locations, 'get', locations_get, "Show a location").add_argument('id', type=int)
+    command = add_command(locations, 'create', locations_create, "Add a location")
+    command.add_argument('--name', required=True)
+    command.add_argument('--address', required=True)
+    command.add_argument('--phone', required=True)
+    command.add_argument('--email')
+    command.add_argument('--slot-capacity', type=int, help="Orders per pickup window")
+    command = add_command(locations, 'update', locations_update, "Update a location")
+    command.add_argument('id', type=int)
+    command.add_argument('--name')
+    command.add_argument('--address')
+    command.add_argument('--phone')
+    command.add_argument('--email')
+    command.add_argument('--slot-capacity', type=int, help="Orders per pickup window")
+    add_command(locations, 'delete', locations_delete, "Delete a location").add_argument('id', type=int)
+
+    # Pickup slots
+    slots = resources.add_parser('slots', help="Pickup slot capacity").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    command = add_command(slots, 'next', slots_next, "The next pickup slots with room")
+    command.add_argument('--from', dest='start', help="First day, YYYY-MM-DD, defaults to today")
+    command.add_argument('--count', type=int, default=NEXT_FREE_SLOTS)
+    add_command(slots, 'get', slots_get, "Bookings and capacity of one slot")
+    command = add_command(slots, 'set', slots_set, "Set one slot's capacity")
+    command.add_argument('--capacity', type=int, help="Leave out to use the branch's capacity")
+    for command in (slots.choices['get'], slots.choices['set']):
+        command.add_argument('pickup_date', help="YYYY-MM-DD")
+        command.add_argument('pickup_time', choices=PICKUP_TIMES)
+    for command in (slots.choices['next'], slots.choices['get'], slots.choices['set']):
+        command.add_argument('--location', type=int, help="Branch (0 or left out for orders without one)")
+    add_command(slots, 'rebuild', slots_rebuild, "Recount every slot's bookings from the orders")
+
+    # Reports
+    reports = resources.add_parser('report', help="Run reports").add_subparsers(dest='action', required=True, parser_class=CommandParser)
+    command = add_command(reports, 'daily', report_daily, "Orders by status and service for a day")
+    command.add_argument('--date', help="YYYY-MM-DD, defaults to today")
+    command.add_argument('--details', action='store_true', help="List the day's orders instead of the summary")
+    command.add_argument('--location', type=int, help="Only this branch (0 for orders without one)")
+    command = add_command(reports, 'customer', report_customer, "Order totals for a customer")
+    command.add_argument('id', type=int)
+    command.add_argument('--location', type=int, help="Only orders for this branch")
+    command = add_command(reports, 'branches', report_branches, "Order totals for every branch, computed in parallel")
+    command.add_argument('--date', help="YYYY-MM-DD, defaults to today")
+    command.add_argument('--workers', type=int, help="Worker processes, defaults to one per branch up to the CPU count")
+    for period in ('weekly', 'monthly'):
+        command = add_command(reports, period, report_revenue, f"Orders and revenue per {period[:-2]}")
+        command.set_defaults(period=period[:-2])
+        command.add_argument('--from', dest='start', required=True, help="First day, YYYY-MM-DD")
+        command.add_argument('--to', dest='end', help="Last day, YYYY-MM-DD, defaults to today")
+        command.add_argument('--by-status', action='store_true', help="Split each period by status")
+    command = add_command(reports, 'analytics', report_analytics, "Revenue, weight and customer spend analytics")
+    command.add_argument('view', choices=ANALYTICS_VIEWS)
+    command.add_argument('--from', dest='start', help="First day, YYYY-MM-DD")
+    command.add_argument('--to', dest='end', help="Last day, YYYY-MM-DD")
+    command.add_argument('--status', choices=ORDER_STATUSES)
+    command.add_argument('--location', type=int, help="Only this branch (0 for orders without one)")
+    command = add_command(reports, 'lifecycle', report_lifecycle, "Time orders spend in each stage, with percentiles")
+    command.add_argument('--by-service', action='store_true', help="Split each stage by service")
+    command = add_command(reports, 'stuck', report_stuck, "Unfinished orders whose status hasn't changed for a while")
+    command.add_argument('--hours', type=positive_float, help="Hours without a change (default 48)")
+    for command in (reports.choices['lifecycle'], reports.choices['stuck']):
+        command.add_argument('--from', dest='start', help="Orders created from this day, YYYY-MM-DD")
+        command.add_argument('--to', dest='end', help="Orders created up to this day, YYYY-MM-DD")
+        command.add_argument('--location', type=int, help="Only this branch (0 for orders without one)")
+    for command in (reports.choices['customer'], reports.choices['analytics'], reports.choices['lifecycle']):
+        command.add_argument('--include-archived', action='store_true', help="Include orders moved to the archive")
+    add_command(reports, 'rebuild-summary', report_rebuild_summary, "Recompute the daily order summary from all orders")
+
+    # Batch
+    command = resources.add_parser('batch', help="Run a file of commands in one session")
+    command.add_argument('path', help="One command per line; blank lines and lines starting with # are skipped")
+    command.add_argument('--stop-on-error', action='store_true')
+
+    return parser
+
+# ====== Output ======
+
+def to_text(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+class RecordWriter:
+    def __init__(self, format, stream=None):
+        self.format = format
+        # Looked up here rather than as the default, so redirecting stdout works
+        self.stream = stream or sys.stdout
+        self.csv_fields = None
+        self.csv_writer = None
+
+    def write(self, records):
+        for record in records:
+            if self.format == 'json':
+                self.stream.write(json.dumps(record, default=to_text) + '\n')
+            else:
+                # Start a new header whenever the shape of the records changes
+                if list(record) != self.csv_fields:
+                    self.csv_fields = list(record)
+                    self.csv_writer = csv.DictWriter(self.stream, fieldnames=self.csv_fields)
+                    self.csv_writer.writeheader()
+                self.csv_writer.writerow({key: to_text(value) for key, value in record.items()})
+
+def report_error(message, line=None):
+    error = {'error': message}
+    if line is not None:
+        error['line'] = line
+    sys.stderr.write(json.dumps(error) + '\n')
+
+# ====== Runner ======
+
+def execute(session, args, writer):
+    # Run one parsed command. Returns True on success.
+    if profiler.enabled:
+        profiler.start_action(args.func.__name__)
+        try:
+            return run_command(session, args, writer)
+        finally:
+            # stdout carries the command's output
+            print(profiler.format_summary(profiler.finish_action()), file=sys.stderr)
+    return run_command(session, args, writer)
+
+def run_command(session, args, writer):
+    try:
+        writer.write(args.func(session, args))
+        return True
+    except ValueError as e:
+        session.rollback()
+        report_error(str(e), getattr(args, 'line', None))
+    except SQLAlchemyError as e:
+        session.rollback()
+        report_error(f"Database error: {e.__class__.__name__}: {e.orig if hasattr(e, 'orig') else e}", getattr(args, 'line', None))
+    return False
+
+def run_batch(session, parser, path, writer, stop_on_error=False):
+    failures = 0
+
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except ValueError as e:
+                report_error(str(e), line_number)
+                failures += 1
+                if stop_on_error:
+                    break
+                continue
+
+            if args.resource == 'batch':
+                report_error("Batch files cannot run other batch files", line_number)
+                failures += 1
+                continue
+
+            args.line = line_number
+            if not execute(session, args, writer):
+                failures += 1
+                if stop_on_error:
+                    break
+
+    return failures
+
+def run_command_line(argv):
+    parser = build_parser()
+
+    try:
+        args = parser.parse_args(argv)
+    except CommandError as e:
+        parser.print_usage(sys.stderr)
+        report_error(str(e))
+        return 2
+
+    writer = RecordWriter(args.format)
+    session = Session()
+
+    try:
+        if args.resource == 'batch':
+            failures = run_batch(session, parser, args.path, writer, args.stop_on_error)
+        else:
+            failures = 0 if execute(session, args, writer) else 1
+    except OSError as e:
+        report_error(str(e))
+        failures = 1
+    finally:
+        session.close()
+
+    return 1 if failures else 0
@@ -0,0 +1,99 @@
+# lib/db/archive_orders.py
+#
+# Moves completed orders older than a given age, with their status history,
+# out of the live tables into orders_archive and order_status_history_archive.
+# Each chunk of orders is moved in its own transaction, so the job never
+# holds the write lock for long and can be interrupted and run again. The
+# daily order summary keeps counting archived orders; reports that read
+# orders themselves include them only when asked to. Afterwards the database
+# is analyzed and vacuumed, so the live tables and their indexes are compact.
+#
+#     cd lib && python -m db.archive_orders --older-than 365
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from models import Session, ArchivedOrder
+from models.archive import ARCHIVE_CHUNK_SIZE
+from db.options import add_archive_arguments, ARCHIVE_AFTER_DAYS
+
+def database_size(connection):
+    # Bytes in use by the database file, excluding free pages
+    page_size = connection.exec_driver_sql("PRAGMA page_size").scalar()
+    page_count = connection.exec_driver_sql("PRAGMA page_count").scalar()
+    free_pages = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+    return page_size * page_count, page_size * (page_count - free_pages)
+
+def compact(engine, vacuum=True):
+    # Refresh the planner statistics, then rebuild the file so the space
+    # the archived orders left behind in the live tables is reclaimed.
+    # VACUUM can't run inside a transaction.
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.exec_driver_sql("ANALYZE")
+        if vacuum:
+            connection.exec_driver_sql("VACUUM")
+        return database_size(connection)
+
+def archive_orders(older_than_days=ARCHIVE_AFTER_DAYS, chunk_size=ARCHIVE_CHUNK_SIZE, vacuum=True, verbose=True):
+    if older_than_days < 0:
+        raise ValueError("The age must be zero or more days")
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be positive")
+
+    created_before = datetime.utcnow() - timedelta(days=older_than_days)
+    session = Session()
+    engine = session.get_bind()
+    orders = history_rows = chunks = 0
+    started = time.perf_counter()
+
+    try:
+        file_before = database_size(session.connection())[0]
+        session.commit()
+
+        last_id = None
+        while True:
+            moved = ArchivedOrder.archive_chunk(session, created_before, last_id, chunk_size)
+            if moved is None:
+                break
+            last_id, order_count, history_count = moved
+            orders += order_count
+            history_rows += history_count
+            chunks += 1
+
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"\r{orders} orders archived (up to id {last_id}) | {orders / elapsed:,.0f} orders/sec", end='', flush=True)
+    finally:
+        session.close()
+
+    archived_seconds = time.perf_counter() - started
+    if verbose and orders:
+        print()
+        print("Analyzing" + (" and vacuuming" if vacuum else "") + " the database...")
+
+    file_after, used_after = compact(engine, vacuum)
+
+    return {
+        'created_before': created_before,
+        'orders': orders,
+        'history_rows': history_rows,
+        'chunks': chunks,
+        'archive_seconds': archived_seconds,
+        'seconds': time.perf_counter() - started,
+        'file_bytes_before': file_before,
+        'file_bytes_after': file_after,
+        'used_bytes_after': used_after
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old completed orders and their history into the archive tables.")
+    add_archive_arguments(parser)
+    args = parser.parse_args()
+
+    result = archive_orders(args.older_than, args.chunk_size, args.vacuum)
+    print(f"Archived {result['orders']} orders created before {result['created_before']:%Y-%m-%d} and {result['history_rows']} history rows in {result['chunks']} chunks ({result['archive_seconds']:.1f}s)")
+    print(f"Database file: {result['file_bytes_before'] / 2**20:,.1f} MB -> {result['file_bytes_after'] / 2**20:,.1f} MB, finished in {result['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
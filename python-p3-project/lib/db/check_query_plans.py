@@ -0,0 +1,115 @@
+# lib/db/check_query_plans.py
+#
+# Runs every model finder against an empty in-memory database, captures the
+# SQL it issues and fails if SQLite's query plan for any of it scans a whole
+# table instead of using an index.
+#
+#     cd lib && python -m db.check_query_plans
+
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Customer, Service, Order, Location, OrderStatusHistory, DailyOrderSummary, ArchivedOrder, PickupSlot
+
+def finder_calls():
+    day_start = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+
+    return [
+        ("Customer.find_by_id", lambda session: Customer.find_by_id(session, 1)),
+        ("Customer.find_by_phone", lambda session: Customer.find_by_phone(session, "0712345678")),
+        ("Customer.search", lambda session: Customer.search(session, "wanjau thika")),
+        ("Service.find_by_id", lambda session: Service.find_by_id(session, 1)),
+        ("Service.find_by_name", lambda session: Service.find_by_name(session, "Express Service")),
+        ("Location.find_by_id", lambda session: Location.find_by_id(session, 1)),
+        ("Order.find_by_id", lambda session: Order.find_by_id(session, 1)),
+        ("Order.find_by_customer", lambda session: Order.find_by_customer(session, 1)),
+        ("Order.find_by_status", lambda session: Order.find_by_status(session, "placed")),
+        ("Order.find_ids_for_pickup", lambda session: Order.find_ids_for_pickup(session, day_start.date(), "morning", status="placed")),
+        ("Order.find_for_dispatch", lambda session: Order.find_for_dispatch(session, day_start.date(), "morning")),
+        ("Order.find_for_dispatch(branch)", lambda session: Order.find_for_dispatch(session, day_start.date(), "morning", location_id=1)),
+        ("Order.bulk_update_status", lambda session: Order.bulk_update_status(session, [1, 2, 3], "pickup")),
+        ("Order.query_with_details(customer)", lambda session: Order.query_with_details(session, customer_id=1).all()),
+        ("Order.query_with_details(day)", lambda session: Order.query_with_details(session, created_from=day_start, created_before=day_end).all()),
+        ("Order.summarize(day)", lambda session: Order.summarize(session, by=('status', 'service'), created_from=day_start, created_before=day_end)),
+        ("Order.summarize(customer)", lambda session: Order.summarize(session, by=(), customer_id=1)),
+        ("Order.summarize(customer, archived)", lambda session: Order.summarize(session, by=(), customer_id=1, include_archived=True)),
+        ("Order.summarize(branch day)", lambda session: Order.summarize(session, by=('customer',), location_id=1, created_from=day_start, created_before=day_end)),
+        ("Order.query_with_details(branch day)", lambda session: Order.query_with_details(session, location_id=1, created_from=day_start, created_before=day_end).all()),
+        ("Order.stream_for_export(resume)", lambda session: [rows for rows in Order.stream_for_export(session, with_customer=True, after_id=1000)]),
+        ("Order.stream_for_export(day)", lambda session: [rows for rows in Order.stream_for_export(session, created_from=day_start, created_before=day_end)]),
+        ("Order.stream_stuck", lambda session: Order.stream_stuck(session, day_start).all()),
+        ("Order.stream_stuck(branch)", lambda session: Order.stream_stuck(session, day_start, location_id=1).all()),
+        ("OrderStatusHistory.get_all_by_order", lambda session: OrderStatusHistory.get_all_by_order(session, 1)),
+        ("OrderStatusHistory.get_all_by_orders", lambda session: OrderStatusHistory.get_all_by_orders(session, [1, 2, 3])),
+        ("PickupSlot.availability", lambda session: PickupSlot.availability(session, day_start.date(), 'morning', 1)),
+        ("PickupSlot.next_free", lambda session: PickupSlot.next_free(session, 1)),
+        ("PickupSlot.book", lambda session: PickupSlot.book(session, day_start.date(), 'morning', 1)),
+        ("ArchivedOrder.find_by_customer", lambda session: ArchivedOrder.find_by_customer(session, 1)),
+        # Only the selection query runs: nothing is created before 1970
+        ("ArchivedOrder.archive_chunk", lambda session: ArchivedOrder.archive_chunk(session, datetime(1970, 1, 1))),
+        ("DailyOrderSummary.report(day)", lambda session: DailyOrderSummary.report(session, day_start.date(), day_end.date())),
+        ("DailyOrderSummary.report(branch day)", lambda session: DailyOrderSummary.report(session, day_start.date(), day_end.date(), location_id=1)),
+        ("DailyOrderSummary.report(month)", lambda session: DailyOrderSummary.report(session, day_start.date() - timedelta(days=365), day_end.date(), period='month', by=())),
+    ]
+
+def full_scans(connection, statement, parameters):
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    # Each plan row is (id, parent, notused, detail). A "SCAN <table>" step
+    # without an index is a full table scan. Scanning a subquery's result
+    # (a MATERIALIZE or CO-ROUTINE step) is not, as its own plan is checked.
+    subqueries = {
+        row[3].split(" ", 1)[1] for row in plan
+        if row[3].startswith(("MATERIALIZE ", "CO-ROUTINE "))
+    }
+    return [
+        row[3] for row in plan
+        if row[3].startswith("SCAN ") and "INDEX" not in row[3]
+        and row[3].split(" ", 1)[1] not in subqueries
+    ]
+
+def check_query_plans():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    failures = []
+
+    for name, call in finder_calls():
+        session = Session()
+        captured.clear()
+        call(session)
+        statements = list(captured)
+        session.close()
+
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                # Writes are checked too: an UPDATE or DELETE finds its rows
+                # the same way a SELECT does
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                scans = full_scans(connection, statement, parameters)
+                status = "FULL SCAN" if scans else "ok"
+                print(f"{name:<40} {status}")
+                for detail in scans:
+                    failures.append((name, detail))
+                    print(f"    {detail}")
+
+    if failures:
+        print(f"\n{len(failures)} full table scan(s) found.")
+        return False
+
+    print("\nAll finders use indexes.")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if check_query_plans() else 1)
@@ -0,0 +1,207 @@
+# lib/db/export_orders.py
+#
+# Streams orders to a CSV or JSONL file, optionally gzipped and optionally
+# with each order's customer, service and status history. Orders are read
+# from one cursor in batches and written one batch at a time, so memory
+# stays flat however many are exported. After every batch the last exported
+# id is saved to a checkpoint file next to the output; --resume carries on
+# from there, after an interruption or to add orders created since.
+#
+#     cd lib && python -m db.export_orders orders.csv.gz --with customer service --from 2026-01-01
+#     cd lib && python -m db.export_orders orders.csv.gz --with customer service --from 2026-01-01 --resume
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from datetime import datetime, date, timedelta
+
+from models import Session, Order, Service, OrderStatusHistory
+from models.order import EXPORT_COLUMNS, EXPORT_CUSTOMER_COLUMNS, ORDER_STATUSES
+from db.options import add_export_arguments, EXPORT_BATCH_SIZE, FORMATS, INCLUDES
+
+def export_format(path, format=None):
+    # (format, gzipped) for an output path such as orders.jsonl.gz
+    gzipped = path.endswith('.gz')
+    if format is None:
+        extension = os.path.splitext(path[:-3] if gzipped else path)[1].lower().lstrip('.')
+        format = 'jsonl' if extension in ('jsonl', 'ndjson') else extension
+    if format not in FORMATS:
+        raise ValueError(f"Export format must be one of: {', '.join(FORMATS)}")
+    return format, gzipped
+
+def export_fields(include):
+    fields = list(EXPORT_COLUMNS)
+    if 'customer' in include:
+        fields += [f'customer_{column}' for column in EXPORT_CUSTOMER_COLUMNS]
+    if 'service' in include:
+        fields += ['service_name', 'service_unit']
+    if 'history' in include:
+        fields.append('status_history')
+    return fields
+
+def to_text(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def export_record(row, include, catalog, history):
+    record = dict(row._mapping)
+    if 'service' in include:
+        service = catalog.get(row.service_id)
+        record['service_name'] = service.name if service else None
+        record['service_unit'] = service.unit if service else None
+    if 'history' in include:
+        record['status_history'] = [
+            {'status': status, 'timestamp': timestamp}
+            for status, timestamp in history.get(row.id, [])
+        ]
+    return record
+
+def render(records, format, fields, header):
+    # One batch of records as text
+    buffer = io.StringIO()
+    if format == 'jsonl':
+        for record in records:
+            buffer.write(json.dumps(record, default=to_text) + '\n')
+    else:
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        if header:
+            writer.writeheader()
+        for record in records:
+            if 'status_history' in record:
+                record['status_history'] = '; '.join(
+                    f"{entry['status']} {to_text(entry['timestamp'])}" for entry in record['status_history']
+                )
+            writer.writerow({key: to_text(value) for key, value in record.items()})
+    return buffer.getvalue()
+
+def checkpoint_path(path):
+    return f"{path}.checkpoint"
+
+def read_checkpoint(path):
+    try:
+        with open(checkpoint_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def write_checkpoint(path, checkpoint):
+    # Replace rather than rewrite, so a crash never leaves half a checkpoint
+    temporary = f"{checkpoint_path(path)}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(temporary, checkpoint_path(path))
+
+def export_orders(path, format=None, include=(), status=None, created_from=None, created_before=None,
+                  location_id=None, resume=False, batch_size=EXPORT_BATCH_SIZE, verbose=True):
+    format, gzipped = export_format(path, format)
+    for name in include:
+        if name not in INCLUDES:
+            raise ValueError(f"Can only include: {', '.join(INCLUDES)}")
+    if status is not None and status not in ORDER_STATUSES:
+        raise ValueError(f"Status must be one of: {', '.join(ORDER_STATUSES)}")
+
+    include = sorted(set(include))
+    fields = export_fields(include)
+    options = {
+        'format': format,
+        'include': include,
+        'status': status,
+        'created_from': to_text(created_from),
+        'created_before': to_text(created_before),
+        'location_id': location_id
+    }
+
+    # A resumed export continues from the last batch the checkpoint
+    # recorded, dropping anything written after it
+    checkpoint = read_checkpoint(path) if resume else None
+    if checkpoint:
+        if checkpoint['options'] != options:
+            raise ValueError("The checkpoint was written by an export with different options")
+        output = open(path, 'r+b')
+        output.truncate(checkpoint['bytes'])
+        output.seek(checkpoint['bytes'])
+    else:
+        checkpoint = {'options': options, 'last_id': None, 'bytes': 0, 'rows': 0}
+        output = open(path, 'wb')
+
+    resumed_from = checkpoint['last_id']
+    session = Session()
+    catalog = Service.get_catalog(session) if 'service' in include else {}
+    exported = 0
+    started = time.perf_counter()
+
+    try:
+        batches = Order.stream_for_export(
+            session, with_customer='customer' in include, after_id=checkpoint['last_id'], chunk_size=batch_size,
+            status=status, created_from=created_from, created_before=created_before, location_id=location_id
+        )
+        for rows in batches:
+            history = OrderStatusHistory.get_all_by_orders(session, [row.id for row in rows]) if 'history' in include else {}
+            text = render(
+                (export_record(row, include, catalog, history) for row in rows),
+                format, fields, header=checkpoint['bytes'] == 0
+            )
+
+            # Each gzipped batch is a complete gzip member; concatenated
+            # members are still one valid .gz file
+            data = text.encode('utf-8')
+            output.write(gzip.compress(data) if gzipped else data)
+            output.flush()
+            os.fsync(output.fileno())
+
+            exported += len(rows)
+            checkpoint.update(last_id=rows[-1].id, bytes=output.tell(), rows=checkpoint['rows'] + len(rows))
+            write_checkpoint(path, checkpoint)
+
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"\r{exported} orders exported (up to id {rows[-1].id}) | {exported / elapsed:,.0f} rows/sec", end='', flush=True)
+
+        # An export with nothing to write still gets its CSV header
+        if format == 'csv' and checkpoint['bytes'] == 0:
+            data = render([], format, fields, header=True).encode('utf-8')
+            output.write(gzip.compress(data) if gzipped else data)
+    finally:
+        session.close()
+        output.close()
+
+    elapsed = time.perf_counter() - started
+    if verbose and exported:
+        print()
+
+    return {
+        'path': path,
+        'exported': exported,
+        'total_rows': checkpoint['rows'],
+        'resumed_after_id': resumed_from,
+        'last_id': checkpoint['last_id'],
+        'bytes': checkpoint['bytes'],
+        'seconds': elapsed,
+        'rows_per_sec': exported / elapsed if elapsed else 0
+    }
+
+def export_from_args(args, verbose=True):
+    created_from = datetime.strptime(args.date_from, '%Y-%m-%d') if args.date_from else None
+    created_before = datetime.strptime(args.date_to, '%Y-%m-%d') + timedelta(days=1) if args.date_to else None
+    return export_orders(
+        args.path, args.file_format, args.include, args.status, created_from, created_before,
+        args.location, args.resume, args.batch_size, verbose
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Export orders to a CSV or JSONL file.")
+    add_export_arguments(parser)
+    args = parser.parse_args()
+
+    result = export_from_args(args)
+    resumed = f" after id {result['resumed_after_id']}" if result['resumed_after_id'] else ""
+    print(f"Exported {result['exported']} orders{resumed} in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/sec)")
+    print(f"{result['path']} holds {result['total_rows']} orders up to id {result['last_id']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# lib/db/generate.py
+#
+# Generates a production-shaped database for capacity planning. Customers,
+# orders and their status history are produced from a seeded random number
+# generator, so the same arguments always give the same data, and written
+# with bulk inserts in chunked transactions. The date span ends on a fixed
+# day unless --end-date says otherwise, so that holds on any day it is run.
+#
+#     cd lib && python -m db.generate --customers 200000 --orders-per-customer 5 --days 365 --seed 42
+
+import argparse
+import random
+import time
+from datetime import datetime, date, timedelta
+
+from sqlalchemy import insert, func
+
+from models import Session, create_tables, drop_tables, OUTDATED_SCHEMA_MESSAGE, Customer, Service, Order, ArchivedOrder, Location, OrderStatusHistory, DailyOrderSummary, PickupSlot
+from models.order import ORDER_STATUSES, PICKUP_TIMES
+
+GENERATE_BATCH_SIZE = 5000
+
+DEFAULT_STATUS_MIX = 'placed=5,pickup=5,processing=10,delivery=10,completed=70'
+
+# Last day of the date span by default. Fixed rather than today, so a seed
+# gives the same data whenever it is run.
+DEFAULT_END_DATE = date(2026, 6, 30)
+
+# Used when the database has no services or locations yet
+DEFAULT_SERVICES = [
+    {'name': 'Standard Wash & Iron', 'description': 'Regular clothes washing with premium detergents and expert ironing.', 'price_per_unit': 200, 'unit': 'kg'},
+    {'name': 'Express Service', 'description': 'Same day service for urgent laundry needs.', 'price_per_unit': 350, 'unit': 'kg'},
+    {'name': 'Dry Cleaning', 'description': 'Professional dry cleaning for suits, coats, and delicate fabrics.', 'price_per_unit': 500, 'unit': 'item'},
+    {'name': 'Duvet & Bedding', 'description': 'Deep cleaning for duvets, blankets and bedding.', 'price_per_unit': 400, 'unit': 'item'},
+]
+
+DEFAULT_LOCATIONS = [
+    {'name': 'LaundryConnect Main Branch', 'address': '123 Mombasa Rd, Nairobi', 'phone': '+254 700 123456', 'email': 'main@laundryconnect.co.ke'},
+    {'name': 'LaundryConnect Westlands', 'address': '456 Waiyaki Way, Westlands', 'phone': '+254 700 234567', 'email': 'westlands@laundryconnect.co.ke'},
+    {'name': 'LaundryConnect Kasarani', 'address': '12 Thika Rd, Kasarani', 'phone': '+254 700 345678', 'email': 'kasarani@laundryconnect.co.ke'},
+    {'name': 'LaundryConnect Karen', 'address': '78 Langata Rd, Karen', 'phone': '+254 700 456789', 'email': 'karen@laundryconnect.co.ke'},
+]
+
+FIRST_NAMES = [
+    'John', 'Jane', 'Michael', 'Mary', 'Peter', 'Grace', 'David', 'Faith', 'James', 'Mercy',
+    'Brian', 'Esther', 'Kevin', 'Joy', 'Samuel', 'Ann', 'Daniel', 'Lucy', 'Paul', 'Ruth'
+]
+
+LAST_NAMES = [
+    'Wanjau', 'Otieno', 'Kamau', 'Njeri', 'Mwangi', 'Achieng', 'Kiprop', 'Wambui', 'Omondi', 'Mutua',
+    'Chebet', 'Kariuki', 'Auma', 'Ndungu', 'Wafula', 'Nyambura', 'Kibet', 'Atieno', 'Maina', 'Koech'
+]
+
+STREETS = [
+    'Thika Rd', 'Ngong Rd', 'Mombasa Rd', 'Waiyaki Way', 'Jogoo Rd', 'Langata Rd',
+    'Kiambu Rd', 'Limuru Rd', 'Outer Ring Rd', 'Kangundo Rd'
+]
+
+ESTATES = [
+    'Kasarani', 'Roysambu', 'Kilimani', 'Karen', 'Westlands', 'Donholm', 'Buruburu',
+    'South B', 'Embakasi', 'Ruaka', 'Kileleshwa', 'Umoja'
+]
+
+def parse_status_mix(value):
+    # "placed=5,completed=70" -> ([statuses], [weights])
+    statuses = []
+    weights = []
+    for part in value.split(','):
+        status, _, weight = part.partition('=')
+        status = status.strip()
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Unknown status '{status}'")
+        statuses.append(status)
+        weights.append(float(weight))
+    return statuses, weights
+
+def ensure_catalog(session, created_at):
+    if not session.query(Service.id).first():
+        session.execute(insert(Service.__table__), [{**service, 'created_at': created_at} for service in DEFAULT_SERVICES])
+    if not session.query(Location.id).first():
+        session.execute(insert(Location.__table__), [{**location, 'created_at': created_at} for location in DEFAULT_LOCATIONS])
+    session.commit()
+    services = list(Service.get_catalog(session).values())
+    location_ids = [id for (id,) in session.query(Location.id).order_by(Location.id)]
+    return services, location_ids
+
+def sql_value(value):
+    # The same text formats SQLAlchemy's SQLite DateTime and Date types use
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='microseconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def bulk_insert(session, table, rows, batch_size):
+    # Plain DBAPI executemany. At millions of rows SQLAlchemy's per-row
+    # parameter processing costs more than SQLite's insert itself.
+    if not rows:
+        return
+    columns = list(rows[0])
+    statement = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    connection = session.connection()
+    for offset in range(0, len(rows), batch_size):
+        connection.exec_driver_sql(
+            statement,
+            [tuple(sql_value(row[column]) for column in columns) for row in rows[offset:offset + batch_size]]
+        )
+
+def next_id(session, *models):
+    # The first id after every id used in any of the tables, e.g. orders and
+    # the archive their ids must not collide with
+    return max(session.query(func.max(model.id)).scalar() or 0 for model in models) + 1
+
+def generate_customers(rng, first_id, count, start, end):
+    span = (end - start).total_seconds()
+    customers = []
+    for customer_id in range(first_id, first_id + count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        # Numbers are derived from the id so they are unique and stable
+        phone = f"07{customer_id % 10**8:08d}"
+        customers.append({
+            'id': customer_id,
+            'name': f"{first} {last}",
+            'phone': phone,
+            'phone_e164': Customer.normalize_phone(phone),
+            'email': f"{first.lower()}.{last.lower()}{customer_id}@example.com" if rng.random() < 0.6 else None,
+            'address': f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(ESTATES)}",
+            'created_at': start + timedelta(seconds=rng.random() * span)
+        })
+    return customers
+
+def generate_orders(rng, customers, first_order_id, args, services, location_ids, statuses, weights, end):
+    orders = []
+    history = []
+    order_id = first_order_id
+    depth = args.history_depth
+
+    for customer in customers:
+        # Exponentially distributed around the requested mean, rounded:
+        # most customers order a few times, a few order many times
+        count = max(0, round(rng.expovariate(1 / args.orders_per_customer))) if args.orders_per_customer else 0
+        span = (end - customer['created_at']).total_seconds()
+
+        for _ in range(count):
+            service = rng.choice(services)
+            weight = round(rng.uniform(1, 15), 1) if service.unit == 'kg' else rng.randint(1, 10)
+            created_at = customer['created_at'] + timedelta(seconds=rng.random() * span)
+            status = rng.choices(statuses, weights)[0]
+
+            orders.append({
+                'id': order_id,
+                'customer_id': customer['id'],
+                'service_id': service.id,
+                'location_id': rng.choice(location_ids),
+                'weight': weight,
+                'total_price': service.price_per_unit * weight,
+                'status': status,
+                'pickup_date': created_at.date() + timedelta(days=rng.randint(0, 2)),
+                'pickup_time': rng.choice(PICKUP_TIMES),
+                'special_instructions': None,
+                'created_at': created_at
+            })
+
+            # One history row per stage reached, a few hours apart. With a
+            # history depth only the last stages are kept.
+            stages = ORDER_STATUSES[:ORDER_STATUSES.index(status) + 1]
+            timestamp = created_at
+            stage_rows = []
+            for stage in stages:
+                stage_rows.append({'order_id': order_id, 'status': stage, 'timestamp': timestamp})
+                timestamp += timedelta(hours=rng.uniform(1, 30))
+            history.extend(stage_rows[-depth:] if depth else stage_rows)
+
+            order_id += 1
+
+    return orders, history
+
+def generate(args):
+    rng = random.Random(args.seed)
+    statuses, weights = parse_status_mix(args.status_mix)
+
+    if args.reset:
+        drop_tables()
+    # Stamped like any database the app creates, so the CLI starts without
+    # checking its tables
+    if not create_tables():
+        raise SystemExit(OUTDATED_SCHEMA_MESSAGE)
+
+    session = Session()
+    # Dates run up to the end of end_date
+    end = datetime.combine(args.end_date, datetime.min.time()) + timedelta(days=1)
+    start = end - timedelta(days=args.days)
+
+    try:
+        services, location_ids = ensure_catalog(session, start)
+        customer_id = next_id(session, Customer)
+        order_id = next_id(session, Order, ArchivedOrder)
+
+        started = time.perf_counter()
+        total_rows = 0
+
+        remaining = args.customers
+        while remaining:
+            count = min(args.batch_size, remaining)
+            customers = generate_customers(rng, customer_id, count, start, end)
+            orders, history = generate_orders(rng, customers, order_id, args, services, location_ids, statuses, weights, end)
+
+            # One transaction per chunk of customers and their orders
+            bulk_insert(session, Customer.__table__, customers, args.batch_size)
+            bulk_insert(session, Order.__table__, orders, args.batch_size)
+            bulk_insert(session, OrderStatusHistory.__table__, history, args.batch_size)
+            session.commit()
+
+            customer_id += count
+            order_id += len(orders)
+            remaining -= count
+            total_rows += len(customers) + len(orders) + len(history)
+
+            elapsed = time.perf_counter() - started
+            print(
+                f"\r{args.customers - remaining:,}/{args.customers:,} customers | "
+                f"{order_id - 1:,} orders | {total_rows:,} rows | {total_rows / elapsed:,.0f} rows/sec",
+                end='', flush=True
+            )
+        print()
+
+        # The bulk inserts bypass Order's summary and slot upkeep
+        DailyOrderSummary.rebuild(session)
+        PickupSlot.rebuild(session)
+
+        # Give the query planner statistics for the new data
+        session.connection().exec_driver_sql("ANALYZE")
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Generated {total_rows:,} rows in {elapsed:.1f}s")
+
+def valid_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic LaundryConnect data.")
+    parser.add_argument('--customers', type=int, default=10000)
+    parser.add_argument('--orders-per-customer', type=float, default=5, help="Mean orders per customer")
+    parser.add_argument('--days', type=int, default=365, help="Spread order dates over this many days")
+    parser.add_argument('--end-date', type=valid_date, default=DEFAULT_END_DATE, help=f"Last day of the date span (YYYY-MM-DD, default {DEFAULT_END_DATE}); the same seed and end date give the same data")
+    parser.add_argument('--status-mix', default=DEFAULT_STATUS_MIX, help="Relative weights, e.g. 'placed=5,completed=95'")
+    parser.add_argument('--history-depth', type=int, default=0, help="Keep only the last N status changes per order (0 keeps all)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=GENERATE_BATCH_SIZE, help="Rows per insert batch")
+    parser.add_argument('--reset', action='store_true', help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    try:
+        parse_status_mix(args.status_mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    generate(args)
+
+if __name__ == "__main__":
+    main()
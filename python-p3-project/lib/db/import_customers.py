@@ -0,0 +1,176 @@
+# lib/db/import_customers.py
+#
+# Streams customers from a CSV or JSONL file into the database. Rows are
+# validated with the Customer rules in batches, deduplicated on normalized
+# phone number and inserted one chunked transaction per batch. Rejected rows
+# are written to a reject file with the reason.
+#
+#     cd lib && python -m db.import_customers customers.csv --reject-file rejects.csv
+
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from models import Session, Customer
+
+IMPORT_BATCH_SIZE = 1000
+
+CUSTOMER_FIELDS = ['name', 'phone', 'email', 'address']
+REJECT_FIELDS = ['line', 'reason'] + CUSTOMER_FIELDS
+
+def read_rows(path):
+    # Yield (line_number, row) pairs without reading the whole file
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension == '.csv':
+            # Line 1 is the header
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {'_error': f"Invalid JSON: {e.msg}"}
+                    continue
+                # Valid JSON that isn't a customer object, e.g. [1, 2]
+                if not isinstance(row, dict):
+                    row = {'_error': "Each line must be a JSON object"}
+                yield line_number, row
+        else:
+            raise ValueError("Import file must be .csv or .jsonl")
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def validate_batch(session, batch):
+    # Split a batch into insert parameters and (line, row, reason) rejects
+    now = datetime.utcnow()
+    candidates = []
+    rejected = []
+
+    for line_number, row in batch:
+        if '_error' in row:
+            rejected.append((line_number, {}, row['_error']))
+            continue
+
+        values = {field: clean(row.get(field)) for field in CUSTOMER_FIELDS}
+
+        try:
+            Customer.validate_name(values['name'])
+            Customer.validate_phone(values['phone'])
+        except ValueError as e:
+            rejected.append((line_number, values, str(e)))
+            continue
+
+        candidates.append((line_number, values, Customer.normalize_phone(values['phone'])))
+
+    # One probe of the unique phone index for the whole batch. Earlier
+    # batches are already committed, so this also catches repeats across
+    # the file without keeping every phone number in memory.
+    batch_phones = [phone for _, _, phone in candidates]
+    known_phones = {
+        phone for (phone,) in
+        session.query(Customer.phone_e164).filter(Customer.phone_e164.in_(batch_phones))
+    }
+
+    accepted = []
+    for line_number, values, phone in candidates:
+        if phone in known_phones:
+            rejected.append((line_number, values, "Duplicate phone number"))
+            continue
+
+        known_phones.add(phone)
+        accepted.append({**values, 'phone_e164': phone, 'created_at': now})
+
+    return accepted, rejected
+
+def import_customers(path, reject_path=None, batch_size=IMPORT_BATCH_SIZE, verbose=True):
+    session = Session()
+    customers = Customer.__table__
+
+    reject_file = open(reject_path, 'w', newline='', encoding='utf-8') if reject_path else None
+    reject_writer = None
+    if reject_file:
+        reject_writer = csv.DictWriter(reject_file, fieldnames=REJECT_FIELDS, extrasaction='ignore')
+        reject_writer.writeheader()
+
+    read = imported = rejected_count = 0
+    started = time.perf_counter()
+
+    try:
+        for batch in batched(read_rows(path), batch_size):
+            accepted, rejected = validate_batch(session, batch)
+
+            # One transaction per batch keeps each commit small and means an
+            # interrupted import keeps everything up to the last batch
+            if accepted:
+                session.execute(insert(customers), accepted)
+                session.commit()
+
+            if reject_writer:
+                for line_number, values, reason in rejected:
+                    reject_writer.writerow({'line': line_number, 'reason': reason, **values})
+
+            read += len(batch)
+            imported += len(accepted)
+            rejected_count += len(rejected)
+
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"\r{read} rows read | {imported} imported | {rejected_count} rejected | {read / elapsed:,.0f} rows/sec", end='', flush=True)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        if reject_file:
+            reject_file.close()
+
+    elapsed = time.perf_counter() - started
+    if verbose:
+        print()
+
+    return {
+        'read': read,
+        'imported': imported,
+        'rejected': rejected_count,
+        'seconds': elapsed,
+        'rows_per_sec': read / elapsed if elapsed else 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Import customers from a CSV or JSONL file.")
+    parser.add_argument('path', help="CSV (with a header row) or JSONL file of customers")
+    parser.add_argument('--reject-file', help="Write rejected rows and the reason to this CSV file")
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+
+    result = import_customers(args.path, args.reject_file, args.batch_size)
+    print(f"Imported {result['imported']} of {result['read']} rows in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/sec)")
+    if result['rejected']:
+        print(f"{result['rejected']} rows rejected" + (f", see {args.reject_file}" if args.reject_file else ""))
+
+if __name__ == "__main__":
+    main()
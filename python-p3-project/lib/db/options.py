@@ -0,0 +1,35 @@
+# lib/db/options.py
+#
+# Command line options of the export and archive jobs, shared by their
+# scripts and the CLI's `orders export` and `orders archive` commands. They
+# live apart from the jobs, so building the CLI's parser doesn't import them.
+
+from models.archive import ARCHIVE_CHUNK_SIZE
+from models.order import ORDER_STATUSES
+
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = ('csv', 'jsonl')
+
+# Related data an export can include with each order
+INCLUDES = ('customer', 'service', 'history')
+
+# Completed orders created longer ago than this are archived by default
+ARCHIVE_AFTER_DAYS = 365
+
+def add_export_arguments(parser):
+    parser.add_argument('path', help="Output file: .csv or .jsonl, with .gz to compress")
+    # Not 'format', which the CLI already uses for its own output
+    parser.add_argument('--format', dest='file_format', choices=FORMATS, help="Output format if the file name doesn't say")
+    parser.add_argument('--with', dest='include', nargs='+', choices=INCLUDES, default=[], help="Related data to include with each order")
+    parser.add_argument('--from', dest='date_from', help="First creation date to export (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', help="Last creation date to export (YYYY-MM-DD)")
+    parser.add_argument('--status', choices=ORDER_STATUSES)
+    parser.add_argument('--location', type=int, help="Only orders for this branch (0 for orders without one)")
+    parser.add_argument('--resume', action='store_true', help="Continue from the last exported id in the checkpoint")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE, help="Orders per batch")
+
+def add_archive_arguments(parser):
+    parser.add_argument('--older-than', type=int, default=ARCHIVE_AFTER_DAYS, metavar='DAYS', help=f"Archive completed orders created more than DAYS ago (default {ARCHIVE_AFTER_DAYS})")
+    parser.add_argument('--chunk-size', type=int, default=ARCHIVE_CHUNK_SIZE, help="Orders moved per transaction")
+    parser.add_argument('--no-vacuum', dest='vacuum', action='store_false', help="Only ANALYZE afterwards; VACUUM rewrites the whole file")
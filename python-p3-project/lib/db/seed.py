@@ -1,11 +1,12 @@
 # lib/db/seed.py
 
-from models import Base, engine, Session, Customer, Service, Order, Location
+from models import create_tables, Session, OUTDATED_SCHEMA_MESSAGE, Customer, Service, Order, Location
 from datetime import datetime, date, timedelta
 
 def seed_database():
     # Create all tables
-    Base.metadata.create_all(engine)
+    if not create_tables():
+        raise SystemExit(OUTDATED_SCHEMA_MESSAGE)
     
     # Create a session
     session = Session()
@@ -0,0 +1,119 @@
+# lib/dispatch.py
+#
+# Pickup dispatch lists. The orders still to be collected in one pickup window
+# are read with their customers' addresses in a single query on the pickup
+# index, grouped by area and packed into driver batches that keep each area
+# together where they can. The area is the estate or town after the last
+# comma of the address, e.g. Kasarani in "12 Thika Rd, Kasarani". Within a
+# batch, stops are ordered by area, road and house number. Batches never mix
+# branches.
+
+import heapq
+import re
+
+from models import Order
+
+# Stops per driver when the number of drivers isn't given
+DISPATCH_BATCH_SIZE = 15
+
+NO_AREA = 'Unknown area'
+
+HOUSE_NUMBER = re.compile(r'^(\d+)\w*\s+')
+
+def address_area(address):
+    # (area, road, house number) of an address. Addresses without a comma
+    # are grouped by their road.
+    parts = [' '.join(part.split()) for part in (address or '').split(',')]
+    parts = [part for part in parts if part]
+    if not parts:
+        return NO_AREA, '', 0
+
+    number = HOUSE_NUMBER.match(parts[0])
+    road = parts[0][number.end():] if number else parts[0]
+    area = parts[-1] if len(parts) > 1 else road
+    return area.title(), road.title(), int(number.group(1)) if number else 0
+
+def stop_record(row):
+    area, road, number = address_area(row.address)
+    return {
+        'order_id': row.id,
+        'customer_id': row.customer_id,
+        'customer_name': row.customer_name,
+        'phone': row.phone,
+        'address': row.address,
+        'area': area,
+        'road': road,
+        'house_number': number,
+        'location_id': row.location_id,
+        'service_id': row.service_id,
+        'weight': row.weight,
+        'status': row.status,
+        'special_instructions': row.special_instructions
+    }
+
+def stop_order(stop):
+    return (stop['area'], stop['road'], stop['house_number'], stop['order_id'])
+
+def pack(areas, drivers=None, batch_size=DISPATCH_BATCH_SIZE):
+    # Pack lists of stops, one per area, into batches. Areas bigger than a
+    # batch are split first. With a number of drivers, there is one batch per
+    # driver and each area, largest first, goes to the driver with the
+    # fewest stops so far. Otherwise batches hold at most batch_size stops and
+    # each area goes into the first batch it fits in.
+    total = sum(len(stops) for stops in areas)
+    limit = -(-total // drivers) if drivers else batch_size
+    pieces = [stops[start:start + limit] for stops in areas for start in range(0, len(stops), limit)]
+    pieces.sort(key=len, reverse=True)
+
+    if drivers:
+        batches = [[] for _ in range(min(drivers, len(pieces)))]
+        loads = [(0, index) for index in range(len(batches))]
+        for piece in pieces:
+            load, index = heapq.heappop(loads)
+            batches[index].extend(piece)
+            heapq.heappush(loads, (load + len(piece), index))
+        return batches
+
+    batches = []
+    for piece in pieces:
+        for batch in batches:
+            if len(batch) + len(piece) <= limit:
+                batch.extend(piece)
+                break
+        else:
+            batches.append(list(piece))
+    return batches
+
+def dispatch_batches(session, pickup_date, pickup_time, location_id=None, drivers=None, batch_size=DISPATCH_BATCH_SIZE):
+    # Driver batches for one pickup window, per branch. drivers is the number
+    # of drivers per branch; without it, batches of up to batch_size stops.
+    if drivers is not None and drivers < 1:
+        raise ValueError("There must be at least one driver")
+    if batch_size < 1:
+        raise ValueError("The batch size must be positive")
+
+    branches = {}
+    for row in Order.find_for_dispatch(session, pickup_date, pickup_time, location_id):
+        stop = stop_record(row)
+        branches.setdefault(row.location_id, {}).setdefault(stop['area'], []).append(stop)
+
+    batches = []
+    for branch_id in sorted(branches, key=lambda id: (id is None, id or 0)):
+        areas = branches[branch_id]
+        for stops in pack([areas[area] for area in sorted(areas)], drivers, batch_size):
+            stops.sort(key=stop_order)
+            batches.append({
+                'batch': len(batches) + 1,
+                'location_id': branch_id,
+                'areas': list(dict.fromkeys(stop['area'] for stop in stops)),
+                'stop_count': len(stops),
+                'total_weight': sum(stop['weight'] for stop in stops),
+                'stops': stops
+            })
+    return batches
+
+def dispatch_list(session, pickup_date, pickup_time, **options):
+    # One record per stop, numbered within its batch
+    for batch in dispatch_batches(session, pickup_date, pickup_time, **options):
+        for number, stop in enumerate(batch['stops'], 1):
+            yield {'batch': batch['batch'], 'stop': number, **stop}
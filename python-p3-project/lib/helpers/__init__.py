@@ -0,0 +1,16 @@
+# lib/helpers/__init__.py
+#
+# The menu helpers, one module per menu. The CLI imports a menu's module only
+# when that menu is opened, so starting it doesn't pay for the others. Every
+# helper is still reachable as helpers.<name>, loaded on first use.
+
+from importlib import import_module
+
+MENU_MODULES = ('common', 'customers', 'orders', 'services', 'locations', 'reports', 'analytics')
+
+def __getattr__(name):
+    for module_name in MENU_MODULES:
+        module = import_module(f'.{module_name}', __name__)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,111 @@
+# lib/helpers/analytics.py
+#
+# The Analytics menu. Each view loads the orders in the chosen date range and
+# branch into arrays once and computes its figures from them with NumPy.
+
+from models import session_scope, Service
+from datetime import datetime, timedelta
+from time import perf_counter
+from analytics import load_orders, summary, revenue_by_day, revenue_by_week, revenue_by_service, weight_distribution, weight_histogram, spend_deciles
+from .common import prompt_location, prompt_include_archived
+
+def prompt_orders(session, title):
+    # Ask for a date range, branch and whether to include archived orders,
+    # then load the matching orders
+    print(f"\n===== {title} =====")
+    
+    date_from = input("From date (YYYY-MM-DD, leave blank for the first order): ")
+    date_to = input("To date (YYYY-MM-DD, leave blank for today): ")
+    created_from = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+    created_before = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+    location_id = prompt_location(session, "all branches")
+    include_archived = prompt_include_archived(session)
+    
+    started = perf_counter()
+    orders = load_orders(session, created_from=created_from, created_before=created_before, location_id=location_id, include_archived=include_archived)
+    print(f"\nLoaded {len(orders)} orders in {perf_counter() - started:.2f}s")
+    
+    if not len(orders):
+        print("No orders found.")
+    return orders
+
+def show_revenue_summary():
+    with session_scope() as session:
+        try:
+            orders = prompt_orders(session, "Revenue Summary")
+            if not len(orders):
+                return
+            
+            totals = summary(orders)
+            print(f"\nPeriod: {totals['first_day']} to {totals['last_day']}")
+            print(f"Orders: {totals['order_count']} from {totals['customer_count']} customers")
+            print(f"Total Revenue: {totals['total_revenue']:,.2f}")
+            print(f"Average Order Value: {totals['average_order_value']:,.2f}")
+            print(f"Total Weight: {totals['total_weight']:,.1f}")
+            
+            print("\nRevenue by Service:")
+            for row in revenue_by_service(orders, Service.get_catalog(session)):
+                print(f"  {row['service_name']}: {row['order_count']} orders, {row['total_revenue']:,.2f} ({row['revenue_share']:.1%})")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def show_revenue_by_period(period):
+    with session_scope() as session:
+        try:
+            orders = prompt_orders(session, f"Revenue by {period.capitalize()}")
+            if not len(orders):
+                return
+            
+            rows = revenue_by_day(orders) if period == 'day' else revenue_by_week(orders)
+            heading = 'Day' if period == 'day' else 'Week of'
+            print(f"\n{heading:<12} {'Orders':>8} {'Revenue':>14}")
+            top = max(row['total_revenue'] for row in rows) or 1
+            for row in rows:
+                bar = '#' * round(30 * row['total_revenue'] / top)
+                print(f"{row['period'].isoformat():<12} {row['order_count']:>8} {row['total_revenue']:>14,.2f}  {bar}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def show_revenue_by_day():
+    show_revenue_by_period('day')
+
+def show_revenue_by_week():
+    show_revenue_by_period('week')
+
+def show_weight_distribution():
+    with session_scope() as session:
+        try:
+            orders = prompt_orders(session, "Weight Distribution")
+            if not len(orders):
+                return
+            
+            distribution = weight_distribution(orders)
+            print(f"\nMean: {distribution['mean']:.2f} | Std: {distribution['std']:.2f} | Min: {distribution['min']} | Max: {distribution['max']}")
+            print("Percentiles: " + ", ".join(f"{key}: {value:.2f}" for key, value in distribution.items() if key[0] == 'p'))
+            
+            print(f"\n{'Weight':<15} {'Orders':>10} {'Share':>7}")
+            rows = weight_histogram(orders)
+            top = max(row['order_count'] for row in rows) or 1
+            for row in rows:
+                bar = '#' * round(30 * row['order_count'] / top)
+                print(f"{row['low']:>6.1f} - {row['high']:<6.1f} {row['order_count']:>10} {row['share']:>7.1%}  {bar}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def show_spend_deciles():
+    with session_scope() as session:
+        try:
+            orders = prompt_orders(session, "Customer Spend Deciles")
+            if not len(orders):
+                return
+            
+            print(f"\n{'Decile':<8} {'Customers':>10} {'Spend range':>24} {'Average':>12} {'Revenue share':>14}")
+            for row in spend_deciles(orders):
+                spend_range = f"{row['min_spend']:,.0f} - {row['max_spend']:,.0f}"
+                print(f"{row['decile']:<8} {row['customer_count']:>10} {spend_range:>24} {row['average_spend']:>12,.2f} {row['revenue_share']:>14.1%}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
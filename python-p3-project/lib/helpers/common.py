@@ -0,0 +1,86 @@
+# lib/helpers/common.py
+#
+# Prompts and listings shared by the menu helpers
+
+from models import Location, ArchivedOrder, DEFAULT_PAGE_SIZE
+
+def exit_program():
+    print("Thank you for using LaundryConnect CLI!")
+    exit()
+
+def page_through(get_page, title, format_row, empty_message):
+    # Show a listing one keyset page at a time: 'n' for the next page, 'p'
+    # for the previous one, anything else to go back to the menu
+    page = get_page(after_id=None)
+    
+    if not page:
+        print(f"\n{empty_message}")
+        return
+    
+    # No prompt needed when everything fits on one page
+    single_page = len(page) < DEFAULT_PAGE_SIZE
+    
+    while True:
+        print(f"\n===== {title} =====")
+        for row in page:
+            print(format_row(row))
+        
+        if single_page:
+            return
+        
+        while True:
+            choice = input("\n(n) Next page | (p) Previous page | (Enter) Back: ").lower()
+            
+            if choice == 'n':
+                new_page = get_page(after_id=page[-1].id)
+                if not new_page:
+                    print("\nThis is the last page.")
+                    continue
+            elif choice == 'p':
+                new_page = get_page(before_id=page[0].id)
+                if not new_page:
+                    print("\nThis is the first page.")
+                    continue
+            else:
+                return
+            
+            page = new_page
+            break
+
+def prompt_location(session, blank_means):
+    # Ask for a branch; returns its id, or None when left blank
+    locations = Location.get_all(session)
+    if not locations:
+        return None
+    
+    print("\nBranches:")
+    for location in locations:
+        print(f"{location.id}. {location.name}")
+    
+    while True:
+        location_input = input(f"Enter location ID (leave blank for {blank_means}): ")
+        if not location_input:
+            return None
+        
+        try:
+            location = Location.find_by_id(session, int(location_input))
+        except ValueError:
+            location = None
+        
+        if location:
+            return location.id
+        print("Location not found. Please try again.")
+
+def prompt_include_archived(session):
+    # Ask whether archived orders count too; not asked while the archive is
+    # empty
+    if session.query(ArchivedOrder.id).first() is None:
+        return False
+    return input("Include archived orders? (y/n): ").lower() == 'y'
+
+def numbered_option(options, choice):
+    # The option picked from a 1-based numbered list
+    index = int(choice)
+    if not 1 <= index <= len(options):
+        raise ValueError(f"Choose a number from 1 to {len(options)}")
+    return options[index - 1]
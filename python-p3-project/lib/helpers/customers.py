@@ -0,0 +1,174 @@
+# lib/helpers/customers.py
+
+from models import session_scope, Customer, Order
+from models.customer import SEARCH_LIMIT
+from db.import_customers import import_customers
+from .common import page_through
+
+def view_all_customers():
+    with session_scope() as session:
+        page_through(
+            lambda **cursor: Customer.get_page(session, **cursor),
+            "All Customers",
+            lambda customer: f"ID: {customer.id} | Name: {customer.name} | Phone: {customer.phone}",
+            "No customers found."
+        )
+
+def find_customer_by_id():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter customer ID: "))
+            customer = Customer.find_by_id(session, id)
+            
+            if customer:
+                print(f"\nCustomer ID: {customer.id}")
+                print(f"Name: {customer.name}")
+                print(f"Phone: {customer.phone}")
+                print(f"Email: {customer.email}")
+                print(f"Address: {customer.address}")
+            else:
+                print(f"\nNo customer found with ID {id}")
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def find_customer_by_phone():
+    with session_scope() as session:
+        phone = input("\nEnter customer phone number: ")
+        customer = Customer.find_by_phone(session, phone)
+        
+        if customer:
+            print(f"\nCustomer ID: {customer.id}")
+            print(f"Name: {customer.name}")
+            print(f"Phone: {customer.phone}")
+            print(f"Email: {customer.email}")
+            print(f"Address: {customer.address}")
+        else:
+            print(f"\nNo customer found with phone number {phone}")
+
+def search_customers():
+    with session_scope() as session:
+        query = input("\nSearch by name, email or address: ")
+        customers = Customer.search(session, query)
+        
+        if not customers:
+            print(f"\nNo customers match '{query}'")
+            return
+        
+        print(f"\n===== Customers matching '{query}' =====")
+        for customer in customers:
+            print(f"ID: {customer.id} | Name: {customer.name} | Phone: {customer.phone} | Address: {customer.address or '-'}")
+        
+        if len(customers) == SEARCH_LIMIT:
+            print(f"\nShowing the best {SEARCH_LIMIT} matches. Add more words to narrow the search.")
+
+def add_customer():
+    with session_scope() as session:
+        print("\n===== Add New Customer =====")
+        
+        try:
+            name = input("Enter customer name: ")
+            phone = input("Enter phone number: ")
+            email = input("Enter email (optional): ") or None
+            address = input("Enter address (optional): ") or None
+            
+            customer = Customer.create(session, name, phone, email, address)
+            print(f"\nCustomer added successfully with ID: {customer.id}")
+        
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+        except Exception as e:
+            print(f"\nAn error occurred: {str(e)}")
+
+def update_customer():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter customer ID to update: "))
+            customer = Customer.find_by_id(session, id)
+            
+            if not customer:
+                print(f"\nNo customer found with ID {id}")
+                return
+            
+            print("\nCurrent customer details:")
+            print(f"Name: {customer.name}")
+            print(f"Phone: {customer.phone}")
+            print(f"Email: {customer.email}")
+            print(f"Address: {customer.address}")
+            
+            print("\nEnter new details (leave blank to keep current value):")
+            
+            name = input("Name: ") or customer.name
+            phone = input("Phone: ") or customer.phone
+            email = input("Email: ") or customer.email
+            address = input("Address: ") or customer.address
+            
+            updated_customer = Customer.update(session, id, name=name, phone=phone, email=email, address=address)
+            
+            if updated_customer:
+                print("\nCustomer updated successfully!")
+            else:
+                print("\nFailed to update customer.")
+                
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def delete_customer():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter customer ID to delete: "))
+            customer = Customer.find_by_id(session, id)
+            
+            if not customer:
+                print(f"\nNo customer found with ID {id}")
+                return
+            
+            confirm = input(f"\nAre you sure you want to delete customer {customer.name}? (y/n): ")
+            
+            if confirm.lower() == 'y':
+                if Customer.delete(session, id):
+                    print("\nCustomer deleted successfully!")
+                else:
+                    print("\nFailed to delete customer.")
+            else:
+                print("\nDelete operation canceled.")
+                
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def view_customer_orders():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter customer ID: "))
+            customer = Customer.find_by_id(session, id)
+            
+            if not customer:
+                print(f"\nNo customer found with ID {id}")
+            else:
+                count = 0
+                for row in Order.stream_with_details(session, customer_id=id):
+                    if count == 0:
+                        print(f"\n===== Orders for {customer.name} =====")
+                    print(f"Order ID: {row.id} | Service: {row.service_name} | Status: {row.status} | Total: {row.total_price}")
+                    count += 1
+                
+                if count == 0:
+                    print(f"\nNo orders found for customer {customer.name}")
+            
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def import_customers_from_file():
+    print("\n===== Import Customers =====")
+    
+    path = input("Enter path to CSV or JSONL file: ")
+    reject_path = input("Enter path for rejected rows (optional): ") or None
+    
+    try:
+        result = import_customers(path, reject_path)
+        
+        print(f"\nImported {result['imported']} of {result['read']} rows in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/sec)")
+        if result['rejected']:
+            print(f"Rejected: {result['rejected']}" + (f" (see {reject_path})" if reject_path else ""))
+    
+    except (OSError, ValueError) as e:
+        print(f"\nError: {str(e)}")
@@ -0,0 +1,124 @@
+# lib/helpers/locations.py
+
+from models import session_scope, Location
+from models.pickup_slot import DEFAULT_SLOT_CAPACITY
+from .common import page_through
+
+def view_all_locations():
+    with session_scope() as session:
+        page_through(
+            lambda **cursor: Location.get_page(session, **cursor),
+            "All Locations",
+            lambda location: f"ID: {location.id} | Name: {location.name} | Address: {location.address}",
+            "No locations found."
+        )
+
+def find_location_by_id():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter location ID: "))
+            location = Location.find_by_id(session, id)
+            
+            if location:
+                print(f"\nLocation ID: {location.id}")
+                print(f"Name: {location.name}")
+                print(f"Address: {location.address}")
+                print(f"Phone: {location.phone}")
+                print(f"Email: {location.email}")
+                print(f"Orders per pickup window: {location.slot_capacity if location.slot_capacity is not None else f'{DEFAULT_SLOT_CAPACITY} (default)'}")
+            else:
+                print(f"\nNo location found with ID {id}")
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def add_location():
+    with session_scope() as session:
+        print("\n===== Add New Location =====")
+        
+        try:
+            name = input("Enter location name: ")
+            address = input("Enter address: ")
+            phone = input("Enter phone number: ")
+            email = input("Enter email (optional): ") or None
+            capacity_str = input(f"Orders per pickup window (leave blank for {DEFAULT_SLOT_CAPACITY}): ")
+            slot_capacity = int(capacity_str) if capacity_str else None
+            
+            location = Location.create(session, name, address, phone, email, slot_capacity)
+            print(f"\nLocation added successfully with ID: {location.id}")
+        
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+        except Exception as e:
+            print(f"\nAn error occurred: {str(e)}")
+
+def update_location():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter location ID to update: "))
+            location = Location.find_by_id(session, id)
+            
+            if not location:
+                print(f"\nNo location found with ID {id}")
+                return
+            
+            print("\nCurrent location details:")
+            print(f"Name: {location.name}")
+            print(f"Address: {location.address}")
+            print(f"Phone: {location.phone}")
+            print(f"Email: {location.email}")
+            print(f"Orders per pickup window: {location.slot_capacity if location.slot_capacity is not None else DEFAULT_SLOT_CAPACITY}")
+            
+            print("\nEnter new details (leave blank to keep current value):")
+            
+            name = input("Name: ") or location.name
+            address = input("Address: ") or location.address
+            phone = input("Phone: ") or location.phone
+            email = input("Email: ") or location.email
+            capacity_str = input("Orders per pickup window: ")
+            slot_capacity = int(capacity_str) if capacity_str else location.slot_capacity
+            
+            updated_location = Location.update(
+                session, id, 
+                name=name, 
+                address=address, 
+                phone=phone, 
+                email=email,
+                slot_capacity=slot_capacity
+            )
+            
+            if updated_location:
+                print("\nLocation updated successfully!")
+            else:
+                print("\nFailed to update location.")
+                
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def delete_location():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter location ID to delete: "))
+            location = Location.find_by_id(session, id)
+            
+            if not location:
+                print(f"\nNo location found with ID {id}")
+                return
+            
+            confirm = input(f"\nAre you sure you want to delete location {location.name}? (y/n): ")
+            
+            if confirm.lower() == 'y':
+                try:
+                    deleted = Location.delete(session, id)
+                except ValueError as e:
+                    print(f"\nError: {str(e)}")
+                    deleted = None
+                
+                if deleted:
+                    print("\nLocation deleted successfully!")
+                elif deleted is False:
+                    print("\nFailed to delete location.")
+            else:
+                print("\nDelete operation canceled.")
+                
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
@@ -0,0 +1,412 @@
+# lib/helpers/orders.py
+
+from models import session_scope, Customer, Service, Order, OrderStatusHistory, Location, PickupSlot
+from models.order import ORDER_STATUSES, PICKUP_TIMES
+from datetime import datetime, date, timedelta
+from .common import page_through, prompt_location, numbered_option
+from .services import view_all_services
+from db.export_orders import export_orders, INCLUDES
+from dispatch import dispatch_batches, DISPATCH_BATCH_SIZE
+
+def view_all_orders():
+    with session_scope() as session:
+        page_through(
+            lambda **cursor: Order.get_page_with_details(session, **cursor),
+            "All Orders",
+            lambda row: f"ID: {row.id} | Customer: {row.customer_name} | Service: {row.service_name} | Status: {row.status} | Total: {row.total_price}",
+            "No orders found."
+        )
+
+def find_order_by_id():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter order ID: "))
+            order = Order.find_by_id(session, id)
+            
+            if not order:
+                print(f"\nNo order found with ID {id}")
+                return
+            
+            customer = Customer.find_by_id(session, order.customer_id)
+            service = Service.get_cached(session, order.service_id)
+            
+            print(f"\nOrder ID: {order.id}")
+            print(f"Customer: {customer.name} (ID: {customer.id})")
+            print(f"Service: {service.name} (ID: {service.id})")
+            print(f"Weight: {order.weight} {service.unit}")
+            print(f"Total Price: {order.total_price}")
+            print(f"Status: {order.status}")
+            print(f"Pickup Date: {order.pickup_date}")
+            print(f"Pickup Time: {order.pickup_time}")
+            print(f"Special Instructions: {order.special_instructions or 'None'}")
+            print(f"Created At: {order.created_at}")
+            
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def prompt_pickup_slot(session, location_id):
+    # Offer the branch's next free pickup slots, or a date and window of the
+    # clerk's choosing. Returns (pickup_date, pickup_time) of a slot with room.
+    free = PickupSlot.next_free(session, location_id)
+    if free:
+        print("\nNext free pickup slots:")
+        for i, slot in enumerate(free, 1):
+            print(f"{i}. {slot.pickup_date} {slot.pickup_time.capitalize()} ({slot.capacity - slot.booked} of {slot.capacity} places left)")
+        
+        while True:
+            choice = input("\nSelect a slot, or leave blank to choose another date: ")
+            if not choice:
+                break
+            try:
+                slot = numbered_option(free, choice)
+                return slot.pickup_date, slot.pickup_time
+            except ValueError:
+                print(f"Please enter a number from 1 to {len(free)}.")
+    
+    while True:
+        # Get pickup date
+        while True:
+            pickup_date_str = input("\nEnter pickup date (YYYY-MM-DD): ")
+            try:
+                pickup_date = datetime.strptime(pickup_date_str, '%Y-%m-%d').date()
+                if pickup_date < date.today():
+                    print("Pickup date cannot be in the past.")
+                    continue
+                break
+            except ValueError:
+                print("Invalid date format. Please use YYYY-MM-DD.")
+        
+        # Get pickup time
+        while True:
+            print("\nPickup Time Options:")
+            print("1. Morning (8:00 AM - 12:00 PM)")
+            print("2. Afternoon (12:00 PM - 4:00 PM)")
+            print("3. Evening (4:00 PM - 8:00 PM)")
+            
+            try:
+                time_choice = int(input("\nSelect pickup time option: "))
+                if time_choice == 1:
+                    pickup_time = "morning"
+                    break
+                elif time_choice == 2:
+                    pickup_time = "afternoon"
+                    break
+                elif time_choice == 3:
+                    pickup_time = "evening"
+                    break
+                else:
+                    print("Invalid choice. Please select 1, 2, or 3.")
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+        
+        slot = PickupSlot.availability(session, pickup_date, pickup_time, location_id)
+        if slot.booked < slot.capacity:
+            return pickup_date, pickup_time
+        print(f"\nThe {pickup_time} slot on {pickup_date} is full. Please choose another.")
+
+def add_order():
+    with session_scope() as session:
+        print("\n===== Add New Order =====")
+        
+        try:
+            # Get customer
+            while True:
+                customer_input = input("Enter customer ID or phone number: ")
+                
+                # Anything long enough to be a phone number is looked up as one,
+                # in whatever format it was typed
+                if customer_input.isdigit() and len(customer_input) < 9:
+                    customer = Customer.find_by_id(session, int(customer_input))
+                else:
+                    customer = Customer.find_by_phone(session, customer_input)
+                
+                if customer:
+                    print(f"Selected customer: {customer.name}")
+                    break
+                else:
+                    print("Customer not found.")
+                    create_new = input("Would you like to create a new customer? (y/n): ")
+                    if create_new.lower() == 'y':
+                        name = input("Enter customer name: ")
+                        phone = input("Enter phone number: ")
+                        email = input("Enter email (optional): ") or None
+                        address = input("Enter address (optional): ") or None
+                        
+                        try:
+                            customer = Customer.create(session, name, phone, email, address)
+                            print(f"Customer created with ID: {customer.id}")
+                            break
+                        except ValueError as e:
+                            print(f"Error: {str(e)}")
+            
+            # Get service
+            view_all_services()
+            while True:
+                try:
+                    service_id = int(input("\nSelect service ID: "))
+                    service = Service.get_cached(session, service_id)
+                    
+                    if service:
+                        print(f"Selected service: {service.name} ({service.price_per_unit} per {service.unit})")
+                        break
+                    else:
+                        print("Service not found. Please try again.")
+                except ValueError:
+                    print("Invalid input. Please enter a number.")
+            
+            # Get weight
+            while True:
+                try:
+                    weight = float(input(f"\nEnter weight in {service.unit}: "))
+                    if weight <= 0:
+                        print("Weight must be positive.")
+                        continue
+                    break
+                except ValueError:
+                    print("Invalid weight. Please enter a number.")
+            
+            # Get the branch handling the order, whose pickup slots are offered
+            location_id = prompt_location(session, "no branch")
+            
+            # Get the pickup slot
+            pickup_date, pickup_time = prompt_pickup_slot(session, location_id)
+            
+            # Get special instructions
+            special_instructions = input("\nEnter special instructions (optional): ") or None
+            
+            # Create order
+            order = Order.create(
+                session,
+                customer.id,
+                service.id,
+                weight,
+                pickup_date,
+                pickup_time,
+                special_instructions,
+                location_id
+            )
+            
+            print(f"\nOrder created successfully with ID: {order.id}")
+            print(f"Total price: {order.total_price}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+        except Exception as e:
+            print(f"\nAn error occurred: {str(e)}")
+            session.rollback()
+
+def update_order_status():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter order ID to update: "))
+            order = Order.find_by_id(session, id)
+            
+            if not order:
+                print(f"\nNo order found with ID {id}")
+                return
+            
+            print(f"\nCurrent status: {order.status}")
+            print("\nAvailable statuses:")
+            print("1. placed")
+            print("2. pickup")
+            print("3. processing")
+            print("4. delivery")
+            print("5. completed")
+            
+            choice = input("\nSelect new status (1-5): ")
+            
+            status_map = {
+                "1": "placed",
+                "2": "pickup",
+                "3": "processing",
+                "4": "delivery",
+                "5": "completed"
+            }
+            
+            if choice in status_map:
+                new_status = status_map[choice]
+                
+                if new_status == order.status:
+                    print(f"\nOrder is already in '{new_status}' status.")
+                    return
+                
+                updated_order = Order.update(session, id, status=new_status)
+                
+                if updated_order:
+                    print(f"\nOrder status updated to '{new_status}' successfully!")
+                else:
+                    print("\nFailed to update order status.")
+            else:
+                print("\nInvalid choice.")
+            
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def advance_orders():
+    # Move every order due for pickup on a day (optionally one window) from
+    # one status to another in a single transaction
+    with session_scope() as session:
+        print("\n===== Advance Orders in Bulk =====")
+        
+        try:
+            date_str = input("Enter pickup date (YYYY-MM-DD) or leave blank for today: ")
+            pickup_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else date.today()
+            
+            print("\nPickup time:")
+            for i, time in enumerate(PICKUP_TIMES, 1):
+                print(f"{i}. {time.capitalize()}")
+            time_choice = input("Select pickup time (leave blank for all): ")
+            pickup_time = numbered_option(PICKUP_TIMES, time_choice) if time_choice else None
+            
+            print("\nStatuses:")
+            for i, status in enumerate(ORDER_STATUSES, 1):
+                print(f"{i}. {status}")
+            from_status = numbered_option(ORDER_STATUSES, input("Select current status (1-5): "))
+            
+            # Default to the next stage of the lifecycle
+            next_index = min(ORDER_STATUSES.index(from_status) + 1, len(ORDER_STATUSES) - 1)
+            to_choice = input(f"Select new status (1-5, default {ORDER_STATUSES[next_index]}): ")
+            to_status = numbered_option(ORDER_STATUSES, to_choice) if to_choice else ORDER_STATUSES[next_index]
+            
+            order_ids = Order.find_ids_for_pickup(session, pickup_date, pickup_time, status=from_status)
+            
+            if not order_ids:
+                print(f"\nNo '{from_status}' orders for pickup on {pickup_date}.")
+                return
+            
+            window = f" ({pickup_time})" if pickup_time else ""
+            confirm = input(f"\nMove {len(order_ids)} orders for {pickup_date}{window} from '{from_status}' to '{to_status}'? (y/n): ")
+            
+            if confirm.lower() == 'y':
+                updated_ids = Order.bulk_update_status(session, order_ids, to_status)
+                print(f"\n{len(updated_ids)} orders moved to '{to_status}'.")
+            else:
+                print("\nNo orders changed.")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def delete_order():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter order ID to delete: "))
+            order = Order.find_by_id(session, id)
+            
+            if not order:
+                print(f"\nNo order found with ID {id}")
+                return
+            
+            customer = Customer.find_by_id(session, order.customer_id)
+            
+            confirm = input(f"\nAre you sure you want to delete order {id} for customer {customer.name}? (y/n): ")
+            
+            if confirm.lower() == 'y':
+                if Order.delete(session, id):
+                    print("\nOrder deleted successfully!")
+                else:
+                    print("\nFailed to delete order.")
+            else:
+                print("\nDelete operation canceled.")
+                
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def reschedule_order():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter order ID to reschedule: "))
+            order = Order.find_by_id(session, id)
+            
+            if not order:
+                print(f"\nNo order found with ID {id}")
+                return
+            
+            print(f"\nCurrent pickup: {order.pickup_date} {order.pickup_time}")
+            pickup_date, pickup_time = prompt_pickup_slot(session, order.location_id)
+            
+            # Books the new slot and gives up the old one in one transaction
+            Order.update(session, id, pickup_date=pickup_date, pickup_time=pickup_time)
+            print(f"\nPickup moved to {pickup_date} {pickup_time}.")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def view_order_history():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter order ID: "))
+            order = Order.find_by_id(session, id)
+            
+            if not order:
+                print(f"\nNo order found with ID {id}")
+                return
+            
+            history = OrderStatusHistory.get_all_by_order(session, id)
+            
+            if not history:
+                print(f"\nNo status history found for order {id}")
+                return
+            
+            print(f"\n===== Status History for Order {id} =====")
+            for entry in history:
+                print(f"Status: {entry.status} | Timestamp: {entry.timestamp}")
+            
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def export_orders_to_file():
+    print("\n===== Export Orders =====")
+    
+    path = input("Enter output file (.csv or .jsonl, add .gz to compress): ")
+    include = input(f"Include ({', '.join(INCLUDES)}, separated by spaces, optional): ").split()
+    date_from = input("From date (YYYY-MM-DD, optional): ")
+    date_to = input("To date (YYYY-MM-DD, optional): ")
+    resume = input("Resume from the last checkpoint? (y/n): ").lower() == 'y'
+    
+    try:
+        created_from = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+        created_before = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+        result = export_orders(path, include=include, created_from=created_from, created_before=created_before, resume=resume)
+        
+        print(f"\nExported {result['exported']} orders in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/sec)")
+        print(f"{path} holds {result['total_rows']} orders")
+    
+    except (OSError, ValueError) as e:
+        print(f"\nError: {str(e)}")
+
+def print_dispatch_list():
+    # A pickup window's orders split into driver batches, each batch keeping
+    # its areas together
+    with session_scope() as session:
+        print("\n===== Dispatch List =====")
+        
+        try:
+            date_str = input("Enter pickup date (YYYY-MM-DD) or leave blank for today: ")
+            pickup_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else date.today()
+            
+            print("\nPickup time:")
+            for i, time in enumerate(PICKUP_TIMES, 1):
+                print(f"{i}. {time.capitalize()}")
+            pickup_time = numbered_option(PICKUP_TIMES, input("Select pickup time (1-3): "))
+            
+            location_id = prompt_location(session, "all branches")
+            drivers_input = input(f"Number of drivers per branch (leave blank for batches of {DISPATCH_BATCH_SIZE}): ")
+            drivers = int(drivers_input) if drivers_input else None
+            
+            batches = dispatch_batches(session, pickup_date, pickup_time, location_id, drivers)
+            
+            if not batches:
+                print(f"\nNo orders waiting for pickup on {pickup_date} ({pickup_time}).")
+                return
+            
+            branches = {location.id: location.name for location in Location.get_all(session)}
+            for batch in batches:
+                branch = branches.get(batch['location_id'], "No branch")
+                print(f"\n--- Batch {batch['batch']} | {branch} | {', '.join(batch['areas'])} | {batch['stop_count']} stops | weight {batch['total_weight']:.1f} ---")
+                for number, stop in enumerate(batch['stops'], 1):
+                    print(f"{number:>3}. Order {stop['order_id']} | {stop['customer_name']} | {stop['phone']} | {stop['address']} | weight {stop['weight']}")
+                    if stop['special_instructions']:
+                        print(f"     Note: {stop['special_instructions']}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
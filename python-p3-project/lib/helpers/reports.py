@@ -0,0 +1,236 @@
+# lib/helpers/reports.py
+
+from models import session_scope, Customer, Order, Location, DailyOrderSummary
+from datetime import datetime, date, timedelta
+from branch_report import all_branches_report
+from lifecycle import stage_latency, stuck_orders, STUCK_AFTER_HOURS
+from .common import prompt_location, prompt_include_archived
+
+def generate_daily_orders_report():
+    with session_scope() as session:
+        print("\n===== Daily Orders Report =====")
+        
+        try:
+            date_str = input("Enter date (YYYY-MM-DD) or leave blank for today: ")
+            
+            if date_str:
+                report_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            else:
+                report_date = date.today()
+            
+            location_id = prompt_location(session, "all branches")
+            
+            day_start = datetime.combine(report_date, datetime.min.time())
+            day_end = day_start + timedelta(days=1)
+            
+            # Counts and revenue per (status, service) come from the daily
+            # summary table; the status and service breakdowns are rolled up here
+            summary = DailyOrderSummary.report(session, report_date, report_date + timedelta(days=1), location_id=location_id)
+            
+            if not summary:
+                print(f"\nNo orders found for {report_date}")
+            else:
+                total_orders = sum(row.order_count for row in summary)
+                total_revenue = sum(row.total_revenue for row in summary)
+                orders_by_status = {}
+                orders_by_service = {}
+                
+                for row in summary:
+                    orders_by_status[row.status] = orders_by_status.get(row.status, 0) + row.order_count
+                    count, revenue = orders_by_service.get(row.service_name, (0, 0))
+                    orders_by_service[row.service_name] = (count + row.order_count, revenue + row.total_revenue)
+                
+                print(f"\nDate: {report_date}")
+                if location_id:
+                    print(f"Branch: {Location.find_by_id(session, location_id).name}")
+                print(f"Total Orders: {total_orders}")
+                print(f"Total Revenue: {total_revenue}")
+                
+                print("\nOrders by Status:")
+                for status, status_count in orders_by_status.items():
+                    print(f"  {status.capitalize()}: {status_count}")
+                
+                print("\nOrders by Service:")
+                for service_name, (service_count, service_revenue) in orders_by_service.items():
+                    print(f"  {service_name}: {service_count} (Revenue: {service_revenue})")
+                
+                show_details = input("\nShow detailed orders? (y/n): ")
+                
+                if show_details.lower() == 'y':
+                    print("\nDetailed Orders:")
+                    for row in Order.stream_with_details(session, created_from=day_start, created_before=day_end, location_id=location_id):
+                        print(f"ID: {row.id} | Customer: {row.customer_name} | Service: {row.service_name} | Status: {row.status} | Total: {row.total_price}")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def generate_all_branches_report():
+    print("\n===== All Branches Report =====")
+    
+    try:
+        date_str = input("Enter date (YYYY-MM-DD) or leave blank for today: ")
+        report_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else date.today()
+    except ValueError as e:
+        print(f"\nError: {str(e)}")
+        return
+    
+    # Each branch is computed in its own process
+    sections, totals = all_branches_report(report_date)
+    
+    if not totals['order_count']:
+        print(f"\nNo orders found for {report_date}")
+        return
+    
+    print(f"\nDate: {report_date}")
+    print(f"Total Orders: {totals['order_count']}")
+    print(f"Total Revenue: {totals['total_revenue']}")
+    print("Orders by Status: " + ", ".join(f"{status.capitalize()}: {count}" for status, count in totals['by_status'].items()))
+    
+    for section in sections:
+        print(f"\n--- {section['location_name']} ---")
+        print(f"Orders: {section['order_count']} | Revenue: {section['total_revenue']}")
+        
+        if section['order_count']:
+            print("By Service:")
+            for service_name, (service_count, service_revenue) in section['by_service'].items():
+                print(f"  {service_name}: {service_count} (Revenue: {service_revenue})")
+            
+            print("Top Customers:")
+            for customer_name, order_count, revenue in section['top_customers']:
+                print(f"  {customer_name}: {order_count} orders (Revenue: {revenue})")
+
+def print_revenue_trend(period, title, default_count):
+    # Orders and revenue for the last few weeks or months, read from the
+    # daily summary table only
+    with session_scope() as session:
+        print(f"\n===== {title} =====")
+        
+        try:
+            count_str = input(f"Number of {period}s to show (default {default_count}): ")
+            count = int(count_str) if count_str else default_count
+            if count <= 0:
+                raise ValueError(f"Number of {period}s must be positive")
+            
+            today = date.today()
+            if period == 'week':
+                start = today - timedelta(days=today.weekday() + 7 * (count - 1))
+            else:
+                month = today.year * 12 + today.month - 1 - (count - 1)
+                start = date(month // 12, month % 12 + 1, 1)
+            
+            rows = DailyOrderSummary.report(session, start, today + timedelta(days=1), period=period, by=())
+            
+            if not rows:
+                print(f"\nNo orders since {start}")
+            else:
+                # A simple bar chart scaled to the best period
+                top_revenue = max(row.total_revenue for row in rows) or 1
+                print(f"\n{period.capitalize() + ' of':<12} {'Orders':>8} {'Revenue':>14}")
+                for row in rows:
+                    bar = '#' * round(30 * row.total_revenue / top_revenue)
+                    print(f"{row.period:<12} {row.order_count:>8} {row.total_revenue:>14,.2f}  {bar}")
+                
+                print(f"\nTotal: {sum(row.order_count for row in rows)} orders, {sum(row.total_revenue for row in rows):,.2f} revenue")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def generate_weekly_revenue_report():
+    print_revenue_trend('week', "Weekly Revenue Report", 8)
+
+def generate_monthly_revenue_report():
+    print_revenue_trend('month', "Monthly Revenue Report", 12)
+
+def rebuild_report_summary():
+    with session_scope() as session:
+        print("\nRebuilding the daily order summary from all orders...")
+        row_count = DailyOrderSummary.rebuild(session)
+        print(f"Summary rebuilt: {row_count} rows.")
+
+def generate_customer_report():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter customer ID: "))
+            customer = Customer.find_by_id(session, id)
+            
+            if not customer:
+                print(f"\nNo customer found with ID {id}")
+                return
+            
+            location_id = prompt_location(session, "all branches")
+            include_archived = prompt_include_archived(session)
+            totals = Order.summarize(session, by=(), customer_id=id, location_id=location_id, include_archived=include_archived)[0]
+            
+            print(f"\n===== Customer Report: {customer.name} =====")
+            print(f"Phone: {customer.phone}")
+            print(f"Email: {customer.email or 'N/A'}")
+            print(f"Address: {customer.address or 'N/A'}")
+            
+            if not totals.order_count:
+                print("\nNo orders found for this customer.")
+            else:
+                print(f"\nTotal Orders: {totals.order_count}")
+                print(f"Total Spent: {totals.total_revenue}")
+                
+                print("\nOrder History:")
+                for order in Order.stream_with_details(session, customer_id=id, location_id=location_id, include_archived=include_archived):
+                    print(f"ID: {order.id} | Date: {order.created_at.date()} | Service: {order.service_name} | Status: {order.status} | Total: {order.total_price}")
+            
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def format_hours(hours):
+    # e.g. "45m", "6.5h", "3d 4h"
+    if hours < 1:
+        return f"{hours * 60:.0f}m"
+    if hours < 48:
+        return f"{hours:.1f}h"
+    return f"{int(hours // 24)}d {hours % 24:.0f}h"
+
+def print_latency_table(rows, label):
+    print(f"\n{label:<34} {'Changes':>8} {'Mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:<34} {row['transitions']:>8} {format_hours(row['mean_hours']):>8} {format_hours(row['p50_hours']):>8}"
+            f" {format_hours(row['p90_hours']):>8} {format_hours(row['p99_hours']):>8} {format_hours(row['max_hours']):>8}"
+        )
+
+def generate_lifecycle_report():
+    with session_scope() as session:
+        print("\n===== Order Lifecycle Report =====")
+        
+        try:
+            date_from = input("Orders created from (YYYY-MM-DD, leave blank for all): ")
+            date_to = input("Orders created to (YYYY-MM-DD, leave blank for today): ")
+            created_from = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+            created_before = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+            location_id = prompt_location(session, "all branches")
+            include_archived = prompt_include_archived(session)
+            hours_str = input(f"Flag orders unchanged for more than how many hours? (default {STUCK_AFTER_HOURS}): ")
+            hours = float(hours_str) if hours_str else STUCK_AFTER_HOURS
+            
+            filters = {'created_from': created_from, 'created_before': created_before, 'location_id': location_id}
+            stages = stage_latency(session, include_archived=include_archived, **filters)
+            
+            if not stages:
+                print("\nNo status changes found for these orders.")
+            else:
+                print("\nTime spent in each stage before moving on:")
+                print_latency_table([{**row, 'name': row['stage'].capitalize()} for row in stages], "Stage")
+                
+                by_service = stage_latency(session, by_service=True, include_archived=include_archived, **filters)
+                print_latency_table([{**row, 'name': f"{row['service_name']}: {row['stage']}"} for row in by_service], "Service: stage")
+            
+            stuck = stuck_orders(session, hours, **filters)
+            print(f"\nOrders unchanged for more than {format_hours(hours)}:")
+            shown = 0
+            for order in stuck:
+                if shown == 20 and input("\nShow the rest? (y/n): ").lower() != 'y':
+                    break
+                print(f"ID: {order['id']} | Customer: {order['customer_id']} | Status: {order['status']} | Waiting: {format_hours(order['hours_waiting'])}")
+                shown += 1
+            if not shown:
+                print("  None")
+            
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
@@ -0,0 +1,141 @@
+# lib/helpers/services.py
+
+from models import session_scope, Service
+
+def view_all_services():
+    with session_scope() as session:
+        services = Service.get_catalog(session)
+    
+    if not services:
+        print("\nNo services found.")
+        return
+    
+    print("\n===== All Services =====")
+    for service in services.values():
+        print(f"ID: {service.id} | Name: {service.name} | Price: {service.price_per_unit}/{service.unit}")
+
+def find_service_by_id():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter service ID: "))
+            service = Service.get_cached(session, id)
+            
+            if service:
+                print(f"\nService ID: {service.id}")
+                print(f"Name: {service.name}")
+                print(f"Description: {service.description}")
+                print(f"Price: {service.price_per_unit} per {service.unit}")
+            else:
+                print(f"\nNo service found with ID {id}")
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
+
+def add_service():
+    with session_scope() as session:
+        print("\n===== Add New Service =====")
+        
+        try:
+            name = input("Enter service name: ")
+            description = input("Enter description: ")
+            
+            while True:
+                try:
+                    price = float(input("Enter price per unit: "))
+                    if price <= 0:
+                        print("Price must be positive.")
+                        continue
+                    break
+                except ValueError:
+                    print("Invalid price. Please enter a number.")
+            
+            unit = input("Enter unit (kg/item): ")
+            if unit.lower() not in ['kg', 'item']:
+                print("Unit must be 'kg' or 'item'. Defaulting to 'kg'.")
+                unit = 'kg'
+            
+            service = Service.create(session, name, price, unit, description)
+            print(f"\nService added successfully with ID: {service.id}")
+        
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+        except Exception as e:
+            print(f"\nAn error occurred: {str(e)}")
+
+def update_service():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter service ID to update: "))
+            service = Service.find_by_id(session, id)
+            
+            if not service:
+                print(f"\nNo service found with ID {id}")
+                return
+            
+            print("\nCurrent service details:")
+            print(f"Name: {service.name}")
+            print(f"Description: {service.description}")
+            print(f"Price: {service.price_per_unit} per {service.unit}")
+            
+            print("\nEnter new details (leave blank to keep current value):")
+            
+            name = input("Name: ") or service.name
+            description = input("Description: ") or service.description
+            
+            price_input = input(f"Price per {service.unit}: ")
+            if price_input:
+                try:
+                    price = float(price_input)
+                    if price <= 0:
+                        print("Price must be positive. Keeping current value.")
+                        price = service.price_per_unit
+                except ValueError:
+                    print("Invalid price. Keeping current value.")
+                    price = service.price_per_unit
+            else:
+                price = service.price_per_unit
+            
+            unit_input = input("Unit (kg/item): ") or service.unit
+            if unit_input.lower() not in ['kg', 'item']:
+                print("Unit must be 'kg' or 'item'. Keeping current value.")
+                unit = service.unit
+            else:
+                unit = unit_input
+            
+            updated_service = Service.update(
+                session, id, 
+                name=name, 
+                description=description, 
+                price_per_unit=price, 
+                unit=unit
+            )
+            
+            if updated_service:
+                print("\nService updated successfully!")
+            else:
+                print("\nFailed to update service.")
+                
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+
+def delete_service():
+    with session_scope() as session:
+        try:
+            id = int(input("\nEnter service ID to delete: "))
+            service = Service.find_by_id(session, id)
+            
+            if not service:
+                print(f"\nNo service found with ID {id}")
+                return
+            
+            confirm = input(f"\nAre you sure you want to delete service {service.name}? (y/n): ")
+            
+            if confirm.lower() == 'y':
+                if Service.delete(session, id):
+                    print("\nService deleted successfully!")
+                else:
+                    print("\nFailed to delete service.")
+            else:
+                print("\nDelete operation canceled.")
+                
+        except ValueError:
+            print("\nInvalid ID. Please enter a number.")
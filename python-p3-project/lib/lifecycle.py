@@ -0,0 +1,78 @@
+# lib/lifecycle.py
+#
+# How long orders spend in each stage of their lifecycle, from the status
+# history. The database pairs every status change with the previous one for
+# the same order (LAG over order_id, timestamp) and returns a histogram of
+# the time spent per service and stage, to the minute. Percentiles are read
+# off the histogram here, so no history row is ever loaded into Python.
+
+from datetime import datetime, timedelta
+
+from models import Order, Service
+from models.order import ORDER_STATUSES
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+# Unfinished orders whose status hasn't changed for this long are stuck
+STUCK_AFTER_HOURS = 48
+
+def stage_order(key):
+    # Services by id, then stages in lifecycle order
+    service_id, stage = key
+    return (service_id or 0, ORDER_STATUSES.index(stage) if stage in ORDER_STATUSES else len(ORDER_STATUSES))
+
+def latency_row(buckets):
+    # Figures for one stage from its {minute: [transitions, total_minutes,
+    # longest_minutes]} buckets. A percentile is the average time spent in
+    # the minute bucket holding that rank, so it is accurate to the minute.
+    total = sum(count for count, minutes, longest in buckets.values())
+    row = {
+        'transitions': total,
+        'mean_hours': sum(minutes for count, minutes, longest in buckets.values()) / total / 60
+    }
+
+    targets = [(p, (p * total + 99) // 100) for p in PERCENTILES]
+    seen = 0
+    for minute in sorted(buckets):
+        count, minutes, longest = buckets[minute]
+        seen += count
+        while targets and targets[0][1] <= seen:
+            row[f'p{targets.pop(0)[0]}_hours'] = minutes / count / 60
+    row['max_hours'] = max(longest for count, minutes, longest in buckets.values()) / 60
+    return row
+
+def stage_latency(session, by_service=False, **filters):
+    # Time spent in each stage across all matching orders, or per service
+    # and stage when by_service is set. Takes the same filters as
+    # Order.summarize.
+    groups = {}
+    for service_id, stage, minute, count, minutes, longest in Order.stage_duration_histogram(session, **filters):
+        bucket = groups.setdefault((service_id if by_service else None, stage), {}).setdefault(minute, [0, 0.0, 0.0])
+        bucket[0] += count
+        bucket[1] += minutes
+        bucket[2] = max(bucket[2], longest)
+
+    catalog = Service.get_catalog(session) if by_service else {}
+    rows = []
+    for service_id, stage in sorted(groups, key=stage_order):
+        key = {'stage': stage}
+        if by_service:
+            service = catalog.get(service_id)
+            key = {'service_id': service_id, 'service_name': service.name if service else None, **key}
+        rows.append({**key, **latency_row(groups[(service_id, stage)])})
+    return rows
+
+def stuck_orders(session, hours=STUCK_AFTER_HOURS, now=None, **filters):
+    # Streams unfinished orders whose status last changed more than `hours`
+    # ago, longest waiting first
+    now = now or datetime.utcnow()
+    for row in Order.stream_stuck(session, now - timedelta(hours=hours), **filters):
+        yield {
+            'id': row.id,
+            'customer_id': row.customer_id,
+            'service_id': row.service_id,
+            'location_id': row.location_id,
+            'status': row.status,
+            'status_since': row.status_since,
+            'hours_waiting': (now - row.status_since).total_seconds() / 3600
+        }
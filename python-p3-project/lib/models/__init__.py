@@ -0,0 +1,64 @@
+# lib/models/__init__.py
+
+from sqlalchemy import inspect
+
+from .base import Base, engine, Session, session_registry, session_scope, make_engine, keyset_page, profiler, DEFAULT_PAGE_SIZE
+from .customer import Customer
+from .service import Service
+from .order import Order
+from .location import Location
+from .order_status_history import OrderStatusHistory
+from .daily_order_summary import DailyOrderSummary
+from .archive import ArchivedOrder, ArchivedOrderStatusHistory
+from .pickup_slot import PickupSlot
+
+# Version of the schema the models describe, stamped into the database file
+# as PRAGMA user_version. Bump it with every new migration; migrations are
+# numbered to match, so version 9 is Alembic revision 0009.
+SCHEMA_VERSION = 9
+SCHEMA_REVISION = f"{SCHEMA_VERSION:04d}"
+
+def alembic_revision(connection):
+    # The revision Alembic last migrated the database to, if it ever has
+    if not inspect(connection).has_table('alembic_version'):
+        return None
+    return connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+OUTDATED_SCHEMA_MESSAGE = "The database schema is older than this version of LaundryConnect. Run `alembic upgrade head` from python-p3-project to update it."
+
+# Create any missing tables, unless the database is already stamped with the
+# current schema version. create_all only adds whole tables, not columns or
+# table changes, so the stamp is only written when the schema is known to be
+# current: every table was just created, or Alembic has migrated the database
+# to the latest revision. Returns False for an older database that still
+# needs `alembic upgrade head`.
+def create_tables():
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+            return True
+        existing_tables = set(inspect(connection).get_table_names()) & set(Base.metadata.tables)
+    
+    Base.metadata.create_all(engine)
+    
+    with engine.begin() as connection:
+        if not existing_tables:
+            # A new database: record it as migrated, so later migrations
+            # start from here rather than from the first revision
+            connection.exec_driver_sql(
+                "CREATE TABLE IF NOT EXISTS alembic_version "
+                "(version_num VARCHAR(32) NOT NULL, CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+            )
+            connection.exec_driver_sql("DELETE FROM alembic_version")
+            connection.exec_driver_sql(f"INSERT INTO alembic_version (version_num) VALUES ('{SCHEMA_REVISION}')")
+        elif alembic_revision(connection) != SCHEMA_REVISION:
+            return False
+        
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
+
+# Drop every table and the schema stamps, so create_tables builds afresh
+def drop_tables():
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE IF EXISTS alembic_version")
+        connection.exec_driver_sql("PRAGMA user_version = 0")
@@ -0,0 +1,99 @@
+# lib/models/archive.py
+
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, Index, delete, insert, literal, select
+from datetime import datetime
+
+from .base import Base
+
+# Orders moved per transaction by ArchivedOrder.archive_chunk
+ARCHIVE_CHUNK_SIZE = 1000
+
+class ArchivedOrder(Base):
+    __tablename__ = 'orders_archive'
+    __table_args__ = (
+        Index('ix_orders_archive_location_id_created_at', 'location_id', 'created_at'),
+    )
+
+    # Completed orders moved out of the orders table once they are old
+    # enough, so listings, finders and reports over live orders don't have
+    # to step over them. Same columns as orders, plus when the order was
+    # archived. The daily order summary keeps counting them.
+    id = Column(Integer, primary_key=True)
+    customer_id = Column(Integer, nullable=False, index=True)
+    service_id = Column(Integer, nullable=False)
+    location_id = Column(Integer)
+    weight = Column(Float, nullable=False)
+    total_price = Column(Float, nullable=False)
+    status = Column(String)
+    pickup_date = Column(Date, nullable=False)
+    pickup_time = Column(String, nullable=False)
+    special_instructions = Column(Text)
+    created_at = Column(DateTime, index=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    @classmethod
+    def archive_chunk(cls, session, created_before, after_id=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+        # Move up to chunk_size completed orders created before
+        # created_before, with their status history, in one transaction.
+        # Orders are taken in id order after after_id; returns (last_id,
+        # orders moved, history rows moved), or None when there are no more.
+        orders = cls.metadata.tables['orders']
+        history = cls.metadata.tables['order_status_history']
+        archived_history = ArchivedOrderStatusHistory.__table__
+
+        query = select(orders.c.id).where(orders.c.status == 'completed', orders.c.created_at < created_before)
+        if after_id is not None:
+            query = query.where(orders.c.id > after_id)
+        ids = list(session.execute(query.order_by(orders.c.id).limit(chunk_size)).scalars())
+        if not ids:
+            return None
+
+        order_columns = [column.name for column in orders.columns]
+        history_columns = [column.name for column in history.columns]
+        try:
+            session.execute(insert(cls.__table__).from_select(
+                order_columns + ['archived_at'],
+                select(*orders.columns, literal(datetime.utcnow(), DateTime)).where(orders.c.id.in_(ids))
+            ))
+            history_count = session.execute(insert(archived_history).from_select(
+                history_columns,
+                select(*history.columns).where(history.c.order_id.in_(ids))
+            )).rowcount
+            session.execute(delete(history).where(history.c.order_id.in_(ids)))
+            session.execute(delete(orders).where(orders.c.id.in_(ids)))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        return ids[-1], len(ids), history_count
+
+    @classmethod
+    def find_by_customer(cls, session, customer_id):
+        return session.query(cls).filter_by(customer_id=customer_id).all()
+
+    @classmethod
+    def delete_for_customer(cls, session, customer_id):
+        # Remove a customer's archived orders and their history. Doesn't
+        # commit; Customer.delete does.
+        order_ids = select(cls.id).where(cls.customer_id == customer_id).scalar_subquery()
+        session.execute(delete(ArchivedOrderStatusHistory).where(ArchivedOrderStatusHistory.order_id.in_(order_ids)))
+        session.execute(delete(cls).where(cls.customer_id == customer_id))
+
+    def __repr__(self):
+        return f"<ArchivedOrder id={self.id} customer_id={self.customer_id} status={self.status}>"
+
+class ArchivedOrderStatusHistory(Base):
+    __tablename__ = 'order_status_history_archive'
+    __table_args__ = (
+        Index('ix_order_status_history_archive_order_id_timestamp', 'order_id', 'timestamp'),
+    )
+
+    # Status history of archived orders, same columns as order_status_history
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, nullable=False)
+    status = Column(String, nullable=False)
+    timestamp = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ArchivedOrderStatusHistory id={self.id} order_id={self.order_id} status={self.status}>"
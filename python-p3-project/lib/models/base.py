@@ -1,12 +1,300 @@
 # lib/models/base.py
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
 # Create a base class for our models
 Base = declarative_base()
 
+# Database settings. Each one can be overridden with the matching
+# LAUNDRY_DB_* environment variable, e.g. LAUNDRY_DB_SYNCHRONOUS=FULL
+DEFAULT_DB_SETTINGS = {
+    'path': 'laundry_connect.db',
+    'journal_mode': 'WAL',          # readers don't block the writer
+    'synchronous': 'NORMAL',        # safe with WAL, fsyncs at checkpoints only
+    'cache_size': -64000,           # negative values are KiB, so 64 MB
+    'mmap_size': 268435456,         # 256 MB of memory-mapped reads
+    'busy_timeout': 5000,           # ms to wait for a lock before failing
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30
+}
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Rows per page in paginated listings
+DEFAULT_PAGE_SIZE = 20
+
+def load_db_settings(**overrides):
+    settings = {}
+
+    for key, default in DEFAULT_DB_SETTINGS.items():
+        value = overrides.get(key)
+        if value is None:
+            value = os.environ.get(f"LAUNDRY_DB_{key.upper()}", default)
+        settings[key] = type(default)(value)
+
+    settings['journal_mode'] = settings['journal_mode'].upper()
+    settings['synchronous'] = settings['synchronous'].upper()
+
+    if settings['journal_mode'] not in JOURNAL_MODES:
+        raise ValueError(f"journal_mode must be one of: {', '.join(JOURNAL_MODES)}")
+    if settings['synchronous'] not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"synchronous must be one of: {', '.join(SYNCHRONOUS_LEVELS)}")
+
+    return settings
+
+def make_engine(read_only=False, **overrides):
+    # read_only opens the file with SQLite's mode=ro, for workers that must
+    # never write (and never take a write lock)
+    settings = load_db_settings(**overrides)
+
+    engine_args = {}
+    if settings['path'] != ':memory:':
+        engine_args.update(
+            pool_size=settings['pool_size'],
+            max_overflow=settings['max_overflow'],
+            pool_timeout=settings['pool_timeout']
+        )
+
+    if read_only:
+        url = f"sqlite:///file:{settings['path']}?mode=ro&uri=true"
+    else:
+        url = f"sqlite:///{settings['path']}"
+    engine = create_engine(url, **engine_args)
+
+    # Pragmas are per connection, so apply them to every new one
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # The journal mode is stored in the file, so only writers set it
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={settings['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={settings['synchronous']}")
+        cursor.execute(f"PRAGMA cache_size={settings['cache_size']}")
+        cursor.execute(f"PRAGMA mmap_size={settings['mmap_size']}")
+        cursor.execute(f"PRAGMA busy_timeout={settings['busy_timeout']}")
+        cursor.close()
+
+    return engine
+
+def keyset_page(query, id_column, after_id=None, before_id=None, page_size=None):
+    # Seek-method pagination: instead of OFFSET, continue from the last id
+    # seen (after_id) or go back from the first id shown (before_id). Each
+    # page is an index range read, so it costs the same however deep it is.
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    query = query.order_by(None)
+
+    if before_id is not None:
+        rows = query.filter(id_column < before_id).order_by(id_column.desc()).limit(page_size).all()
+        rows.reverse()
+        return rows
+
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+
+    return query.order_by(id_column).limit(page_size).all()
+
+def fingerprint_sql(statement):
+    # Reduce a statement to its shape, so the same query with different
+    # values (or a different number of IN / VALUES items) groups together
+    sql = re.sub(r"'(?:[^']|'')*'", '?', statement)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", '?', sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", '(?+)', sql)
+    sql = re.sub(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+", '(?+), ...', sql)
+    return re.sub(r"\s+", ' ', sql).strip()
+
+class RowCountingCursor:
+    # Wraps a DBAPI cursor to count the rows fetched from it, which is only
+    # known after the statement's after_cursor_execute event has fired
+    def __init__(self, cursor, record):
+        self._cursor = cursor
+        self._record = record
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._record['rows'] += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._record['rows'] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._record['rows'] += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._record['rows'] += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class QueryProfiler:
+    # Records every SQL statement run during a CLI action: its latency,
+    # the rows it returned or changed and its fingerprint. Turned on with
+    # LAUNDRY_PROFILE=1 or the CLI's --profile flag; costs nothing when off.
+    # Statements slower than LAUNDRY_SLOW_QUERY_MS are appended to the
+    # LAUNDRY_SLOW_QUERY_LOG file as JSON lines, when one is set.
+    def __init__(self):
+        self.enabled = False
+        self.engines = []
+        self.action = None
+        self.action_started = None
+        self.statements = []
+        self.slow_query_ms = float(os.environ.get('LAUNDRY_SLOW_QUERY_MS', 100))
+        self.slow_query_log = os.environ.get('LAUNDRY_SLOW_QUERY_LOG')
+
+    def watch(self, engine):
+        self.engines.append(engine)
+        if self.enabled:
+            self._listen(engine)
+
+    def enable(self, slow_query_log=None, slow_query_ms=None):
+        if slow_query_log:
+            self.slow_query_log = slow_query_log
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if not self.enabled:
+            self.enabled = True
+            for engine in self.engines:
+                self._listen(engine)
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            for engine in self.engines:
+                event.remove(engine, 'before_cursor_execute', self.before_cursor_execute)
+                event.remove(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def _listen(self, engine):
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        if self.action is None:
+            return
+
+        record = {'statement': statement, 'ms': elapsed * 1000, 'rows': 0}
+        if cursor.description is not None and context is not None and not executemany:
+            context.cursor = RowCountingCursor(cursor, record)
+        else:
+            record['rows'] = max(cursor.rowcount, 0)
+        self.statements.append(record)
+
+    def start_action(self, name):
+        self.action = name
+        self.action_started = time.perf_counter()
+        self.statements = []
+
+    def finish_action(self):
+        # Stop recording and return the action's statistics
+        stats = {
+            'action': self.action,
+            'wall_ms': (time.perf_counter() - self.action_started) * 1000,
+            'queries': len(self.statements),
+            'sql_ms': sum(record['ms'] for record in self.statements),
+            'rows': sum(record['rows'] for record in self.statements),
+            'fingerprints': {}
+        }
+
+        for record in self.statements:
+            record['fingerprint'] = fingerprint_sql(record['statement'])
+            group = stats['fingerprints'].setdefault(record['fingerprint'], {'count': 0, 'ms': 0, 'rows': 0})
+            group['count'] += 1
+            group['ms'] += record['ms']
+            group['rows'] += record['rows']
+
+        stats['slowest'] = sorted(self.statements, key=lambda record: record['ms'], reverse=True)[:3]
+        self.write_slow_queries(stats['action'])
+
+        self.action = None
+        self.statements = []
+        return stats
+
+    def write_slow_queries(self, action):
+        slow = [record for record in self.statements if record['ms'] >= self.slow_query_ms]
+        if not slow or not self.slow_query_log:
+            return
+
+        with open(self.slow_query_log, 'a', encoding='utf-8') as f:
+            for record in slow:
+                f.write(json.dumps({
+                    'time': datetime.now().isoformat(timespec='seconds'),
+                    'action': action,
+                    'ms': round(record['ms'], 3),
+                    'rows': record['rows'],
+                    'fingerprint_id': hashlib.sha1(record['fingerprint'].encode()).hexdigest()[:12],
+                    'fingerprint': record['fingerprint'],
+                    'statement': record['statement']
+                }) + '\n')
+
+    @staticmethod
+    def format_summary(stats, width=100):
+        def short(sql):
+            # Column lists hide what matters; keep the FROM onwards
+            return re.sub(r"^SELECT .*? FROM ", 'SELECT ... FROM ', sql)[:width]
+
+        lines = [
+            f"[profile] {stats['action']}: {stats['queries']} queries "
+            f"({len(stats['fingerprints'])} distinct), {stats['rows']} rows, "
+            f"{stats['sql_ms']:.1f} ms in SQL, {stats['wall_ms']:.1f} ms total"
+        ]
+
+        # The same statement run many times is usually an N+1 loop
+        for sql, group in sorted(stats['fingerprints'].items(), key=lambda item: item[1]['ms'], reverse=True)[:3]:
+            if group['count'] > 1:
+                lines.append(f"  {group['count']:>5}x {group['ms']:>9.1f} ms  {short(sql)}")
+
+        for record in stats['slowest']:
+            lines.append(f"  {record['ms']:>15.1f} ms  {record['rows']:>6} rows  {short(record['fingerprint'])}")
+
+        return '\n'.join(lines)
+
+profiler = QueryProfiler()
+if os.environ.get('LAUNDRY_PROFILE', '').lower() in ('1', 'true', 'yes'):
+    profiler.enable()
+
 # Create engine and session
-engine = create_engine('sqlite:///laundry_connect.db')
-Session = sessionmaker(bind=engine)
\ No newline at end of file
+engine = make_engine()
+profiler.watch(engine)
+Session = sessionmaker(bind=engine)
+
+# The CLI's sessions, one per run (per thread). Menu actions borrow it with
+# session_scope, so consecutive actions share its identity map and pooled
+# connection; the CLI calls session_registry.remove() when it exits.
+session_registry = scoped_session(Session)
+
+@contextmanager
+def session_scope():
+    # Borrow the run's session for one action. Model methods commit their
+    # own writes, so whatever is still uncommitted when the outermost scope
+    # ends, including a read transaction, is rolled back. That returns the
+    # connection to the pool and makes the next action read fresh rows.
+    session = session_registry()
+    depth = session.info.get('scope_depth', 0)
+    session.info['scope_depth'] = depth + 1
+    try:
+        yield session
+    finally:
+        session.info['scope_depth'] = depth
+        if depth == 0:
+            session.rollback()
@@ -1,18 +1,42 @@
 # lib/models/customer.py
 
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, DDL, event, text
+from sqlalchemy.orm import relationship, synonym
 from datetime import datetime
 import re
 
-from .base import Base
+from .archive import ArchivedOrder
+from .base import Base, keyset_page
+from .daily_order_summary import DailyOrderSummary
+from .pickup_slot import PickupSlot
+
+KENYA_COUNTRY_CODE = '254'
+
+# Results returned by Customer.search unless a limit is given
+SEARCH_LIMIT = 20
+
+# Words so common in addresses and emails that matching them costs the most
+# and narrows the results the least. Customer.search ignores them unless
+# the query has nothing else.
+SEARCH_STOPWORDS = {
+    'on', 'in', 'at', 'of', 'off', 'near', 'the', 'and',
+    'rd', 'road', 'st', 'street', 'ave', 'avenue', 'lane', 'drive',
+    'com', 'co', 'ke', 'org', 'net', 'gmail', 'yahoo', 'hotmail', 'outlook', 'example'
+}
+
+# Relative weight of a match in each indexed column when ranking search
+# results: a hit in the name counts most, one in the address least
+SEARCH_WEIGHTS = {'name': 10.0, 'email': 2.0, 'address': 1.0}
 
 class Customer(Base):
     __tablename__ = 'customers'
     
     id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
-    phone = Column(String, nullable=False)
+    _name = Column('name', String, nullable=False)
+    _phone = Column('phone', String, nullable=False)
+    # The phone number in E.164 form, kept in step by the phone setter. This
+    # is what lookups and duplicate checks use.
+    phone_e164 = Column(String, unique=True, index=True)
     email = Column(String)
     address = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -27,6 +51,25 @@ class Customer(Base):
         
     @phone.setter
     def phone(self, value):
+        self._phone = self.validate_phone(value)
+        self.phone_e164 = self.normalize_phone(value)
+    
+    @property
+    def name(self):
+        return self._name
+        
+    @name.setter
+    def name(self, value):
+        self._name = self.validate_name(value)
+    
+    # Expose the validated properties as mapped attributes so they can be
+    # used in queries (e.g. filter_by(phone=...))
+    phone = synonym('_phone', descriptor=phone)
+    name = synonym('_name', descriptor=name)
+    
+    # Validators shared by the property setters and bulk imports
+    @staticmethod
+    def validate_phone(value):
         # Validate phone number (simple validation for Kenyan numbers)
         if not value:
             raise ValueError("Phone number cannot be empty")
@@ -37,22 +80,34 @@ class Customer(Base):
         # Kenyan numbers are typically 9-10 digits
         if len(phone_digits) < 9 or len(phone_digits) > 12:
             raise ValueError("Invalid phone number length")
-            
-        self._phone = value
-    
-    @property
-    def name(self):
-        return self._name
         
-    @name.setter
-    def name(self, value):
+        return value
+    
+    @staticmethod
+    def validate_name(value):
         if not value or len(value.strip()) < 3:
             raise ValueError("Name must be at least 3 characters")
-        self._name = value
+        return value
+    
+    @staticmethod
+    def normalize_phone(value):
+        # Reduce a phone number to E.164 form so that "0712 345 678",
+        # "712345678" and "+254712345678" compare equal
+        phone_digits = re.sub(r'\D', '', value)
+        
+        if len(phone_digits) == 10 and phone_digits.startswith('0'):
+            phone_digits = KENYA_COUNTRY_CODE + phone_digits[1:]
+        elif len(phone_digits) == 9:
+            phone_digits = KENYA_COUNTRY_CODE + phone_digits
+        
+        return '+' + phone_digits
     
     # ORM methods
     @classmethod
     def create(cls, session, name, phone, email=None, address=None):
+        if cls.find_by_phone(session, phone):
+            raise ValueError("A customer with this phone number already exists")
+        
         customer = cls(name=name, phone=phone, email=email, address=address)
         session.add(customer)
         session.commit()
@@ -62,13 +117,36 @@ class Customer(Base):
     def get_all(cls, session):
         return session.query(cls).all()
     
+    @classmethod
+    def get_page(cls, session, after_id=None, before_id=None, page_size=None, **filters):
+        query = session.query(cls).filter_by(**filters)
+        return keyset_page(query, cls.id, after_id, before_id, page_size)
+    
     @classmethod
     def find_by_id(cls, session, id):
         return session.query(cls).filter_by(id=id).first()
     
     @classmethod
     def find_by_phone(cls, session, phone):
-        return session.query(cls).filter_by(phone=phone).first()
+        # Matches the number in whatever format it was typed
+        return session.query(cls).filter_by(phone_e164=cls.normalize_phone(phone)).first()
+    
+    @classmethod
+    def search(cls, session, text, limit=SEARCH_LIMIT):
+        # Customers whose name, email or address contain every word of
+        # `text`, each as a word or the start of one, best matches first.
+        # "wanjau on thika rd" finds Mary Wanjau of Thika Road.
+        # An email address is searched by the part before the @
+        terms = re.findall(r'[^\W\d_]+', re.sub(r'@\S*', ' ', text.lower()))
+        terms = [term for term in terms if term not in SEARCH_STOPWORDS] or terms
+        if not terms:
+            return []
+        
+        # Quoting each term keeps FTS5 query syntax out of user input
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return session.query(cls).from_statement(SEARCH_QUERY).params(
+            match=match, limit=limit
+        ).all()
     
     @classmethod
     def update(cls, session, id, **kwargs):
@@ -76,6 +154,11 @@ class Customer(Base):
         if not customer:
             return None
         
+        if kwargs.get('phone'):
+            existing = cls.find_by_phone(session, kwargs['phone'])
+            if existing and existing.id != customer.id:
+                raise ValueError("A customer with this phone number already exists")
+        
         for key, value in kwargs.items():
             if hasattr(customer, key):
                 setattr(customer, key, value)
@@ -89,9 +172,58 @@ class Customer(Base):
         if not customer:
             return False
         
+        # The customer's orders go with them, archived ones included
+        DailyOrderSummary.remove_orders(session, customer.orders)
+        PickupSlot.release_orders(session, customer.orders)
+        DailyOrderSummary.remove_orders(session, ArchivedOrder.find_by_customer(session, id))
+        ArchivedOrder.delete_for_customer(session, id)
         session.delete(customer)
         session.commit()
         return True
     
     def __repr__(self):
-        return f"<Customer id={self.id} name={self.name} phone={self.phone}>"
\ No newline at end of file
+        return f"<Customer id={self.id} name={self.name} phone={self.phone}>"
+
+# Full-text index over name, email and address for Customer.search. It is an
+# external-content FTS5 table: it holds only the index and reads the text
+# from customers. Triggers rather than ORM events keep it in step, so bulk
+# inserts that bypass the ORM (imports, the data generator) are indexed too.
+# Prefix indexes on 2 and 3 characters keep short prefix searches fast.
+# Digits separate tokens rather than forming them: numbers in emails would
+# otherwise make a distinct token per customer ("wanjau1234"), which every
+# prefix search has to merge. Phone numbers have their own lookup.
+SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+        name, email, address,
+        content='customers', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 separators '0123456789'", prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_insert AFTER INSERT ON customers BEGIN
+        INSERT INTO customers_fts(rowid, name, email, address) VALUES (new.id, new.name, new.email, new.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_delete AFTER DELETE ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, name, email, address) VALUES ('delete', old.id, old.name, old.email, old.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_update AFTER UPDATE OF name, email, address ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, name, email, address) VALUES ('delete', old.id, old.name, old.email, old.address);
+        INSERT INTO customers_fts(rowid, name, email, address) VALUES (new.id, new.name, new.email, new.address);
+    END"""
+]
+
+for statement in SEARCH_DDL:
+    event.listen(Customer.__table__, 'after_create', DDL(statement))
+# Dropping customers drops its triggers but would leave a stale index behind
+event.listen(Customer.__table__, 'before_drop', DDL("DROP TABLE IF EXISTS customers_fts"))
+
+# Every match is ranked before the limit, so the best ones are found however
+# many customers match; only the results are joined to customers
+SEARCH_QUERY = text(f"""
+    SELECT customers.* FROM (
+        SELECT rowid, bm25(customers_fts, {SEARCH_WEIGHTS['name']}, {SEARCH_WEIGHTS['email']}, {SEARCH_WEIGHTS['address']}) AS score
+        FROM customers_fts WHERE customers_fts MATCH :match
+        ORDER BY score
+        LIMIT :limit
+    ) AS hits
+    JOIN customers ON customers.id = hits.rowid
+    ORDER BY hits.score
+""")
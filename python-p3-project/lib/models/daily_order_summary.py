@@ -0,0 +1,168 @@
+# lib/models/daily_order_summary.py
+
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, func, select, delete, union_all
+from sqlalchemy.dialects.sqlite import insert
+
+from .base import Base
+from .service import Service
+
+# Periods DailyOrderSummary.report can group days into
+REPORT_PERIODS = ('day', 'week', 'month')
+
+# Summary key for orders without a branch. The key is part of the primary
+# key, and NULLs never match in ON CONFLICT, so 0 stands in for NULL.
+NO_LOCATION = 0
+
+class DailyOrderSummary(Base):
+    __tablename__ = 'daily_order_summary'
+
+    # Order counts, weight and revenue per creation day, branch, status and
+    # service.
+    # The Order write methods keep it current in the same transaction as the
+    # order change, so reports never have to scan the orders table.
+    date = Column(Date, primary_key=True)
+    location_id = Column(Integer, primary_key=True, default=NO_LOCATION)
+    status = Column(String, primary_key=True)
+    service_id = Column(Integer, ForeignKey('services.id'), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_weight = Column(Float, nullable=False, default=0)
+    total_revenue = Column(Float, nullable=False, default=0)
+
+    # ORM methods
+    @classmethod
+    def add(cls, session, day, location_id, status, service_id, order_count, total_weight, total_revenue):
+        cls.add_many(session, [(day, location_id, status, service_id, order_count, total_weight, total_revenue)])
+
+    @classmethod
+    def add_many(cls, session, changes):
+        # Add each (day, location_id, status, service_id, order_count,
+        # total_weight, total_revenue) to its summary row in one executemany upsert,
+        # creating rows as needed. Negative amounts subtract, and rows whose
+        # count drops to zero are removed.
+        if not changes:
+            return
+
+        table = cls.__table__
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.date, table.c.location_id, table.c.status, table.c.service_id],
+            set_={
+                'order_count': table.c.order_count + statement.excluded.order_count,
+                'total_weight': table.c.total_weight + statement.excluded.total_weight,
+                'total_revenue': table.c.total_revenue + statement.excluded.total_revenue
+            }
+        )
+        session.execute(statement, [
+            {
+                'date': day,
+                'location_id': location_id if location_id is not None else NO_LOCATION,
+                'status': status,
+                'service_id': service_id,
+                'order_count': order_count,
+                'total_weight': total_weight,
+                'total_revenue': total_revenue
+            }
+            for day, location_id, status, service_id, order_count, total_weight, total_revenue in changes
+        ])
+
+        emptied_days = {change[0] for change in changes if change[4] < 0}
+        if emptied_days:
+            session.execute(delete(table).where(table.c.date.in_(emptied_days), table.c.order_count <= 0))
+
+    @classmethod
+    def add_order(cls, session, created_at, location_id, status, service_id, weight, total_price, sign=1):
+        # Count one order in (sign=1) or out of (sign=-1) the summary
+        if created_at is None:
+            return
+        cls.add(session, created_at.date(), location_id, status, service_id, sign, sign * weight, sign * total_price)
+
+    @classmethod
+    def remove_orders(cls, session, orders):
+        # Count many Order objects out of the summary, e.g. before a cascade
+        # delete removes them
+        totals = {}
+        for order in orders:
+            if order.created_at is None:
+                continue
+            key = (order.created_at.date(), order.location_id, order.status, order.service_id)
+            count, weight, revenue = totals.get(key, (0, 0, 0))
+            totals[key] = (count + 1, weight + order.weight, revenue + order.total_price)
+
+        cls.add_many(session, [key + (-count, -weight, -revenue) for key, (count, weight, revenue) in totals.items()])
+
+    @classmethod
+    def rebuild(cls, session):
+        # Recompute the whole summary from the orders and archived orders
+        # tables. Needed after writes that bypass the Order methods, e.g. the
+        # data generator.
+        columns = ['created_at', 'location_id', 'status', 'service_id', 'weight', 'total_price']
+        live = cls.metadata.tables['orders']
+        archived = cls.metadata.tables['orders_archive']
+        orders = union_all(
+            select(*[live.c[column] for column in columns]),
+            select(*[archived.c[column] for column in columns])
+        ).subquery()
+        table = cls.__table__
+
+        session.execute(delete(table))
+        session.execute(table.insert().from_select(
+            ['date', 'location_id', 'status', 'service_id', 'order_count', 'total_weight', 'total_revenue'],
+            select(
+                func.date(orders.c.created_at),
+                func.coalesce(orders.c.location_id, NO_LOCATION),
+                orders.c.status,
+                orders.c.service_id,
+                func.count(),
+                func.coalesce(func.sum(orders.c.weight), 0),
+                func.coalesce(func.sum(orders.c.total_price), 0)
+            )
+            .where(orders.c.created_at.isnot(None))
+            .group_by(func.date(orders.c.created_at), func.coalesce(orders.c.location_id, NO_LOCATION), orders.c.status, orders.c.service_id)
+        ))
+        session.commit()
+
+        return session.query(func.count()).select_from(table).scalar()
+
+    @classmethod
+    def report(cls, session, start, end, period='day', by=('status', 'service'), location_id=None):
+        # Totals per period for days from start up to (not including) end,
+        # for all branches or one. Weeks start on Monday; each period is
+        # labelled by its first day. `by` may contain 'status', 'service'
+        # and 'location'.
+        if period == 'day':
+            period_column = cls.date
+        elif period == 'week':
+            period_column = func.date(cls.date, '-6 days', 'weekday 1')
+        elif period == 'month':
+            period_column = func.strftime('%Y-%m-01', cls.date)
+        else:
+            raise ValueError(f"Period must be one of: {', '.join(REPORT_PERIODS)}")
+
+        group_columns = [period_column.label('period')]
+        for key in by:
+            if key == 'status':
+                group_columns.append(cls.status)
+            elif key == 'service':
+                group_columns.extend([cls.service_id, Service.name.label('service_name')])
+            elif key == 'location':
+                group_columns.append(cls.location_id)
+            else:
+                raise ValueError(f"Cannot group the summary by '{key}'")
+
+        query = session.query(
+            *group_columns,
+            func.sum(cls.order_count).label('order_count'),
+            func.sum(cls.total_weight).label('total_weight'),
+            func.sum(cls.total_revenue).label('total_revenue')
+        ).filter(cls.date >= start, cls.date < end)
+
+        if location_id is not None:
+            query = query.filter(cls.location_id == location_id)
+
+        if 'service' in by:
+            query = query.join(Service, cls.service_id == Service.id)
+
+        return query.group_by(*group_columns).order_by(group_columns[0]).all()
+
+    def __repr__(self):
+        return f"<DailyOrderSummary date={self.date} location_id={self.location_id} status={self.status} service_id={self.service_id} orders={self.order_count}>"
@@ -1,9 +1,10 @@
 # lib/models/location.py
 
 from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.orm import relationship
 from datetime import datetime
 
-from .base import Base
+from .base import Base, keyset_page
 
 class Location(Base):
     __tablename__ = 'locations'
@@ -13,12 +14,23 @@ class Location(Base):
     address = Column(String, nullable=False)
     phone = Column(String, nullable=False)
     email = Column(String)
+    slot_capacity = Column(Integer)  # orders per pickup window; None means DEFAULT_SLOT_CAPACITY
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Relationships
+    orders = relationship("Order", back_populates="location")
+    
+    @staticmethod
+    def validate_slot_capacity(value):
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise ValueError("Slot capacity must be a whole number of orders")
+        return value
+    
     # ORM methods
     @classmethod
-    def create(cls, session, name, address, phone, email=None):
-        location = cls(name=name, address=address, phone=phone, email=email)
+    def create(cls, session, name, address, phone, email=None, slot_capacity=None):
+        cls.validate_slot_capacity(slot_capacity)
+        location = cls(name=name, address=address, phone=phone, email=email, slot_capacity=slot_capacity)
         session.add(location)
         session.commit()
         return location
@@ -27,6 +39,11 @@ class Location(Base):
     def get_all(cls, session):
         return session.query(cls).all()
     
+    @classmethod
+    def get_page(cls, session, after_id=None, before_id=None, page_size=None, **filters):
+        query = session.query(cls).filter_by(**filters)
+        return keyset_page(query, cls.id, after_id, before_id, page_size)
+    
     @classmethod
     def find_by_id(cls, session, id):
         return session.query(cls).filter_by(id=id).first()
@@ -37,6 +54,9 @@ class Location(Base):
         if not location:
             return None
         
+        if 'slot_capacity' in kwargs:
+            cls.validate_slot_capacity(kwargs['slot_capacity'])
+        
         for key, value in kwargs.items():
             if hasattr(location, key):
                 setattr(location, key, value)
@@ -50,6 +70,10 @@ class Location(Base):
         if not location:
             return False
         
+        # Orders keep their branch for reporting
+        if session.query(cls.orders.any()).filter(cls.id == id).scalar():
+            raise ValueError("Cannot delete a location that has orders")
+        
         session.delete(location)
         session.commit()
         return True
@@ -1,30 +1,81 @@
 # lib/models/order.py
 
-from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey, Index, case, cast, func, insert, select, update
+from sqlalchemy.orm import aliased, relationship, synonym
+from collections import namedtuple
 from datetime import datetime, date
 
-from .base import Base
+from .archive import ArchivedOrder
+from .base import Base, keyset_page
+from .customer import Customer
+from .location import Location
+from .daily_order_summary import DailyOrderSummary, NO_LOCATION
 from .order_status_history import OrderStatusHistory
+from .pickup_slot import PickupSlot, PICKUP_TIMES, slot_full_error
 from .service import Service
 
+# Number of rows fetched per round trip when streaming order listings
+STREAM_CHUNK_SIZE = 1000
+
+# Number of rows sent per executemany batch by bulk writes
+BULK_BATCH_SIZE = 500
+
+# Order lifecycle, in order
+ORDER_STATUSES = ('placed', 'pickup', 'processing', 'delivery', 'completed')
+
+# Orders a driver still has to collect
+DISPATCH_STATUSES = ('placed', 'pickup')
+
+# Columns selected by Order.query_with_details
+DETAIL_COLUMNS = [
+    'id', 'customer_id', 'service_id', 'location_id', 'weight', 'total_price',
+    'status', 'pickup_date', 'pickup_time', 'created_at', 'customer_name'
+]
+
+# Columns written by order exports, and the customer columns an export can
+# add (as customer_<column>)
+EXPORT_COLUMNS = [
+    'id', 'customer_id', 'service_id', 'location_id', 'weight', 'total_price',
+    'status', 'pickup_date', 'pickup_time', 'special_instructions', 'created_at'
+]
+EXPORT_CUSTOMER_COLUMNS = ['name', 'phone', 'email']
+
+# Julian day number of 1970-01-01, for turning timestamps into day numbers
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+MINUTES_PER_DAY = 1440
+
+# A streamed order listing row: the selected columns plus the service
+# details filled in from the catalog cache
+OrderDetails = namedtuple('OrderDetails', DETAIL_COLUMNS + ['service_name', 'service_unit'])
+
 class Order(Base):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Serves find_ids_for_pickup: a day's orders, optionally one window
+        Index('ix_orders_pickup_date_pickup_time', 'pickup_date', 'pickup_time'),
+        # Serves per-branch listings and reports over a date range
+        Index('ix_orders_location_id_created_at', 'location_id', 'created_at'),
+        # Ids are never reused, so a new order can't take the id of one
+        # already moved to orders_archive
+        {'sqlite_autoincrement': True},
+    )
     
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey('customers.id'), nullable=False)
+    customer_id = Column(Integer, ForeignKey('customers.id'), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey('services.id'), nullable=False)
-    weight = Column(Float, nullable=False)
+    location_id = Column(Integer, ForeignKey('locations.id'))  # branch handling the order
+    _weight = Column('weight', Float, nullable=False)
     total_price = Column(Float, nullable=False)
-    status = Column(String, default='placed')
-    pickup_date = Column(Date, nullable=False)
+    status = Column(String, default='placed', index=True)
+    _pickup_date = Column('pickup_date', Date, nullable=False)
     pickup_time = Column(String, nullable=False)  # 'morning', 'afternoon', 'evening'
     special_instructions = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     customer = relationship("Customer", back_populates="orders")
     service = relationship("Service", back_populates="orders")
+    location = relationship("Location", back_populates="orders")
     status_history = relationship("OrderStatusHistory", back_populates="order", cascade="all, delete-orphan")
     
     # Property methods
@@ -34,9 +85,7 @@ class Order(Base):
         
     @weight.setter
     def weight(self, value):
-        if not isinstance(value, (int, float)) or value <= 0:
-            raise ValueError("Weight must be a positive number")
-        self._weight = value
+        self._weight = self.validate_weight(value)
     
     @property
     def pickup_date(self):
@@ -44,6 +93,21 @@ class Order(Base):
         
     @pickup_date.setter
     def pickup_date(self, value):
+        self._pickup_date = self.validate_pickup_date(value)
+    
+    # Expose the validated properties as mapped attributes
+    weight = synonym('_weight', descriptor=weight)
+    pickup_date = synonym('_pickup_date', descriptor=pickup_date)
+    
+    # Validators shared by the property setters and bulk_create
+    @staticmethod
+    def validate_weight(value):
+        if not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError("Weight must be a positive number")
+        return value
+    
+    @staticmethod
+    def validate_pickup_date(value):
         # Ensure pickup date is not in the past
         if isinstance(value, str):
             value = datetime.strptime(value, '%Y-%m-%d').date()
@@ -51,19 +115,21 @@ class Order(Base):
         if value < date.today():
             raise ValueError("Pickup date cannot be in the past")
         
-        self._pickup_date = value
+        return value
     
     # ORM methods
     @classmethod
-    def create(cls, session, customer_id, service_id, weight, pickup_date, pickup_time, special_instructions=None):
+    def create(cls, session, customer_id, service_id, weight, pickup_date, pickup_time, special_instructions=None, location_id=None):
         # Calculate total price based on service price and weight
-        service = session.query(Service).filter_by(id=service_id).first()
+        service = Service.get_cached(session, service_id)
         if not service:
             raise ValueError("Invalid service ID")
         
+        weight = cls.validate_weight(weight)
         total_price = service.price_per_unit * weight
         
-        # Create order
+        # Create order; its setters validate the rest before anything is
+        # written
         order = cls(
             customer_id=customer_id,
             service_id=service_id,
@@ -72,12 +138,21 @@ class Order(Base):
             pickup_date=pickup_date,
             pickup_time=pickup_time,
             special_instructions=special_instructions,
+            location_id=location_id,
             status='placed'
         )
         
+        # Take a place in the pickup slot before adding the order; the
+        # slot's conditional update is what stops two clerks overbooking it
+        if not PickupSlot.book(session, order.pickup_date, pickup_time, location_id):
+            session.rollback()
+            raise slot_full_error(order.pickup_date, pickup_time)
+        
         session.add(order)
         session.flush()  # Flush to get the order ID
         
+        DailyOrderSummary.add_order(session, *order.summary_values())
+        
         # Create initial status history entry
         history_entry = OrderStatusHistory(
             order_id=order.id,
@@ -89,10 +164,184 @@ class Order(Base):
         session.commit()
         return order
     
+    @classmethod
+    def bulk_create(cls, session, rows):
+        # Create many orders in one transaction. Each row is a dict with the
+        # same keys as create(). Invalid rows are skipped and reported rather
+        # than aborting the batch.
+        #
+        # Returns (order_ids, errors): the ids of the created orders in input
+        # order, and a list of (row_index, message) for rejected rows. Each
+        # pickup slot is booked once for all its rows; when it hasn't room
+        # for all of them, the rows that come first get its places and only
+        # the rest are rejected.
+        rows = list(rows)
+        
+        # Price every row from one lookup of the service catalog, and check
+        # customers with one query
+        customer_ids = {row.get('customer_id') for row in rows}
+        prices = {id: service.price_per_unit for id, service in Service.get_catalog(session).items()}
+        known_customers = {id for (id,) in session.query(Customer.id).filter(Customer.id.in_(customer_ids)).all()}
+        known_locations = {id for (id,) in session.query(Location.id).all()}
+        
+        now = datetime.utcnow()
+        order_params = []
+        row_indexes = []
+        errors = []
+        
+        for index, row in enumerate(rows):
+            try:
+                if row.get('customer_id') not in known_customers:
+                    raise ValueError("Invalid customer ID")
+                if row.get('service_id') not in prices:
+                    raise ValueError("Invalid service ID")
+                if row.get('location_id') is not None and row['location_id'] not in known_locations:
+                    raise ValueError("Invalid location ID")
+                if row.get('pickup_time') not in PICKUP_TIMES:
+                    raise ValueError(f"Pickup time must be one of: {', '.join(PICKUP_TIMES)}")
+                
+                weight = cls.validate_weight(row.get('weight'))
+                pickup_date = cls.validate_pickup_date(row.get('pickup_date'))
+            except (ValueError, TypeError) as e:
+                errors.append((index, str(e)))
+                continue
+            
+            order_params.append({
+                'customer_id': row['customer_id'],
+                'service_id': row['service_id'],
+                'location_id': row.get('location_id'),
+                'weight': weight,
+                'total_price': prices[row['service_id']] * weight,
+                'status': 'placed',
+                'pickup_date': pickup_date,
+                'pickup_time': row['pickup_time'],
+                'special_instructions': row.get('special_instructions'),
+                'created_at': now
+            })
+            row_indexes.append(index)
+        
+        orders = cls.__table__
+        history = OrderStatusHistory.__table__
+        order_ids = []
+        
+        try:
+            slots = {}
+            for params, index in zip(order_params, row_indexes):
+                slots.setdefault((params['pickup_date'], params['pickup_time'], params['location_id']), []).append(index)
+            
+            rejected = set()
+            for slot, indexes in slots.items():
+                booked = PickupSlot.book_up_to(session, *slot, count=len(indexes))
+                overflow = indexes[booked:]
+                rejected.update(overflow)
+                errors.extend((index, str(slot_full_error(*slot[:2]))) for index in overflow)
+            if rejected:
+                order_params = [params for params, index in zip(order_params, row_indexes) if index not in rejected]
+                errors.sort()
+            
+            for start in range(0, len(order_params), BULK_BATCH_SIZE):
+                batch = order_params[start:start + BULK_BATCH_SIZE]
+                
+                # One multi-row INSERT per batch. SQLite can't guarantee the
+                # order of RETURNING rows, and asking SQLAlchemy to sort them
+                # (sort_by_parameter_order) makes it insert row by row.
+                # Instead, rely on SQLite numbering the rows of one statement
+                # in VALUES order, under the write lock this transaction
+                # holds: the sorted ids line up with the batch.
+                result = session.execute(insert(orders).returning(orders.c.id), batch)
+                batch_ids = sorted(result.scalars().all())
+                
+                # Initial 'placed' history rows for the whole batch
+                session.execute(
+                    insert(history),
+                    [{'order_id': id, 'status': 'placed', 'timestamp': now} for id in batch_ids]
+                )
+                order_ids.extend(batch_ids)
+                
+                # One summary update per branch and service rather than per order
+                totals = {}
+                for params in batch:
+                    key = (params['location_id'], params['service_id'])
+                    count, weight, revenue = totals.get(key, (0, 0, 0))
+                    totals[key] = (count + 1, weight + params['weight'], revenue + params['total_price'])
+                DailyOrderSummary.add_many(session, [
+                    (now.date(), location_id, 'placed', service_id, count, weight, revenue)
+                    for (location_id, service_id), (count, weight, revenue) in totals.items()
+                ])
+            
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        
+        return order_ids, errors
+    
+    @classmethod
+    def bulk_update_status(cls, session, order_ids, new_status):
+        # Move many orders to new_status in one transaction: a set-based
+        # UPDATE, one batched history insert and one summary adjustment per
+        # (day, branch, old status, service) group. Orders already in new_status are
+        # skipped. Returns the ids of the orders that changed.
+        if new_status not in ORDER_STATUSES:
+            raise ValueError(f"Status must be one of: {', '.join(ORDER_STATUSES)}")
+        
+        orders = cls.__table__
+        history = OrderStatusHistory.__table__
+        order_ids = list(dict.fromkeys(order_ids))
+        now = datetime.utcnow()
+        updated_ids = []
+        
+        try:
+            for start in range(0, len(order_ids), BULK_BATCH_SIZE):
+                batch = order_ids[start:start + BULK_BATCH_SIZE]
+                
+                # The orders that will change, with what the summary needs
+                rows = session.execute(
+                    select(orders.c.id, orders.c.created_at, orders.c.location_id, orders.c.status, orders.c.service_id, orders.c.weight, orders.c.total_price)
+                    .where(orders.c.id.in_(batch), orders.c.status != new_status)
+                ).all()
+                if not rows:
+                    continue
+                
+                ids = [row.id for row in rows]
+                session.execute(update(orders).where(orders.c.id.in_(ids)).values(status=new_status))
+                session.execute(
+                    insert(history),
+                    [{'order_id': id, 'status': new_status, 'timestamp': now} for id in ids]
+                )
+                
+                totals = {}
+                for row in rows:
+                    if row.created_at is None:
+                        continue
+                    key = (row.created_at.date(), row.location_id, row.status, row.service_id)
+                    count, weight, revenue = totals.get(key, (0, 0, 0))
+                    totals[key] = (count + 1, weight + row.weight, revenue + row.total_price)
+                
+                changes = []
+                for (day, location_id, status, service_id), (count, weight, revenue) in totals.items():
+                    changes.append((day, location_id, status, service_id, -count, -weight, -revenue))
+                    changes.append((day, location_id, new_status, service_id, count, weight, revenue))
+                DailyOrderSummary.add_many(session, changes)
+                
+                updated_ids.extend(ids)
+            
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        
+        return updated_ids
+    
     @classmethod
     def get_all(cls, session):
         return session.query(cls).all()
     
+    @classmethod
+    def get_page(cls, session, after_id=None, before_id=None, page_size=None, **filters):
+        query = session.query(cls).filter_by(**filters)
+        return keyset_page(query, cls.id, after_id, before_id, page_size)
+    
     @classmethod
     def find_by_id(cls, session, id):
         return session.query(cls).filter_by(id=id).first()
@@ -105,6 +354,241 @@ class Order(Base):
     def find_by_status(cls, session, status):
         return session.query(cls).filter_by(status=status).all()
     
+    @classmethod
+    def find_ids_for_pickup(cls, session, pickup_date, pickup_time=None, status=None):
+        # Ids of the orders due for pickup on a day, optionally in one
+        # pickup window and/or status
+        if isinstance(pickup_date, str):
+            pickup_date = datetime.strptime(pickup_date, '%Y-%m-%d').date()
+        
+        query = session.query(cls.id).filter(cls.pickup_date == pickup_date)
+        if pickup_time is not None:
+            query = query.filter(cls.pickup_time == pickup_time)
+        if status is not None:
+            query = query.filter(cls.status == status)
+        
+        return [id for (id,) in query.order_by(cls.id)]
+    
+    @classmethod
+    def find_for_dispatch(cls, session, pickup_date, pickup_time, location_id=None, statuses=DISPATCH_STATUSES):
+        # Orders still to be collected in one pickup window, with the
+        # customer's name, phone and address, in one query on the pickup index
+        if isinstance(pickup_date, str):
+            pickup_date = datetime.strptime(pickup_date, '%Y-%m-%d').date()
+        if pickup_time not in PICKUP_TIMES:
+            raise ValueError(f"Pickup time must be one of: {', '.join(PICKUP_TIMES)}")
+        
+        query = (
+            session.query(
+                cls.id, cls.customer_id, cls.service_id, cls.location_id, cls.weight, cls.status,
+                cls.special_instructions, Customer.name.label('customer_name'), Customer.phone, Customer.address
+            )
+            .join(Customer, Customer.id == cls.customer_id)
+            .filter(cls.pickup_date == pickup_date, cls.pickup_time == pickup_time, cls.status.in_(statuses))
+        )
+        return cls._apply_filters(query, location_id=location_id).all()
+    
+    @classmethod
+    def source(cls, include_archived=False):
+        # What reports query: the orders table, or with include_archived the
+        # orders and archived orders together, under the same attribute names
+        if not include_archived:
+            return cls
+        
+        columns = [column.name for column in cls.__table__.columns]
+        archived = ArchivedOrder.__table__
+        orders = select(cls.__table__).union_all(select(*[archived.c[name] for name in columns])).subquery('all_orders')
+        return aliased(cls, orders, adapt_on_names=True)
+    
+    @classmethod
+    def query_with_details(cls, session, customer_id=None, status=None, created_from=None, created_before=None, location_id=None, include_archived=False, source=None):
+        # Orders joined to their customer in a single statement. Rows carry
+        # plain column values rather than ORM objects. Callers that add their
+        # own conditions pass the source they will use for them.
+        if source is None:
+            source = cls.source(include_archived)
+        query = session.query(
+            *[getattr(source, column) for column in DETAIL_COLUMNS[:-1]],
+            Customer.name.label('customer_name')
+        ).join(Customer, source.customer_id == Customer.id)
+        
+        query = cls._apply_filters(query, customer_id, status, created_from, created_before, location_id, source)
+        return query.order_by(source.id)
+    
+    @classmethod
+    def stream_with_details(cls, session, chunk_size=STREAM_CHUNK_SIZE, **filters):
+        # Iterate order listing rows, fetching chunk_size rows at a time so
+        # large listings are printed in constant memory
+        rows = cls.query_with_details(session, **filters).yield_per(chunk_size)
+        return cls._with_service_details(session, rows)
+    
+    @classmethod
+    def stream_for_export(cls, session, with_customer=False, after_id=None, chunk_size=STREAM_CHUNK_SIZE, **filters):
+        # Lists of up to chunk_size export rows in id order, starting after
+        # after_id. All rows come from one cursor read chunk_size at a time,
+        # so memory stays flat however many orders there are.
+        columns = [getattr(cls, column) for column in EXPORT_COLUMNS]
+        if with_customer:
+            columns += [getattr(Customer, column).label(f'customer_{column}') for column in EXPORT_CUSTOMER_COLUMNS]
+        
+        query = select(*columns)
+        if with_customer:
+            query = query.join(Customer, cls.customer_id == Customer.id)
+        query = cls._apply_filters(query, **filters)
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        
+        result = session.execute(query.order_by(cls.id).execution_options(yield_per=chunk_size))
+        return result.partitions()
+    
+    @classmethod
+    def stream_for_analytics(cls, session, include_archived=False, **filters):
+        # (day, service_id, customer_id, weight, total_price, status_index)
+        # tuples for every matching order, read straight off the database
+        # cursor so they can be bulk-loaded into arrays. day counts days since
+        # 1970-01-01 and status_index is the position in ORDER_STATUSES.
+        source = cls.source(include_archived)
+        day = cast(func.julianday(source.created_at) - UNIX_EPOCH_JULIAN_DAY, Integer)
+        status_index = case({status: index for index, status in enumerate(ORDER_STATUSES)}, value=source.status, else_=-1)
+        query = select(day, source.service_id, source.customer_id, source.weight, source.total_price, status_index)
+        
+        result = session.connection().execute(cls._apply_filters(query, source=source, **filters))
+        try:
+            yield from result.cursor
+        finally:
+            result.close()
+    
+    @classmethod
+    def get_page_with_details(cls, session, after_id=None, before_id=None, page_size=None, include_archived=False, **filters):
+        # One keyset page of order listing rows. The page is keyed on the id
+        # of whatever the query selects from, which with include_archived is
+        # the union of live and archived orders.
+        source = cls.source(include_archived)
+        query = cls.query_with_details(session, source=source, **filters)
+        rows = keyset_page(query, source.id, after_id, before_id, page_size)
+        return list(cls._with_service_details(session, rows))
+    
+    @classmethod
+    def _with_service_details(cls, session, rows):
+        # Service names come from the catalog cache rather than the database
+        catalog = Service.get_catalog(session)
+        
+        for row in rows:
+            service = catalog.get(row.service_id)
+            yield OrderDetails(
+                *row,
+                service_name=service.name if service else None,
+                service_unit=service.unit if service else None
+            )
+    
+    @classmethod
+    def summarize(cls, session, by=('status',), customer_id=None, status=None, created_from=None, created_before=None, location_id=None, include_archived=False):
+        # Order counts, weight and revenue per group, computed by the database
+        # in a single GROUP BY query. `by` may contain 'status', 'service',
+        # 'customer' and 'location'.
+        source = cls.source(include_archived)
+        group_columns = []
+        for key in by:
+            if key == 'status':
+                group_columns.append(source.status)
+            elif key == 'service':
+                group_columns.extend([source.service_id, Service.name.label('service_name')])
+            elif key == 'customer':
+                group_columns.extend([source.customer_id, Customer.name.label('customer_name')])
+            elif key == 'location':
+                group_columns.append(source.location_id)
+            else:
+                raise ValueError(f"Cannot group orders by '{key}'")
+        
+        query = session.query(
+            *group_columns,
+            func.count(source.id).label('order_count'),
+            func.coalesce(func.sum(source.weight), 0).label('total_weight'),
+            func.coalesce(func.sum(source.total_price), 0).label('total_revenue')
+        )
+        
+        if 'service' in by:
+            query = query.join(Service, source.service_id == Service.id)
+        if 'customer' in by:
+            query = query.join(Customer, source.customer_id == Customer.id)
+        
+        query = cls._apply_filters(query, customer_id, status, created_from, created_before, location_id, source)
+        
+        if group_columns:
+            query = query.group_by(*group_columns)
+        
+        return query.all()
+    
+    @classmethod
+    def stage_duration_histogram(cls, session, include_archived=False, **filters):
+        # How long orders spent in each status before their next change, as
+        # (service_id, stage, minute, transitions, total_minutes,
+        # longest_minutes) rows: one per whole minute of time spent that
+        # occurs. LAG over each order's history pairs every change with the
+        # one before it, and the database aggregates, so only the histogram
+        # leaves it however much history there is.
+        source = cls.source(include_archived)
+        history = OrderStatusHistory.source(include_archived)
+        window = {'partition_by': history.order_id, 'order_by': (history.timestamp, history.id)}
+        previous_change = func.lag(history.timestamp).over(**window)
+        
+        transitions = cls._apply_filters(
+            select(
+                source.service_id,
+                func.lag(history.status).over(**window).label('stage'),
+                ((func.julianday(history.timestamp) - func.julianday(previous_change)) * MINUTES_PER_DAY).label('minutes')
+            ).join(source, source.id == history.order_id),
+            source=source,
+            **filters
+        ).subquery()
+        
+        minute = cast(transitions.c.minutes, Integer).label('minute')
+        query = (
+            select(
+                transitions.c.service_id,
+                transitions.c.stage,
+                minute,
+                func.count().label('transitions'),
+                func.sum(transitions.c.minutes).label('total_minutes'),
+                func.max(transitions.c.minutes).label('longest_minutes')
+            )
+            .where(transitions.c.stage.isnot(None))
+            .group_by(transitions.c.service_id, transitions.c.stage, minute)
+        )
+        return session.execute(query).all()
+    
+    @classmethod
+    def stream_stuck(cls, session, changed_before, chunk_size=STREAM_CHUNK_SIZE, **filters):
+        # Unfinished orders whose status last changed before changed_before,
+        # longest waiting first
+        status_since = func.max(OrderStatusHistory.timestamp).label('status_since')
+        query = cls._apply_filters(
+            select(cls.id, cls.customer_id, cls.service_id, cls.location_id, cls.status, status_since)
+            .join(OrderStatusHistory, OrderStatusHistory.order_id == cls.id)
+            .where(cls.status.in_(ORDER_STATUSES[:-1])),
+            **filters
+        )
+        query = query.group_by(cls.id).having(status_since < changed_before).order_by(status_since)
+        return session.execute(query.execution_options(yield_per=chunk_size))
+    
+    @classmethod
+    def _apply_filters(cls, query, customer_id=None, status=None, created_from=None, created_before=None, location_id=None, source=None):
+        # source is the entity being filtered, when it isn't the orders table
+        source = source or cls
+        if customer_id is not None:
+            query = query.filter(source.customer_id == customer_id)
+        if location_id == NO_LOCATION:
+            query = query.filter(source.location_id.is_(None))
+        elif location_id is not None:
+            query = query.filter(source.location_id == location_id)
+        if status is not None:
+            query = query.filter(source.status == status)
+        if created_from is not None:
+            query = query.filter(source.created_at >= created_from)
+        if created_before is not None:
+            query = query.filter(source.created_at < created_before)
+        return query
+    
     @classmethod
     def update(cls, session, id, **kwargs):
         order = cls.find_by_id(session, id)
@@ -121,10 +605,28 @@ class Order(Base):
             )
             session.add(history_entry)
         
+        before = order.summary_values()
+        slot_before = order.slot_values()
+        
         for key, value in kwargs.items():
             if hasattr(order, key):
                 setattr(order, key, value)
         
+        # Rescheduled: book the new pickup slot before giving up the old one
+        slot_after = order.slot_values()
+        if slot_after != slot_before:
+            if not PickupSlot.book(session, *slot_after):
+                session.rollback()
+                raise slot_full_error(*slot_after[:2])
+            PickupSlot.release(session, *slot_before)
+        
+        # Move the order between summary rows if its status, service or
+        # amounts changed
+        after = order.summary_values()
+        if after != before:
+            DailyOrderSummary.add_order(session, *before, sign=-1)
+            DailyOrderSummary.add_order(session, *after)
+        
         session.commit()
         return order
     
@@ -134,9 +636,19 @@ class Order(Base):
         if not order:
             return False
         
+        DailyOrderSummary.add_order(session, *order.summary_values(), sign=-1)
+        PickupSlot.release(session, *order.slot_values())
         session.delete(order)
         session.commit()
         return True
     
+    def summary_values(self):
+        # The fields DailyOrderSummary aggregates, as add_order arguments
+        return (self.created_at, self.location_id, self.status, self.service_id, self.weight, self.total_price)
+    
+    def slot_values(self):
+        # The pickup slot the order has a place in, as PickupSlot.book arguments
+        return (self.pickup_date, self.pickup_time, self.location_id)
+    
     def __repr__(self):
         return f"<Order id={self.id} customer_id={self.customer_id} status={self.status}>"
\ No newline at end of file
@@ -1,13 +1,20 @@
 # lib/models/order_status_history.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, select
+from sqlalchemy.orm import aliased, relationship
 from datetime import datetime
 
+from .archive import ArchivedOrderStatusHistory
 from .base import Base
 
 class OrderStatusHistory(Base):
     __tablename__ = 'order_status_history'
+    __table_args__ = (
+        # Serves get_all_by_order: filter on order_id, ordered by timestamp
+        Index('ix_order_status_history_order_id_timestamp', 'order_id', 'timestamp'),
+        # Ids are never reused, as with orders, so archived rows keep theirs
+        {'sqlite_autoincrement': True},
+    )
     
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
@@ -18,9 +25,34 @@ class OrderStatusHistory(Base):
     order = relationship("Order", back_populates="status_history")
     
     # ORM methods
+    @classmethod
+    def source(cls, include_archived=False):
+        # The history table, or with include_archived the history of live and
+        # archived orders together, like Order.source
+        if not include_archived:
+            return cls
+        
+        archived = ArchivedOrderStatusHistory.__table__
+        history = select(cls.__table__).union_all(select(*[archived.c[column.name] for column in cls.__table__.columns])).subquery('all_history')
+        return aliased(cls, history, adapt_on_names=True)
+    
     @classmethod
     def get_all_by_order(cls, session, order_id):
         return session.query(cls).filter_by(order_id=order_id).order_by(cls.timestamp).all()
     
+    @classmethod
+    def get_all_by_orders(cls, session, order_ids):
+        # Status changes for many orders in one query, as
+        # {order_id: [(status, timestamp), ...]} in time order
+        history = {}
+        rows = (
+            session.query(cls.order_id, cls.status, cls.timestamp)
+            .filter(cls.order_id.in_(order_ids))
+            .order_by(cls.order_id, cls.timestamp)
+        )
+        for order_id, status, timestamp in rows:
+            history.setdefault(order_id, []).append((status, timestamp))
+        return history
+    
     def __repr__(self):
         return f"<OrderStatusHistory id={self.id} order_id={self.order_id} status={self.status}>"
\ No newline at end of file
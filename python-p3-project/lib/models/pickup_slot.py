@@ -0,0 +1,233 @@
+# lib/models/pickup_slot.py
+
+from sqlalchemy import Column, Integer, String, Date, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from .base import Base
+from .daily_order_summary import NO_LOCATION
+from .location import Location
+
+PICKUP_TIMES = ('morning', 'afternoon', 'evening')
+
+# Hour each window ends (8-12, 12-4, 4-8), so today's past windows aren't
+# offered
+PICKUP_WINDOW_ENDS = {'morning': 12, 'afternoon': 16, 'evening': 20}
+
+# Orders a branch can pick up in one window, unless the branch or the slot
+# sets its own capacity
+DEFAULT_SLOT_CAPACITY = 20
+
+# How many free slots order entry offers, and how far ahead it looks
+NEXT_FREE_SLOTS = 5
+SLOT_SEARCH_DAYS = 30
+
+# A slot's bookings against its capacity
+SlotAvailability = namedtuple('SlotAvailability', ['pickup_date', 'pickup_time', 'location_id', 'booked', 'capacity'])
+
+def slot_full_error(pickup_date, pickup_time):
+    return ValueError(f"The {pickup_time} pickup slot on {pickup_date} is full")
+
+class PickupSlot(Base):
+    __tablename__ = 'pickup_slots'
+
+    # Orders booked into each pickup window per branch and day. The Order
+    # write methods book and release places in the same transaction as the
+    # order change. Booking is one conditional UPDATE, so two clerks can't
+    # both take a slot's last place, and checking a slot reads one row by
+    # primary key. Orders without a branch book under NO_LOCATION.
+    location_id = Column(Integer, primary_key=True, default=NO_LOCATION)
+    pickup_date = Column(Date, primary_key=True)
+    pickup_time = Column(String, primary_key=True)
+    booked = Column(Integer, nullable=False, default=0)
+    capacity = Column(Integer)  # None means the branch's capacity
+
+    # Helpers
+    @staticmethod
+    def slot_key(pickup_date, pickup_time, location_id):
+        if pickup_time not in PICKUP_TIMES:
+            raise ValueError(f"Pickup time must be one of: {', '.join(PICKUP_TIMES)}")
+        if isinstance(pickup_date, str):
+            pickup_date = datetime.strptime(pickup_date, '%Y-%m-%d').date()
+        return {
+            'location_id': location_id if location_id is not None else NO_LOCATION,
+            'pickup_date': pickup_date,
+            'pickup_time': pickup_time
+        }
+
+    @classmethod
+    def matching(cls, key):
+        table = cls.__table__
+        return [table.c[column] == value for column, value in key.items()]
+
+    @classmethod
+    def effective_capacity(cls):
+        # The slot's own capacity, else its branch's, else the default
+        table = cls.__table__
+        branch_capacity = select(Location.slot_capacity).where(Location.id == table.c.location_id).scalar_subquery()
+        return func.coalesce(table.c.capacity, branch_capacity, DEFAULT_SLOT_CAPACITY)
+
+    @classmethod
+    def branch_capacity(cls, session, location_id):
+        capacity = None
+        if location_id is not None and location_id != NO_LOCATION:
+            capacity = session.execute(select(Location.slot_capacity).where(Location.id == location_id)).scalar()
+        return capacity if capacity is not None else DEFAULT_SLOT_CAPACITY
+
+    # ORM methods
+    @classmethod
+    def book(cls, session, pickup_date, pickup_time, location_id=None, count=1):
+        # Take count places in a slot if it has room for all of them, and
+        # return whether it did. Doesn't commit; the booking is part of the
+        # caller's transaction.
+        key = cls.slot_key(pickup_date, pickup_time, location_id)
+        table = cls.__table__
+
+        session.execute(insert(table).values(**key, booked=0).on_conflict_do_nothing())
+        result = session.execute(
+            update(table)
+            .where(*cls.matching(key), table.c.booked + count <= cls.effective_capacity())
+            .values(booked=table.c.booked + count)
+        )
+        return result.rowcount == 1
+
+    @classmethod
+    def book_up_to(cls, session, pickup_date, pickup_time, location_id=None, count=1):
+        # Take as many of count places as the slot has room for, and return
+        # how many it took. The UPDATE only applies if no one booked since
+        # the read, like book's, so places are never taken twice. Doesn't
+        # commit.
+        key = cls.slot_key(pickup_date, pickup_time, location_id)
+        table = cls.__table__
+
+        session.execute(insert(table).values(**key, booked=0).on_conflict_do_nothing())
+        while True:
+            booked, capacity = session.execute(select(table.c.booked, cls.effective_capacity()).where(*cls.matching(key))).one()
+            taken = max(0, min(count, capacity - booked))
+            if not taken:
+                return 0
+            result = session.execute(
+                update(table)
+                .where(*cls.matching(key), table.c.booked == booked)
+                .values(booked=booked + taken)
+            )
+            if result.rowcount == 1:
+                return taken
+
+    @classmethod
+    def release(cls, session, pickup_date, pickup_time, location_id=None, count=1):
+        # Give back count places, when an order is deleted or moved. Doesn't
+        # commit.
+        key = cls.slot_key(pickup_date, pickup_time, location_id)
+        table = cls.__table__
+        session.execute(update(table).where(*cls.matching(key)).values(booked=func.max(table.c.booked - count, 0)))
+
+    @classmethod
+    def release_orders(cls, session, orders):
+        # Give back the places of many Order objects, e.g. before a cascade
+        # delete removes them
+        counts = {}
+        for order in orders:
+            key = (order.pickup_date, order.pickup_time, order.location_id)
+            counts[key] = counts.get(key, 0) + 1
+
+        for (pickup_date, pickup_time, location_id), count in counts.items():
+            cls.release(session, pickup_date, pickup_time, location_id, count)
+
+    @classmethod
+    def availability(cls, session, pickup_date, pickup_time, location_id=None):
+        key = cls.slot_key(pickup_date, pickup_time, location_id)
+        table = cls.__table__
+        row = session.execute(select(table.c.booked, cls.effective_capacity()).where(*cls.matching(key))).first()
+        booked, capacity = row if row else (0, cls.branch_capacity(session, location_id))
+        return SlotAvailability(key['pickup_date'], pickup_time, location_id, booked, capacity)
+
+    @classmethod
+    def next_free(cls, session, location_id=None, start=None, count=NEXT_FREE_SLOTS, days=SLOT_SEARCH_DAYS):
+        # The first count slots with room from start (default today), in date
+        # and window order, leaving out windows that are already over. The
+        # branch's slots in the range are read in one primary key range scan;
+        # days without a row are empty.
+        now = datetime.now()
+        start = max(start or now.date(), now.date())
+        table = cls.__table__
+        default = cls.branch_capacity(session, location_id)
+
+        rows = session.execute(
+            select(table.c.pickup_date, table.c.pickup_time, table.c.booked, table.c.capacity)
+            .where(
+                table.c.location_id == (location_id if location_id is not None else NO_LOCATION),
+                table.c.pickup_date >= start,
+                table.c.pickup_date < start + timedelta(days=days)
+            )
+        ).all()
+        slots = {
+            (row.pickup_date, row.pickup_time): (row.booked, row.capacity if row.capacity is not None else default)
+            for row in rows
+        }
+
+        free = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            for pickup_time in PICKUP_TIMES:
+                if day == now.date() and now.hour >= PICKUP_WINDOW_ENDS[pickup_time]:
+                    continue
+                booked, capacity = slots.get((day, pickup_time), (0, default))
+                if booked < capacity:
+                    free.append(SlotAvailability(day, pickup_time, location_id, booked, capacity))
+                    if len(free) == count:
+                        return free
+        return free
+
+    @classmethod
+    def set_capacity(cls, session, pickup_date, pickup_time, location_id=None, capacity=None):
+        # Give one slot its own capacity, or go back to the branch's with None.
+        # A slot can't be set below what is already booked into it.
+        if capacity is not None and capacity < 0:
+            raise ValueError("Capacity can't be negative")
+
+        key = cls.slot_key(pickup_date, pickup_time, location_id)
+        table = cls.__table__
+        statement = insert(table).values(**key, booked=0, capacity=capacity)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.location_id, table.c.pickup_date, table.c.pickup_time],
+            set_={'capacity': statement.excluded.capacity}
+        ))
+
+        slot = cls.availability(session, pickup_date, pickup_time, location_id)
+        if slot.booked > slot.capacity:
+            session.rollback()
+            raise ValueError(f"{slot.booked} orders are already booked into this slot")
+
+        session.commit()
+        return slot
+
+    @classmethod
+    def rebuild(cls, session):
+        # Recount every slot's bookings from the orders table, keeping the
+        # capacities set. Needed after writes that bypass the Order methods,
+        # e.g. the data generator. Archived orders no longer count, but their
+        # pickup dates are long past.
+        orders = cls.metadata.tables['orders']
+        table = cls.__table__
+        location_id = func.coalesce(orders.c.location_id, NO_LOCATION)
+
+        session.execute(update(table).values(booked=0))
+        statement = insert(table).from_select(
+            ['location_id', 'pickup_date', 'pickup_time', 'booked'],
+            select(location_id, orders.c.pickup_date, orders.c.pickup_time, func.count())
+            .where(orders.c.pickup_date.isnot(None))
+            .group_by(location_id, orders.c.pickup_date, orders.c.pickup_time)
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.location_id, table.c.pickup_date, table.c.pickup_time],
+            set_={'booked': statement.excluded.booked}
+        ))
+        session.execute(delete(table).where(table.c.booked == 0, table.c.capacity.is_(None)))
+        session.commit()
+
+        return session.query(func.count()).select_from(table).scalar()
+
+    def __repr__(self):
+        return f"<PickupSlot location_id={self.location_id} pickup_date={self.pickup_date} pickup_time={self.pickup_time} booked={self.booked}>"
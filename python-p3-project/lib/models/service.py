@@ -1,10 +1,58 @@
 # lib/models/service.py
 
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, event
+from sqlalchemy.orm import relationship, synonym
+from collections import namedtuple
 from datetime import datetime
 
-from .base import Base
+from .base import Base, keyset_page
+
+# Immutable snapshot of a service held by the catalog cache. Unlike an ORM
+# instance it can be shared across sessions safely.
+ServiceInfo = namedtuple('ServiceInfo', ['id', 'name', 'description', 'price_per_unit', 'unit'])
+
+class ServiceCatalogCache:
+    # Read-through, in-process cache of the whole service catalog. The
+    # catalog is small, so a miss reloads all of it in one query.
+    def __init__(self):
+        self.by_id = None
+        self.by_name = None
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self, session):
+        rows = session.query(
+            Service.id, Service.name, Service.description, Service.price_per_unit, Service.unit
+        ).all()
+        self.by_id = {row.id: ServiceInfo(*row) for row in rows}
+        self.by_name = {info.name: info for info in self.by_id.values()}
+    
+    def lookup(self, session, index, key):
+        if self.by_id is not None and key in getattr(self, index):
+            self.hits += 1
+            return getattr(self, index)[key]
+        
+        # Unknown key: the catalog may have changed since it was loaded
+        self.misses += 1
+        self.load(session)
+        return getattr(self, index).get(key)
+    
+    def catalog(self, session):
+        if self.by_id is None:
+            self.misses += 1
+            self.load(session)
+        else:
+            self.hits += 1
+        return self.by_id
+    
+    def invalidate(self):
+        self.by_id = None
+        self.by_name = None
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.by_id or {})}
+
+catalog_cache = ServiceCatalogCache()
 
 class Service(Base):
     __tablename__ = 'services'
@@ -12,7 +60,7 @@ class Service(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, unique=True)
     description = Column(Text)
-    price_per_unit = Column(Float, nullable=False)
+    _price_per_unit = Column('price_per_unit', Float, nullable=False)
     unit = Column(String, nullable=False)  # 'kg' or 'item'
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -30,18 +78,27 @@ class Service(Base):
             raise ValueError("Price must be a positive number")
         self._price_per_unit = value
     
+    # Expose the validated property as a mapped attribute
+    price_per_unit = synonym('_price_per_unit', descriptor=price_per_unit)
+    
     # ORM methods
     @classmethod
     def create(cls, session, name, price_per_unit, unit, description=None):
         service = cls(name=name, price_per_unit=price_per_unit, unit=unit, description=description)
         session.add(service)
         session.commit()
+        catalog_cache.invalidate()
         return service
     
     @classmethod
     def get_all(cls, session):
         return session.query(cls).all()
     
+    @classmethod
+    def get_page(cls, session, after_id=None, before_id=None, page_size=None, **filters):
+        query = session.query(cls).filter_by(**filters)
+        return keyset_page(query, cls.id, after_id, before_id, page_size)
+    
     @classmethod
     def find_by_id(cls, session, id):
         return session.query(cls).filter_by(id=id).first()
@@ -50,6 +107,29 @@ class Service(Base):
     def find_by_name(cls, session, name):
         return session.query(cls).filter_by(name=name).first()
     
+    # Cached catalog lookups. These return ServiceInfo snapshots, not ORM
+    # instances, so use find_by_id when the service is going to be changed.
+    @classmethod
+    def get_cached(cls, session, id):
+        return catalog_cache.lookup(session, 'by_id', id)
+    
+    @classmethod
+    def get_cached_by_name(cls, session, name):
+        return catalog_cache.lookup(session, 'by_name', name)
+    
+    @classmethod
+    def get_catalog(cls, session):
+        # All services keyed by id
+        return catalog_cache.catalog(session)
+    
+    @classmethod
+    def cache_stats(cls):
+        return catalog_cache.stats()
+    
+    @classmethod
+    def invalidate_cache(cls):
+        catalog_cache.invalidate()
+    
     @classmethod
     def update(cls, session, id, **kwargs):
         service = cls.find_by_id(session, id)
@@ -61,6 +141,7 @@ class Service(Base):
                 setattr(service, key, value)
         
         session.commit()
+        catalog_cache.invalidate()
         return service
     
     @classmethod
@@ -71,7 +152,16 @@ class Service(Base):
         
         session.delete(service)
         session.commit()
+        catalog_cache.invalidate()
         return True
     
     def __repr__(self):
-        return f"<Service id={self.id} name={self.name} price={self.price_per_unit}/{self.unit}>"
\ No newline at end of file
+        return f"<Service id={self.id} name={self.name} price={self.price_per_unit}/{self.unit}>"
+
+# Services written by any other path (seeding, direct session use) also
+# invalidate the cache
+@event.listens_for(Service, 'after_insert')
+@event.listens_for(Service, 'after_update')
+@event.listens_for(Service, 'after_delete')
+def invalidate_catalog_cache(mapper, connection, target):
+    catalog_cache.invalidate()
\ No newline at end of file
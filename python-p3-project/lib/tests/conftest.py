@@ -0,0 +1,42 @@
+# lib/tests/conftest.py
+#
+# Every test gets a freshly created database. LAUNDRY_DB_PATH is set before
+# the models are imported, so the module-level engine and Session, which the
+# import, export and archive jobs use, point at the test database too.
+
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+os.environ['LAUNDRY_DB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='laundry-tests-'), 'test.db')
+
+from models import Base, Session, engine, drop_tables, Customer, Service, Location
+from models.service import catalog_cache
+
+@pytest.fixture
+def session():
+    drop_tables()
+    Base.metadata.create_all(engine)
+    catalog_cache.invalidate()
+
+    session = Session()
+    yield session
+    session.close()
+
+@pytest.fixture
+def customer(session):
+    return Customer.create(session, "Jane Wanjiru", "0712345678", address="12 Thika Rd, Kasarani")
+
+@pytest.fixture
+def service(session):
+    return Service.create(session, "Wash & Fold", 150, 'kg')
+
+@pytest.fixture
+def location(session):
+    return Location.create(session, "Westlands", "1 Waiyaki Way", "0700000001")
+
+@pytest.fixture
+def tomorrow():
+    return date.today() + timedelta(days=1)
@@ -0,0 +1,48 @@
+# lib/tests/test_analytics.py
+
+import sys
+
+import pytest
+
+import analytics
+from models import Order, Service
+from models.order import ORDER_STATUSES
+from db import generate
+
+@pytest.fixture
+def generated(session, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['generate', '--customers', '200', '--seed', '3', '--reset'])
+    generate.main()
+    return session
+
+def test_array_totals_match_sql(generated):
+    session = generated
+    orders = analytics.load_orders(session)
+    (totals,) = Order.summarize(session, by=())
+
+    summary = analytics.summary(orders)
+
+    assert summary['order_count'] == totals.order_count > 0
+    assert summary['total_weight'] == pytest.approx(totals.total_weight)
+    assert summary['total_revenue'] == pytest.approx(totals.total_revenue)
+    assert {status: summary[status] for status in ORDER_STATUSES if summary[status]} == {
+        row.status: row.order_count for row in Order.summarize(session, by=('status',))
+    }
+    daily = analytics.revenue_by_day(orders)
+    assert sum(row['order_count'] for row in daily) == totals.order_count
+    assert sum(row['total_revenue'] for row in daily) == pytest.approx(totals.total_revenue)
+
+def test_service_totals_match_sql(generated):
+    session = generated
+    filters = {'status': 'completed'}
+    orders = analytics.load_orders(session, **filters)
+
+    rows = analytics.revenue_by_service(orders, Service.get_catalog(session))
+
+    expected = {row.service_id: row for row in Order.summarize(session, by=('service',), **filters)}
+    assert sorted(row['service_id'] for row in rows) == sorted(expected)
+    for row in rows:
+        sql = expected[row['service_id']]
+        assert (row['service_name'], row['order_count']) == (sql.service_name, sql.order_count)
+        assert row['total_weight'] == pytest.approx(sql.total_weight)
+        assert row['total_revenue'] == pytest.approx(sql.total_revenue)
@@ -0,0 +1,77 @@
+# lib/tests/test_archive.py
+
+import warnings
+from datetime import datetime, timedelta
+
+from models import Order, OrderStatusHistory, ArchivedOrder, ArchivedOrderStatusHistory, DailyOrderSummary
+from db.archive_orders import archive_orders
+from db.generate import next_id
+
+def summary_rows(session):
+    return sorted((row.date, row.status, row.order_count) for row in session.query(DailyOrderSummary))
+
+def completed_order(session, customer, service, pickup_date, age_days=400):
+    order = Order.create(session, customer.id, service.id, 2, pickup_date, 'morning')
+    Order.update(session, order.id, status='completed')
+    session.query(Order).filter_by(id=order.id).update({'created_at': datetime.utcnow() - timedelta(days=age_days)})
+    session.commit()
+    return order.id
+
+def test_archive_moves_old_completed_orders(session, customer, service, tomorrow):
+    old_id = completed_order(session, customer, service, tomorrow)
+    recent_id = completed_order(session, customer, service, tomorrow, age_days=10)
+    open_id = Order.create(session, customer.id, service.id, 2, tomorrow, 'morning').id
+    summary = summary_rows(session)
+
+    result = archive_orders(older_than_days=365, chunk_size=1, vacuum=False, verbose=False)
+
+    session.expire_all()
+    assert (result['orders'], result['history_rows']) == (1, 2)
+    assert [order.id for order in Order.get_all(session)] == [recent_id, open_id]
+    assert [order.id for order in ArchivedOrder.find_by_customer(session, customer.id)] == [old_id]
+    assert session.query(ArchivedOrderStatusHistory).filter_by(order_id=old_id).count() == 2
+    assert OrderStatusHistory.get_all_by_order(session, old_id) == []
+    assert summary_rows(session) == summary
+
+def test_reports_can_include_archived_orders(session, customer, service, tomorrow):
+    completed_order(session, customer, service, tomorrow)
+    archive_orders(older_than_days=365, vacuum=False, verbose=False)
+
+    assert Order.summarize(session, by=(), customer_id=customer.id)[0].order_count == 0
+    assert Order.summarize(session, by=(), customer_id=customer.id, include_archived=True)[0].order_count == 1
+
+def test_order_pages_can_include_archived_orders(session, customer, service, tomorrow):
+    archived_ids = [completed_order(session, customer, service, tomorrow) for _ in range(2)]
+    archive_orders(older_than_days=365, vacuum=False, verbose=False)
+    live_id = Order.create(session, customer.id, service.id, 2, tomorrow, 'morning').id
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        first = Order.get_page_with_details(session, page_size=2, include_archived=True)
+        second = Order.get_page_with_details(session, after_id=first[-1].id, page_size=2, include_archived=True)
+
+    assert [row.id for row in first] == archived_ids
+    assert [row.id for row in second] == [live_id]
+    assert [row.id for row in Order.get_page_with_details(session)] == [live_id]
+
+def test_new_orders_never_reuse_archived_ids(session, customer, service, tomorrow):
+    # Archive the newest order, so its id is the highest one used, then
+    # archive the order created after it
+    completed_order(session, customer, service, tomorrow)
+    newest_id = completed_order(session, customer, service, tomorrow)
+    archive_orders(older_than_days=365, vacuum=False, verbose=False)
+
+    next_id = completed_order(session, customer, service, tomorrow)
+    result = archive_orders(older_than_days=365, vacuum=False, verbose=False)
+
+    assert next_id > newest_id
+    assert result['orders'] == 1
+    assert session.query(ArchivedOrder).count() == 3
+    history_ids = [id for (id,) in session.query(ArchivedOrderStatusHistory.id)]
+    assert len(history_ids) == len(set(history_ids)) == 6
+
+def test_generator_numbers_orders_after_archived_ones(session, customer, service, tomorrow):
+    newest_id = completed_order(session, customer, service, tomorrow)
+    archive_orders(older_than_days=365, vacuum=False, verbose=False)
+
+    assert next_id(session, Order, ArchivedOrder) == newest_id + 1
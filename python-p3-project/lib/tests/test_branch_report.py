@@ -0,0 +1,36 @@
+# lib/tests/test_branch_report.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Customer, Order, Location
+from models.daily_order_summary import NO_LOCATION
+from branch_report import all_branches_report
+
+def test_parallel_report_matches_one_query(session, customer, service, location, tomorrow):
+    other = Location.create(session, "Karen", "78 Langata Rd", "0700000002")
+    regular = Customer.create(session, "Peter Otieno", "0722222222")
+    for number, (location_id, weight) in enumerate([(location.id, 2), (location.id, 5), (other.id, 3), (None, 4), (other.id, 1.5)]):
+        order = Order.create(session, (customer, regular)[number % 2].id, service.id, weight, tomorrow, 'afternoon', location_id=location_id)
+        if number == 2:
+            Order.update(session, order.id, status='processing')
+
+    report_date = datetime.utcnow().date()
+    day_start = datetime.combine(report_date, datetime.min.time())
+    sections, totals = all_branches_report(report_date, workers=2)
+
+    assert (sections, totals) == all_branches_report(report_date, workers=1)
+    expected = {
+        row.location_id if row.location_id is not None else NO_LOCATION: row
+        for row in Order.summarize(session, by=('location',), created_from=day_start, created_before=day_start + timedelta(days=1))
+    }
+    assert [section['location_name'] for section in sections] == ["Karen", "Westlands", "No branch"]
+    assert {section['location_id'] for section in sections} == set(expected)
+    for section in sections:
+        row = expected[section['location_id']]
+        assert section['order_count'] == row.order_count
+        assert section['total_weight'] == pytest.approx(row.total_weight)
+        assert section['total_revenue'] == pytest.approx(row.total_revenue)
+    assert totals['order_count'] == 5
+    assert totals['by_status']['processing'] == 1
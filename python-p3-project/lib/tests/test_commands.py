@@ -0,0 +1,47 @@
+# lib/tests/test_commands.py
+
+import csv
+import json
+import subprocess
+import sys
+from datetime import datetime
+
+from models import Order
+from commands import run_command_line
+
+def test_building_the_parser_skips_the_job_modules():
+    code = (
+        "import sys, commands; commands.build_parser(); "
+        "print(sorted(m for m in ('db.export_orders', 'db.archive_orders', 'lifecycle', 'dispatch') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
+
+def test_export_format_is_separate_from_output_format(session, customer, service, tomorrow, tmp_path, capsys):
+    Order.create(session, customer.id, service.id, 2, tomorrow, 'morning')
+    path = tmp_path / 'orders.txt'
+
+    assert run_command_line(['--format', 'json', 'orders', 'export', str(path), '--format', 'jsonl']) == 0
+
+    record = json.loads(capsys.readouterr().out)
+    assert record['exported'] == 1
+    assert json.loads(path.read_text(encoding='utf-8'))['customer_id'] == customer.id
+
+def test_export_keeps_the_chosen_output_format(session, customer, service, tomorrow, tmp_path, capsys):
+    Order.create(session, customer.id, service.id, 2, tomorrow, 'morning')
+
+    path = tmp_path / 'orders.csv'
+
+    assert run_command_line(['--format', 'json', 'orders', 'export', str(path)]) == 0
+
+    assert json.loads(capsys.readouterr().out)['exported'] == 1
+    assert path.read_text(encoding='utf-8').startswith('id,')
+
+def test_output_format_goes_before_the_command(session, customer, service, tomorrow, capsys):
+    Order.create(session, customer.id, service.id, 2, tomorrow, 'morning')
+    today = datetime.utcnow().date().isoformat()
+
+    assert run_command_line(['--format', 'csv', 'report', 'daily', '--date', today]) == 0
+
+    rows = list(csv.DictReader(capsys.readouterr().out.splitlines()))
+    assert [(row['status'], row['order_count']) for row in rows] == [('placed', '1')]
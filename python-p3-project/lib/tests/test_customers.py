@@ -0,0 +1,20 @@
+# lib/tests/test_customers.py
+
+from sqlalchemy import insert
+
+from models import Customer
+
+def test_search_ranks_every_match(session, customer):
+    # Many customers who only live on a Kariuki street, found before the
+    # one named Kariuki
+    session.execute(insert(Customer.__table__), [
+        {'name': "Peter Otieno", 'phone': f"07{n:08d}", 'address': f"{n} Kariuki Lane, Umoja"}
+        for n in range(2000)
+    ])
+    named = Customer.create(session, "Grace Kariuki", "0799999999")
+
+    assert [found.id for found in Customer.search(session, "kariuki", limit=1)] == [named.id]
+
+def test_search_matches_word_prefixes(session, customer):
+    assert Customer.search(session, "wanj kasar") == [customer]
+    assert Customer.search(session, "wanjiru westlands") == []
@@ -0,0 +1,47 @@
+# lib/tests/test_dispatch.py
+
+from models import Customer, Order, Location
+from dispatch import dispatch_batches, stop_order
+
+AREAS = ['Kasarani'] * 5 + ['Westlands'] * 3 + ['Karen'] * 2
+
+def place(session, service, pickup_date, area, number, pickup_time='morning', location_id=None):
+    customer = Customer.create(session, f"Customer {number}", f"07110000{number:02d}", address=f"{number} Main Rd, {area}")
+    return Order.create(session, customer.id, service.id, 2, pickup_date, pickup_time, location_id=location_id).id
+
+def window_orders(session, service, pickup_date, location):
+    ids = [place(session, service, pickup_date, area, number, location_id=location.id) for number, area in enumerate(AREAS)]
+    # Another branch, another window, and an order already collected
+    other_branch = Location.create(session, "Karen", "78 Langata Rd", "0700000002")
+    other_id = place(session, service, pickup_date, 'Karen', 50, location_id=other_branch.id)
+    place(session, service, pickup_date, 'Kasarani', 51, pickup_time='evening', location_id=location.id)
+    done_id = place(session, service, pickup_date, 'Kasarani', 52, location_id=location.id)
+    Order.update(session, done_id, status='completed')
+    return ids, other_branch.id, other_id
+
+def test_batches_respect_the_batch_size(session, service, location, tomorrow):
+    ids, other_branch_id, other_id = window_orders(session, service, tomorrow, location)
+
+    batches = dispatch_batches(session, tomorrow, 'morning', batch_size=4)
+
+    assert [(batch['location_id'], batch['stop_count']) for batch in batches] == [
+        (location.id, 4), (location.id, 4), (location.id, 2), (other_branch_id, 1)
+    ]
+    assert [batch['batch'] for batch in batches] == [1, 2, 3, 4]
+    # Every order of the window once, and nothing else
+    stop_ids = [stop['order_id'] for batch in batches for stop in batch['stops']]
+    assert sorted(stop_ids) == sorted(ids + [other_id])
+    # An area bigger than a batch is split, smaller ones kept whole
+    assert [batch['areas'] for batch in batches[:3]] == [['Kasarani'], ['Kasarani', 'Westlands'], ['Karen']]
+    for batch in batches:
+        assert batch['stops'] == sorted(batch['stops'], key=stop_order)
+
+def test_batches_are_shared_between_drivers(session, service, location, tomorrow):
+    ids, _, _ = window_orders(session, service, tomorrow, location)
+
+    batches = dispatch_batches(session, tomorrow, 'morning', location_id=location.id, drivers=2)
+
+    assert [(batch['areas'], batch['stop_count']) for batch in batches] == [
+        (['Kasarani'], 5), (['Karen', 'Westlands'], 5)
+    ]
+    assert sorted(stop['order_id'] for batch in batches for stop in batch['stops']) == sorted(ids)
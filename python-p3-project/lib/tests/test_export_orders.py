@@ -0,0 +1,37 @@
+# lib/tests/test_export_orders.py
+
+import csv
+import gzip
+import json
+
+from models import Order
+from db.export_orders import export_orders
+
+def place_orders(session, customer, service, pickup_date, count):
+    return [Order.create(session, customer.id, service.id, 2, pickup_date, 'morning').id for _ in range(count)]
+
+def test_csv_export(session, customer, service, tomorrow, tmp_path):
+    ids = place_orders(session, customer, service, tomorrow, 3)
+    path = tmp_path / 'orders.csv'
+
+    result = export_orders(str(path), include=['customer'], batch_size=2, verbose=False)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert result['exported'] == 3
+    assert [int(row['id']) for row in rows] == ids
+    assert rows[0]['customer_name'] == "Jane Wanjiru"
+
+def test_gzipped_jsonl_export_resumes(session, customer, service, tomorrow, tmp_path):
+    ids = place_orders(session, customer, service, tomorrow, 3)
+    path = tmp_path / 'orders.jsonl.gz'
+    export_orders(str(path), include=['history'], verbose=False)
+
+    ids += place_orders(session, customer, service, tomorrow, 2)
+    result = export_orders(str(path), include=['history'], resume=True, verbose=False)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert (result['exported'], result['total_rows']) == (2, 5)
+    assert [record['id'] for record in records] == ids
+    assert records[0]['status_history'][0]['status'] == 'placed'
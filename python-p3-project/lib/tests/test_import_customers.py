@@ -0,0 +1,63 @@
+# lib/tests/test_import_customers.py
+
+import csv
+
+from models import Customer
+from db.import_customers import import_customers
+
+def rejects(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(int(row['line']), row['reason']) for row in csv.DictReader(f)]
+
+def test_csv_import_rejects_bad_rows(session, tmp_path):
+    source = tmp_path / 'customers.csv'
+    source.write_text(
+        "name,phone,email,address\n"
+        "Jane Wanjiru,0712345678,jane@example.com,Kasarani\n"
+        ",0712345679,,\n"
+        "John Otieno,12,,\n"
+        "Janet Wanjiru,+254712345678,,\n"
+        "Paul Kamau,0722000000,,\n",
+        encoding='utf-8'
+    )
+    reject_file = tmp_path / 'rejects.csv'
+
+    result = import_customers(str(source), str(reject_file), batch_size=2, verbose=False)
+
+    assert (result['read'], result['imported'], result['rejected']) == (5, 2, 3)
+    assert [line for line, _ in rejects(reject_file)] == [3, 4, 5]
+    assert rejects(reject_file)[2][1] == "Duplicate phone number"
+    assert Customer.find_by_phone(session, '0722000000').name == "Paul Kamau"
+
+def test_jsonl_import_rejects_invalid_json(session, tmp_path):
+    source = tmp_path / 'customers.jsonl'
+    source.write_text(
+        '{"name": "Jane Wanjiru", "phone": "0712345678"}\n'
+        '{"name": "broken\n'
+        '\n'
+        '{"name": "Paul Kamau", "phone": "0722000000"}\n',
+        encoding='utf-8'
+    )
+    reject_file = tmp_path / 'rejects.csv'
+
+    result = import_customers(str(source), str(reject_file), verbose=False)
+
+    assert (result['imported'], result['rejected']) == (2, 1)
+    assert rejects(reject_file)[0][0] == 2
+    assert rejects(reject_file)[0][1].startswith("Invalid JSON")
+
+def test_jsonl_import_rejects_lines_that_are_not_objects(session, tmp_path):
+    source = tmp_path / 'customers.jsonl'
+    source.write_text(
+        '[1, 2]\n'
+        '{"name": "Jane Wanjiru", "phone": "0712345678"}\n'
+        '"x"\n'
+        'null\n',
+        encoding='utf-8'
+    )
+    reject_file = tmp_path / 'rejects.csv'
+
+    result = import_customers(str(source), str(reject_file), verbose=False)
+
+    assert (result['imported'], result['rejected']) == (1, 3)
+    assert rejects(reject_file) == [(line, "Each line must be a JSON object") for line in (1, 3, 4)]
@@ -0,0 +1,60 @@
+# lib/tests/test_lifecycle.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Order, OrderStatusHistory
+from lifecycle import stage_latency, stuck_orders
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+def order_with_history(session, customer, service, pickup_date, changes):
+    # changes: [(status, timestamp)], the first of them 'placed'
+    order = Order.create(session, customer.id, service.id, 2, pickup_date, 'morning')
+    session.query(OrderStatusHistory).filter_by(order_id=order.id).delete()
+    session.add_all(OrderStatusHistory(order_id=order.id, status=status, timestamp=timestamp) for status, timestamp in changes)
+    order.status = changes[-1][0]
+    session.commit()
+    return order.id
+
+def test_stage_latency_percentiles(session, customer, service, tomorrow):
+    start = NOW - timedelta(days=2)
+    for hours in range(1, 11):
+        order_with_history(session, customer, service, tomorrow, [
+            ('placed', start),
+            ('pickup', start + timedelta(hours=hours)),
+            ('processing', start + timedelta(hours=hours, minutes=30))
+        ])
+
+    placed, pickup = stage_latency(session)
+
+    assert (placed['stage'], placed['transitions']) == ('placed', 10)
+    assert placed['mean_hours'] == pytest.approx(5.5)
+    assert placed['p50_hours'] == pytest.approx(5)
+    assert placed['p75_hours'] == pytest.approx(8)
+    assert placed['p90_hours'] == pytest.approx(9)
+    assert placed['max_hours'] == pytest.approx(10)
+    assert (pickup['stage'], pickup['transitions']) == ('pickup', 10)
+    assert pickup['p99_hours'] == pytest.approx(0.5)
+
+def test_stuck_orders_longest_waiting_first(session, customer, service, tomorrow):
+    waiting_50 = order_with_history(session, customer, service, tomorrow, [('placed', NOW - timedelta(hours=50))])
+    waiting_72 = order_with_history(session, customer, service, tomorrow, [
+        ('placed', NOW - timedelta(hours=80)),
+        ('pickup', NOW - timedelta(hours=72))
+    ])
+    # Moved on recently, and finished long ago
+    order_with_history(session, customer, service, tomorrow, [
+        ('placed', NOW - timedelta(hours=100)),
+        ('processing', NOW - timedelta(hours=10))
+    ])
+    order_with_history(session, customer, service, tomorrow, [
+        ('placed', NOW - timedelta(hours=200)),
+        ('completed', NOW - timedelta(hours=150))
+    ])
+
+    stuck = list(stuck_orders(session, hours=48, now=NOW))
+
+    assert [(row['id'], row['status']) for row in stuck] == [(waiting_72, 'pickup'), (waiting_50, 'placed')]
+    assert [row['hours_waiting'] for row in stuck] == pytest.approx([72, 50])
@@ -0,0 +1,98 @@
+# lib/tests/test_orders.py
+
+import pytest
+from sqlalchemy import event
+
+from models import engine, Order, PickupSlot, OrderStatusHistory, DailyOrderSummary
+from models.order import BULK_BATCH_SIZE
+
+def statements_run(action):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        result = action()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return result, statements
+
+def test_bulk_create_rejects_invalid_rows_only(session, customer, service, tomorrow):
+    valid = {'customer_id': customer.id, 'service_id': service.id, 'weight': 2, 'pickup_date': tomorrow, 'pickup_time': 'morning'}
+    rows = [
+        valid,
+        {**valid, 'customer_id': 999},
+        {**valid, 'service_id': 999},
+        {**valid, 'weight': -1},
+        {**valid, 'pickup_time': 'midnight'},
+        {**valid, 'location_id': 999},
+        {**valid, 'weight': 3}
+    ]
+
+    order_ids, errors = Order.bulk_create(session, rows)
+
+    assert [index for index, _ in errors] == [1, 2, 3, 4, 5]
+    assert errors[0][1] == "Invalid customer ID"
+    assert errors[2][1] == "Weight must be a positive number"
+    assert len(order_ids) == 2
+    assert [Order.find_by_id(session, id).weight for id in order_ids] == [2, 3]
+
+def test_bulk_create_writes_history_and_summary(session, customer, service, tomorrow):
+    rows = [{'customer_id': customer.id, 'service_id': service.id, 'weight': 2, 'pickup_date': tomorrow, 'pickup_time': 'evening'}] * 3
+
+    order_ids, errors = Order.bulk_create(session, rows)
+
+    assert errors == []
+    assert all([entry.status for entry in OrderStatusHistory.get_all_by_order(session, id)] == ['placed'] for id in order_ids)
+    summary = session.query(DailyOrderSummary).one()
+    assert (summary.order_count, summary.total_weight, summary.total_revenue) == (3, 6, 900)
+
+def test_bulk_create_inserts_orders_in_batches(session, customer, service, tomorrow):
+    count = BULK_BATCH_SIZE + 20
+    rows = [
+        {'customer_id': customer.id, 'service_id': service.id, 'weight': index + 1, 'pickup_date': tomorrow, 'pickup_time': 'morning'}
+        for index in range(count)
+    ]
+    PickupSlot.set_capacity(session, tomorrow, 'morning', None, count)
+
+    (order_ids, errors), statements = statements_run(lambda: Order.bulk_create(session, rows))
+
+    inserts = [statement for statement in statements if statement.startswith('INSERT INTO orders')]
+    assert errors == []
+    assert len(inserts) == 2
+    assert len(statements) <= 15
+    # Ids come back in input order
+    weights = dict(session.query(Order.id, Order.weight))
+    assert [weights[id] for id in order_ids] == [row['weight'] for row in rows]
+
+def summary_counts(session):
+    return {row.status: row.order_count for row in session.query(DailyOrderSummary) if row.order_count}
+
+def test_bulk_update_status_moves_orders_history_and_summary(session, customer, service, tomorrow):
+    ids = [Order.create(session, customer.id, service.id, 2, tomorrow, 'morning').id for _ in range(3)]
+    Order.update(session, ids[0], status='processing')
+
+    updated_ids = Order.bulk_update_status(session, ids + [ids[1], 999], 'processing')
+
+    session.expire_all()
+    # Already processing, repeated and unknown ids are skipped
+    assert updated_ids == ids[1:]
+    assert {Order.find_by_id(session, id).status for id in ids} == {'processing'}
+    assert [entry.status for entry in OrderStatusHistory.get_all_by_order(session, ids[0])] == ['placed', 'processing']
+    assert [entry.status for entry in OrderStatusHistory.get_all_by_order(session, ids[1])] == ['placed', 'processing']
+    assert summary_counts(session) == {'processing': 3}
+
+def test_bulk_update_status_rejects_unknown_statuses(session, customer, service, tomorrow):
+    order_id = Order.create(session, customer.id, service.id, 2, tomorrow, 'morning').id
+
+    with pytest.raises(ValueError, match="Status must be one of"):
+        Order.bulk_update_status(session, [order_id], 'lost')
+
+    assert Order.find_by_id(session, order_id).status == 'placed'
+    assert summary_counts(session) == {'placed': 1}
+
+def test_bulk_update_status_with_no_ids(session):
+    updated_ids, statements = statements_run(lambda: Order.bulk_update_status(session, [], 'completed'))
+
+    assert updated_ids == []
+    assert not any(statement.startswith(('UPDATE', 'INSERT')) for statement in statements)
@@ -0,0 +1,86 @@
+# lib/tests/test_pickup_slots.py
+
+import pytest
+
+from models import Order, PickupSlot, Location
+
+def order(session, customer, service, pickup_date, pickup_time='morning', location_id=None):
+    return Order.create(session, customer.id, service.id, 2, pickup_date, pickup_time, location_id=location_id)
+
+def test_create_refuses_a_full_slot(session, customer, service, location, tomorrow):
+    PickupSlot.set_capacity(session, tomorrow, 'morning', location.id, 2)
+    order(session, customer, service, tomorrow, location_id=location.id)
+    order(session, customer, service, tomorrow, location_id=location.id)
+
+    with pytest.raises(ValueError, match="is full"):
+        order(session, customer, service, tomorrow, location_id=location.id)
+
+    assert session.query(Order).count() == 2
+    assert PickupSlot.availability(session, tomorrow, 'morning', location.id).booked == 2
+
+def test_bulk_create_books_what_fits_and_rejects_the_rest(session, customer, service, location, tomorrow):
+    PickupSlot.set_capacity(session, tomorrow, 'morning', location.id, 3)
+    order(session, customer, service, tomorrow, location_id=location.id)
+    rows = [
+        {'customer_id': customer.id, 'service_id': service.id, 'weight': weight,
+         'pickup_date': tomorrow, 'pickup_time': 'morning', 'location_id': location.id}
+        for weight in (1, 2, 3, 4)
+    ]
+
+    order_ids, errors = Order.bulk_create(session, rows)
+
+    assert [session.get(Order, id).weight for id in order_ids] == [1, 2]
+    assert [index for index, _ in errors] == [2, 3]
+    assert all("is full" in message for _, message in errors)
+    assert PickupSlot.availability(session, tomorrow, 'morning', location.id).booked == 3
+
+    # A full slot takes none of them
+    order_ids, errors = Order.bulk_create(session, rows[:1])
+    assert order_ids == [] and len(errors) == 1
+
+def test_rejected_order_takes_no_place(session, customer, service, tomorrow):
+    for weight in (0, "3"):
+        with pytest.raises(ValueError, match="Weight"):
+            Order.create(session, customer.id, service.id, weight, tomorrow, 'morning')
+    session.commit()
+
+    assert PickupSlot.availability(session, tomorrow, 'morning').booked == 0
+
+def test_branch_capacity_applies_to_its_slots(session, customer, service, location, tomorrow):
+    Location.update(session, location.id, slot_capacity=1)
+    order(session, customer, service, tomorrow, location_id=location.id)
+
+    with pytest.raises(ValueError, match="is full"):
+        order(session, customer, service, tomorrow, location_id=location.id)
+    # Orders without a branch have their own slots
+    order(session, customer, service, tomorrow)
+
+def test_delete_and_reschedule_release_places(session, customer, service, tomorrow):
+    PickupSlot.set_capacity(session, tomorrow, 'morning', None, 1)
+    first = order(session, customer, service, tomorrow)
+
+    Order.update(session, first.id, pickup_time='evening')
+    assert PickupSlot.availability(session, tomorrow, 'morning').booked == 0
+    assert PickupSlot.availability(session, tomorrow, 'evening').booked == 1
+
+    second = order(session, customer, service, tomorrow)
+    Order.delete(session, second.id)
+    assert PickupSlot.availability(session, tomorrow, 'morning').booked == 0
+
+def test_capacity_cannot_go_below_bookings(session, customer, service, tomorrow):
+    order(session, customer, service, tomorrow)
+    order(session, customer, service, tomorrow)
+
+    with pytest.raises(ValueError, match="already booked"):
+        PickupSlot.set_capacity(session, tomorrow, 'morning', None, 1)
+
+def test_rebuild_recounts_bookings(session, customer, service, tomorrow):
+    order(session, customer, service, tomorrow)
+    order(session, customer, service, tomorrow, 'afternoon')
+    session.execute(PickupSlot.__table__.update().values(booked=7))
+    session.commit()
+
+    PickupSlot.rebuild(session)
+
+    assert PickupSlot.availability(session, tomorrow, 'morning').booked == 1
+    assert PickupSlot.availability(session, tomorrow, 'afternoon').booked == 1
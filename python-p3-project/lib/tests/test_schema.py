@@ -0,0 +1,36 @@
+# lib/tests/test_schema.py
+
+from models import Base, engine, create_tables, SCHEMA_VERSION, SCHEMA_REVISION
+
+def user_version():
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+def set_alembic_revision(revision):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+        connection.exec_driver_sql(f"INSERT INTO alembic_version VALUES ('{revision}')")
+
+def test_new_database_is_stamped_as_migrated(session):
+    Base.metadata.drop_all(engine)
+
+    assert create_tables()
+
+    assert user_version() == SCHEMA_VERSION
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar() == SCHEMA_REVISION
+
+def test_unmigrated_database_is_not_stamped(session):
+    # Tables exist, but nothing says their columns are current
+    assert not create_tables()
+    assert user_version() == 0
+
+    set_alembic_revision('0001')
+    assert not create_tables()
+    assert user_version() == 0
+
+def test_database_migrated_to_head_is_stamped(session):
+    set_alembic_revision(SCHEMA_REVISION)
+
+    assert create_tables()
+    assert user_version() == SCHEMA_VERSION
@@ -0,0 +1,42 @@
+"""Add secondary indexes for hot lookup columns
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_customers_phone', 'customers', ['phone']),
+    ('ix_orders_customer_id', 'orders', ['customer_id']),
+    ('ix_orders_status', 'orders', ['status']),
+    ('ix_orders_created_at', 'orders', ['created_at']),
+    ('ix_order_status_history_order_id_timestamp', 'order_status_history', ['order_id', 'timestamp']),
+]
+
+def upgrade():
+    # Databases created after these indexes were added to the models already
+    # have them from create_all, so only build the ones that are missing.
+    # Tables that don't exist yet will get their indexes from create_all.
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    for name, table, columns in INDEXES:
+        if table in existing_tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+    
+    op.execute('ANALYZE')
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    for name, table, columns in reversed(INDEXES):
+        if table in existing_tables:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,83 @@
+"""Add a normalized, uniquely indexed customer phone column
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.customer import Customer
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+def backfill_phone_e164(connection):
+    # Normalize existing phone numbers in id order, one batch at a time.
+    # When several customers share a number only the oldest keeps it; the
+    # others are left NULL and reported so they can be merged by hand.
+    seen = set()
+    duplicates = []
+    last_id = 0
+
+    while True:
+        rows = connection.execute(
+            sa.text("SELECT id, phone FROM customers WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for id, phone in rows:
+            normalized = Customer.normalize_phone(phone or '')
+            if normalized in seen:
+                duplicates.append(id)
+                continue
+            seen.add(normalized)
+            updates.append({'id': id, 'phone_e164': normalized})
+
+        if updates:
+            connection.execute(
+                sa.text("UPDATE customers SET phone_e164 = :phone_e164 WHERE id = :id"),
+                updates
+            )
+        last_id = rows[-1][0]
+
+    if duplicates:
+        print(f"Customers sharing a phone number with an older customer (phone_e164 left empty): {duplicates}")
+
+def upgrade():
+    connection = op.get_bind()
+    existing_tables = sa.inspect(connection).get_table_names()
+
+    if 'customers' not in existing_tables:
+        return
+
+    columns = [column['name'] for column in sa.inspect(connection).get_columns('customers')]
+    if 'phone_e164' not in columns:
+        op.add_column('customers', sa.Column('phone_e164', sa.String(), nullable=True))
+
+    backfill_phone_e164(connection)
+
+    op.create_index('ix_customers_phone_e164', 'customers', ['phone_e164'], unique=True, if_not_exists=True)
+
+    # Lookups no longer use the raw phone column
+    op.drop_index('ix_customers_phone', table_name='customers', if_exists=True)
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'customers' not in existing_tables:
+        return
+
+    op.create_index('ix_customers_phone', 'customers', ['phone'], if_not_exists=True)
+    op.drop_index('ix_customers_phone_e164', table_name='customers', if_exists=True)
+
+    with op.batch_alter_table('customers') as batch_op:
+        batch_op.drop_column('phone_e164')
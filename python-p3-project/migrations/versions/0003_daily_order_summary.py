@@ -0,0 +1,40 @@
+"""Add the daily order summary table and fill it from existing orders
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'daily_order_summary' not in existing_tables:
+        op.create_table(
+            'daily_order_summary',
+            sa.Column('date', sa.Date(), primary_key=True),
+            sa.Column('status', sa.String(), primary_key=True),
+            sa.Column('service_id', sa.Integer(), sa.ForeignKey('services.id'), primary_key=True),
+            sa.Column('order_count', sa.Integer(), nullable=False),
+            sa.Column('total_weight', sa.Float(), nullable=False),
+            sa.Column('total_revenue', sa.Float(), nullable=False)
+        )
+    
+    if 'orders' in existing_tables:
+        op.execute("DELETE FROM daily_order_summary")
+        op.execute(
+            "INSERT INTO daily_order_summary (date, status, service_id, order_count, total_weight, total_revenue) "
+            "SELECT date(created_at), status, service_id, count(*), coalesce(sum(weight), 0), coalesce(sum(total_price), 0) "
+            "FROM orders WHERE created_at IS NOT NULL "
+            "GROUP BY date(created_at), status, service_id"
+        )
+
+def downgrade():
+    op.drop_table('daily_order_summary', if_exists=True)
@@ -0,0 +1,27 @@
+"""Index orders by pickup date and window
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'orders' in existing_tables:
+        op.create_index('ix_orders_pickup_date_pickup_time', 'orders', ['pickup_date', 'pickup_time'], if_not_exists=True)
+        op.execute('ANALYZE')
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'orders' in existing_tables:
+        op.drop_index('ix_orders_pickup_date_pickup_time', table_name='orders', if_exists=True)
@@ -0,0 +1,72 @@
+"""Tie orders to a location and split the daily summary by branch
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def create_summary_table(with_location):
+    columns = [sa.Column('date', sa.Date(), primary_key=True)]
+    if with_location:
+        columns.append(sa.Column('location_id', sa.Integer(), primary_key=True))
+    columns += [
+        sa.Column('status', sa.String(), primary_key=True),
+        sa.Column('service_id', sa.Integer(), sa.ForeignKey('services.id'), primary_key=True),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('total_weight', sa.Float(), nullable=False),
+        sa.Column('total_revenue', sa.Float(), nullable=False)
+    ]
+    op.create_table('daily_order_summary', *columns)
+
+def fill_summary_table(with_location):
+    # Orders without a branch are summarized under location 0
+    location = "coalesce(location_id, 0), " if with_location else ""
+    op.execute(
+        f"INSERT INTO daily_order_summary (date, {'location_id, ' if with_location else ''}status, service_id, order_count, total_weight, total_revenue) "
+        f"SELECT date(created_at), {location}status, service_id, count(*), coalesce(sum(weight), 0), coalesce(sum(total_price), 0) "
+        f"FROM orders WHERE created_at IS NOT NULL "
+        f"GROUP BY date(created_at), {location}status, service_id"
+    )
+
+def upgrade():
+    connection = op.get_bind()
+    existing_tables = sa.inspect(connection).get_table_names()
+    
+    if 'orders' not in existing_tables:
+        return
+    
+    columns = [column['name'] for column in sa.inspect(connection).get_columns('orders')]
+    if 'location_id' not in columns:
+        with op.batch_alter_table('orders') as batch_op:
+            batch_op.add_column(sa.Column('location_id', sa.Integer(), sa.ForeignKey('locations.id', name='fk_orders_location_id')))
+    
+    op.create_index('ix_orders_location_id_created_at', 'orders', ['location_id', 'created_at'], if_not_exists=True)
+    
+    # The branch becomes part of the summary's primary key
+    op.drop_table('daily_order_summary', if_exists=True)
+    create_summary_table(with_location=True)
+    fill_summary_table(with_location=True)
+    
+    op.execute('ANALYZE')
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'orders' not in existing_tables:
+        return
+    
+    op.drop_table('daily_order_summary', if_exists=True)
+    create_summary_table(with_location=False)
+    fill_summary_table(with_location=False)
+    
+    op.drop_index('ix_orders_location_id_created_at', table_name='orders', if_exists=True)
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('location_id')
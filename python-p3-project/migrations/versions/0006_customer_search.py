@@ -0,0 +1,50 @@
+"""Add the customers_fts full-text index and the triggers that keep it current
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'customers' not in existing_tables:
+        return
+    
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5("
+        "name, email, address, content='customers', content_rowid='id', "
+        "tokenize=\"unicode61 remove_diacritics 2 separators '0123456789'\", prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_insert AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_fts(rowid, name, email, address) VALUES (new.id, new.name, new.email, new.address); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_delete AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name, email, address) VALUES ('delete', old.id, old.name, old.email, old.address); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_update AFTER UPDATE OF name, email, address ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name, email, address) VALUES ('delete', old.id, old.name, old.email, old.address); "
+        "INSERT INTO customers_fts(rowid, name, email, address) VALUES (new.id, new.name, new.email, new.address); "
+        "END"
+    )
+    # Index the customers that already exist
+    op.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_insert")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_update")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
@@ -0,0 +1,67 @@
+"""Add archive tables for old completed orders and their status history
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    if 'orders_archive' not in existing_tables:
+        op.create_table(
+            'orders_archive',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('customer_id', sa.Integer(), nullable=False),
+            sa.Column('service_id', sa.Integer(), nullable=False),
+            sa.Column('location_id', sa.Integer()),
+            sa.Column('weight', sa.Float(), nullable=False),
+            sa.Column('total_price', sa.Float(), nullable=False),
+            sa.Column('status', sa.String()),
+            sa.Column('pickup_date', sa.Date(), nullable=False),
+            sa.Column('pickup_time', sa.String(), nullable=False),
+            sa.Column('special_instructions', sa.Text()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('archived_at', sa.DateTime(), nullable=False)
+        )
+    op.create_index('ix_orders_archive_customer_id', 'orders_archive', ['customer_id'], if_not_exists=True)
+    op.create_index('ix_orders_archive_created_at', 'orders_archive', ['created_at'], if_not_exists=True)
+    op.create_index('ix_orders_archive_location_id_created_at', 'orders_archive', ['location_id', 'created_at'], if_not_exists=True)
+    
+    if 'order_status_history_archive' not in existing_tables:
+        op.create_table(
+            'order_status_history_archive',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('order_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('timestamp', sa.DateTime())
+        )
+    op.create_index('ix_order_status_history_archive_order_id_timestamp', 'order_status_history_archive', ['order_id', 'timestamp'], if_not_exists=True)
+
+ORDER_COLUMNS = (
+    "id, customer_id, service_id, location_id, weight, total_price, status, "
+    "pickup_date, pickup_time, special_instructions, created_at"
+)
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    # Archived orders go back into the live tables rather than being lost
+    if 'orders_archive' in existing_tables:
+        op.execute(f"INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_archive")
+    if 'order_status_history_archive' in existing_tables:
+        op.execute(
+            "INSERT INTO order_status_history (id, order_id, status, timestamp) "
+            "SELECT id, order_id, status, timestamp FROM order_status_history_archive"
+        )
+    
+    op.drop_table('order_status_history_archive', if_exists=True)
+    op.drop_table('orders_archive', if_exists=True)
@@ -0,0 +1,54 @@
+"""Add pickup slot capacity: per-slot booking counters and a per-branch capacity
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    connection = op.get_bind()
+    existing_tables = sa.inspect(connection).get_table_names()
+
+    if 'locations' in existing_tables:
+        columns = [column['name'] for column in sa.inspect(connection).get_columns('locations')]
+        if 'slot_capacity' not in columns:
+            with op.batch_alter_table('locations') as batch_op:
+                batch_op.add_column(sa.Column('slot_capacity', sa.Integer()))
+
+    if 'pickup_slots' not in existing_tables:
+        op.create_table(
+            'pickup_slots',
+            sa.Column('location_id', sa.Integer(), primary_key=True),
+            sa.Column('pickup_date', sa.Date(), primary_key=True),
+            sa.Column('pickup_time', sa.String(), primary_key=True),
+            sa.Column('booked', sa.Integer(), nullable=False),
+            sa.Column('capacity', sa.Integer())
+        )
+
+    # Count the orders already booked into each slot, keeping any capacities
+    # already set. Orders without a branch are counted under location 0.
+    if 'orders' in existing_tables:
+        op.execute("UPDATE pickup_slots SET booked = 0")
+        op.execute(
+            "INSERT INTO pickup_slots (location_id, pickup_date, pickup_time, booked) "
+            "SELECT coalesce(location_id, 0), pickup_date, pickup_time, count(*) "
+            "FROM orders WHERE pickup_date IS NOT NULL "
+            "GROUP BY coalesce(location_id, 0), pickup_date, pickup_time "
+            "ON CONFLICT (location_id, pickup_date, pickup_time) DO UPDATE SET booked = excluded.booked"
+        )
+
+def downgrade():
+    op.drop_table('pickup_slots', if_exists=True)
+
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'locations' in existing_tables:
+        with op.batch_alter_table('locations') as batch_op:
+            batch_op.drop_column('slot_capacity')
@@ -0,0 +1,51 @@
+"""Never reuse order and status history ids, so they can't collide with archived ones
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# Live table and the archive table its rows are moved into
+TABLES = (
+    ('orders', 'orders_archive'),
+    ('order_status_history', 'order_status_history_archive')
+)
+
+def rebuild(table, autoincrement):
+    # SQLite can't add or drop AUTOINCREMENT in place; batch mode copies the
+    # table, its ids and its indexes into a new one
+    with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+
+def upgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    for table, archive in TABLES:
+        if table not in existing_tables:
+            continue
+        rebuild(table, autoincrement=True)
+        
+        # Start new ids after every id used so far, live or archived. Without
+        # AUTOINCREMENT, SQLite handed out max(id) + 1 of the live table,
+        # i.e. the ids of the most recently archived rows.
+        archived_max = f"(SELECT max(id) FROM {archive})" if archive in existing_tables else "0"
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) "
+            f"SELECT '{table}', max(coalesce((SELECT max(id) FROM {table}), 0), coalesce({archived_max}, 0))"
+        )
+
+def downgrade():
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    
+    for table, _ in TABLES:
+        if table in existing_tables:
+            rebuild(table, autoincrement=False)